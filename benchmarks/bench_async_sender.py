@@ -0,0 +1,106 @@
+"""
+Benchmarks sending a digest wave through async_sender against a thread pool of blocking Twilio
+sends, both talking to a local mock Twilio API that answers every message after a fixed latency.
+
+Run from the repository root with the app's environment loaded. The Twilio base URL and send rate
+are overridden, so no real messages are sent:
+
+    python -m benchmarks.bench_async_sender --messages 2000 --latency 0.05
+"""
+import argparse
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+
+
+# --- Mock Twilio API ---
+def start_mock_twilio(latency: float) -> tuple:
+    """
+    Serves Twilio's create-message endpoint on a free local port from a background event loop.
+    Returns the base URL and a dict counting the requests served.
+    """
+    served = {"messages": 0}
+
+    async def create_message(request):
+        form = await request.post()
+        await asyncio.sleep(latency)
+        served["messages"] += 1
+        return web.json_response(
+            {"sid": f"SM{served['messages']:032d}", "status": "queued", "to": form["To"], "from": form["From"], "body": form["Body"]},
+            status=201,
+        )
+
+    started = threading.Event()
+    ports = []
+
+    def serve():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        app = web.Application()
+        app.router.add_post("/{tail:.*}", create_message)
+        runner = web.AppRunner(app, access_log=None)
+        loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, "127.0.0.1", 0, backlog=4096)
+        loop.run_until_complete(site.start())
+        ports.append(site._server.sockets[0].getsockname()[1])
+        started.set()
+        loop.run_forever()
+
+    threading.Thread(target=serve, name="mock-twilio", daemon=True).start()
+    started.wait()
+    return f"http://127.0.0.1:{ports[0]}", served
+
+
+def timed(function, *args, **kwargs):
+    started = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds the mock API takes per message")
+    parser.add_argument("--threads", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 200, 500])
+    args = parser.parse_args()
+
+    base_url, served = start_mock_twilio(args.latency)
+    # Both paths must read these at import time: the mock API, and a rate limit that never throttles
+    os.environ["TWILIO_API_BASE_URL"] = base_url
+    os.environ["OUTBOUND_RATE_PER_SECOND"] = "1000000"
+    os.environ.setdefault("TWILIO_SID", "AC" + "0" * 32)
+    os.environ.setdefault("TWILIO_AUTH_TOKEN", "benchmark")
+    os.environ.setdefault("TWILIO_SANDBOX_NUMBER", "+14155238886")
+
+    from notifications.async_sender import send_messages
+    from notifications.twilio_client import TWILIO_SANDBOX_NUMBER, twilio_client
+
+    logging.disable(logging.CRITICAL)
+    messages = [(f"+91{number:010d}", f"Digest {number}") for number in range(args.messages)]
+
+    def send_blocking(message):
+        to, body = message
+        twilio_client.messages.create(from_=f"whatsapp:{TWILIO_SANDBOX_NUMBER}", body=body, to=f"whatsapp:{to}")
+
+    print(f"{args.messages} messages, mock API latency {args.latency * 1000:.0f}ms")
+    for threads in args.threads:
+        served["messages"] = 0
+        with ThreadPoolExecutor(threads) as pool:
+            _, seconds = timed(lambda: list(pool.map(send_blocking, messages)))
+        print(f"  threaded, {threads:>3} threads:      {seconds:7.2f}s  {args.messages / seconds:7.0f} msg/s  ({served['messages']} served)")
+
+    for concurrency in args.concurrency:
+        served["messages"] = 0
+        results, seconds = timed(send_messages, messages, concurrency=concurrency)
+        print(f"  async, concurrency {concurrency:>4}:   {seconds:7.2f}s  {args.messages / seconds:7.0f} msg/s  "
+              f"({served['messages']} served, {results['failed']} failed)")
+
+
+if __name__ == "__main__":
+    main()
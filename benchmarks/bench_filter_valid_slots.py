@@ -0,0 +1,135 @@
+"""
+Benchmarks filter_valid_slots on synthetic slot rows against the row-wise apply it replaced.
+
+Run from the repository root with the app's environment loaded (imports go through the sheets
+package like the app does):
+
+    python -m benchmarks.bench_filter_valid_slots --rows 12000
+"""
+import argparse
+import logging
+import random
+import re
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from sheets.google_sheets import SUPPORTED_DATE_FORMATS, validate_slot_timing
+from sheets.player_data import filter_valid_slots, parse_slot_times
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_TIME = "10:00 AM"
+
+
+# --- Row-Wise Reference (the implementation filter_valid_slots replaced) ---
+def legacy_parse_date_from_sheet(date_str: str) -> str:
+    cleaned_date_str = re.sub(r"(\d+)(st|nd|rd|th)", r"\1", date_str.strip())
+    for fmt in SUPPORTED_DATE_FORMATS:
+        try:
+            parsed_date = datetime.strptime(cleaned_date_str, fmt)
+            break
+        except ValueError:
+            continue
+    else:
+        raise ValueError(f"Date format not supported: {date_str}")
+
+    day = parsed_date.day
+    suffix = "th" if 11 <= day <= 13 else {1: "st", 2: "nd", 3: "rd"}.get(day % 10, "th")
+    return f"{day}{suffix} {parsed_date.strftime('%B')}, {parsed_date.year}"
+
+
+def legacy_is_valid_slot(row, notif_time_today, now, fixed: bool) -> bool:
+    """
+    The old per-row check. With fixed=False it keeps the original "%d%B, %Y" re-parse, which
+    rejects every slot; fixed=True parses the formatted date correctly for a like-for-like result.
+    """
+    try:
+        if not validate_slot_timing(row["Timing"]):
+            logger.error(f"Invalid slot timing format for row: {row}")
+            return False
+
+        slot_date = legacy_parse_date_from_sheet(row["Date"])
+        if fixed:
+            slot_date_obj = datetime.strptime(re.sub(r"(\d+)(st|nd|rd|th)", r"\1", slot_date), "%d %B, %Y").date()
+        else:
+            slot_date_obj = datetime.strptime(slot_date, "%d%B, %Y").date()
+
+        slot_start_time = datetime.strptime(row["Timing"].replace(" ", "").split("-")[0], "%I:%M%p").time()
+
+        if slot_date_obj > now.date():
+            return True
+        return slot_date_obj == now.date() and now.time() < slot_start_time and slot_start_time >= notif_time_today
+    except Exception as e:
+        # The message (and the row's repr) is built even with logging disabled, as it was originally
+        logger.error(f"Error processing row: {row} | Error: {e}")
+        return False
+
+
+def legacy_filter_valid_slots(slots_df: pd.DataFrame, fixed: bool) -> pd.DataFrame:
+    notif_time_today = datetime.strptime(NOTIFICATION_TIME, "%I:%M %p").time()
+    valid_slots = slots_df[slots_df.apply(legacy_is_valid_slot, axis=1, args=(notif_time_today, datetime.now(), fixed))].copy()
+    valid_slots["Date"] = valid_slots["Date"].apply(legacy_parse_date_from_sheet)
+    return valid_slots
+
+
+# --- Synthetic Slots ---
+def synthetic_slots(rows: int, seed: int = 1) -> pd.DataFrame:
+    """
+    Slots from three days ago to ten days ahead, in the date formats the sheets use, with some bad timings
+    (including a valid start with a malformed end).
+    """
+    rng = random.Random(seed)
+    now = datetime.now()
+    slots = []
+    for _ in range(rows):
+        slot_day = now + timedelta(days=rng.randint(-3, 10))
+        date_format = rng.choice(["%d %B, %Y", "%d-%m-%Y", "%d/%m/%y", "ordinal"])
+        if date_format == "ordinal":
+            date_str = f"{slot_day.day}th {slot_day.strftime('%B, %Y')}"
+        else:
+            date_str = slot_day.strftime(date_format)
+
+        hour = rng.randint(1, 12)
+        meridiem = rng.choice(["AM", "PM"])
+        timing = rng.choice([
+            f"{hour}:00 {meridiem} - {hour}:30 {meridiem}",
+            f"{hour}:00{meridiem}-{hour}:30{meridiem}",
+            f"{hour}:00{meridiem} - {hour}{meridiem}",
+            "bad",
+        ])
+        slots.append({"Locality": "salt lake", "Sport": "padel", "Date": date_str, "Timing": timing, "Price": 500})
+    return pd.DataFrame(slots)
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=12000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    slots_df = synthetic_slots(args.rows)
+
+    _, legacy_seconds = timed(legacy_filter_valid_slots, slots_df, False)
+    expected, reference_seconds = timed(legacy_filter_valid_slots, slots_df, True)
+    vectorized, vectorized_seconds = timed(filter_valid_slots, slots_df, NOTIFICATION_TIME)
+    parsed_slots = parse_slot_times(slots_df)
+    _, preparsed_seconds = timed(filter_valid_slots, parsed_slots, NOTIFICATION_TIME)
+
+    matches = list(expected.index) == list(vectorized.index) and list(expected["Date"]) == list(vectorized["Date"])
+    print(f"{args.rows} slot rows, {len(expected)} valid; vectorized result matches the row-wise reference: {matches}")
+    print(f"  old apply(axis=1):             {legacy_seconds:.3f}s")
+    print(f"  row-wise with the bug fixed:   {reference_seconds:.3f}s")
+    print(f"  vectorized, raw frame:         {vectorized_seconds:.3f}s")
+    print(f"  vectorized, pre-parsed frame:  {preparsed_seconds:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmarks the indexed RedisJobStore against APScheduler's stock RedisJobStore with a large
+number of per-player notification jobs: loading them, finding the due ones, the next wakeup,
+and listing every job.
+
+Run from the repository root against a scratch Redis database (its benchmark keys are deleted
+afterwards), or in memory with --fakeredis (installed from requirements-dev.txt):
+
+    python -m benchmarks.bench_redis_jobstore --jobs 100000 --db 15
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import redis
+from apscheduler.job import Job
+from apscheduler.jobstores.redis import RedisJobStore as StockRedisJobStore
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.cron import CronTrigger
+from pytz import utc
+
+from scheduler.redis_jobstore import RedisJobStore
+
+# Jobs due within this many minutes are returned by the due-jobs lookup
+DUE_MINUTES = 15
+
+
+def notify(phone_number):
+    pass
+
+
+def synthetic_jobs(scheduler, count: int) -> list:
+    """
+    Daily notification jobs, one per phone number, with run times spread over the next day.
+    """
+    now = datetime.now(utc)
+    jobs = []
+    for number in range(count):
+        run_at = now + timedelta(seconds=number * 86400 // count + 1)
+        jobs.append(Job(
+            scheduler,
+            id=f"+91{number:010d}_notification",
+            func=notify,
+            trigger=CronTrigger(hour=run_at.hour, minute=run_at.minute, timezone=utc),
+            executor="default",
+            args=(f"+91{number:010d}",),
+            kwargs={},
+            name="notify",
+            misfire_grace_time=1,
+            coalesce=False,
+            max_instances=1,
+            next_run_time=run_at,
+        ))
+    return jobs
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def run(name: str, store, jobs: list, load) -> None:
+    """
+    Loads jobs into store with load(store, jobs), then times the scheduler's read paths.
+    """
+    _, load_seconds = timed(load, store, jobs)
+    due_before = datetime.now(utc) + timedelta(minutes=DUE_MINUTES)
+    due, due_seconds = timed(store.get_due_jobs, due_before)
+    _, next_seconds = timed(store.get_next_run_time)
+    all_jobs, all_seconds = timed(store.get_all_jobs)
+    store.remove_all_jobs()
+
+    print(f"  {name:<28} load {load_seconds:7.2f}s   due ({len(due)}) {due_seconds:7.3f}s   "
+          f"next wakeup {next_seconds * 1000:7.2f}ms   all ({len(all_jobs)}) {all_seconds:7.2f}s")
+
+
+def add_one_by_one(store, jobs: list) -> None:
+    for job in jobs:
+        store.add_job(job)
+
+
+def apply_in_one_batch(store, jobs: list) -> None:
+    store.apply_job_changes(jobs, [], [])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=6379)
+    parser.add_argument("--db", type=int, default=15)
+    parser.add_argument("--fakeredis", action="store_true", help="use an in-memory fakeredis server instead")
+    args = parser.parse_args()
+
+    if args.fakeredis:
+        import fakeredis
+        server = fakeredis.FakeServer()
+        connect = lambda: fakeredis.FakeRedis(server=server)
+    else:
+        connect = lambda: redis.Redis(host=args.host, port=args.port, db=args.db)
+
+    scheduler = BackgroundScheduler(timezone=utc)
+    jobs = synthetic_jobs(scheduler, args.jobs)
+
+    stores = [
+        ("stock, add_job", StockRedisJobStore(jobs_key="bench.stock.jobs", run_times_key="bench.stock.run_times"), add_one_by_one),
+        ("indexed, add_job", RedisJobStore(jobs_key="bench.indexed.jobs", run_times_key="bench.indexed.run_times"), add_one_by_one),
+        ("indexed, apply_job_changes", RedisJobStore(jobs_key="bench.indexed.jobs", run_times_key="bench.indexed.run_times"), apply_in_one_batch),
+        ("indexed, compressed", RedisJobStore(
+            jobs_key="bench.indexed.jobs", run_times_key="bench.indexed.run_times", compress_payloads=True
+        ), apply_in_one_batch),
+    ]
+
+    plain_bytes = sum(len(stores[1][1]._serialize_job(job)) for job in jobs[:1000])
+    compressed_bytes = sum(len(stores[3][1]._serialize_job(job)) for job in jobs[:1000])
+    print(f"{args.jobs} jobs, {DUE_MINUTES} minutes due; payload {plain_bytes / 1000:.0f} bytes, "
+          f"{compressed_bytes / 1000:.0f} bytes compressed")
+
+    for name, store, load in stores:
+        store.redis = connect()
+        store.start(scheduler, "default")
+        store.remove_all_jobs()
+        run(name, store, jobs, load)
+
+
+if __name__ == "__main__":
+    main()
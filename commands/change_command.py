@@ -1,5 +1,8 @@
 import logging
-from sheets.google_sheets import fetch_sheet_data, update_google_sheet
+from sheets.google_sheets import update_google_sheet_cells
+from sheets.player_registry import get_player_registry
+from utils.player_events import emit_player_changed
+from commands.command_batch import current_batch
 from commands.message_parser import parse_change_command
 from commands.validators import validate_sports
 from notifications.whatsapp_notifier import send_whatsapp_message
@@ -22,26 +25,41 @@ SUPPORTED_FREQUENCIES = {
     "weekends": "Weekend",
 }
 
+# --- Write Player Cells ---
+def write_player_cells(phone_number: str, updates: list) -> None:
+    """
+    Writes (row_index, column_name, value) cells for one player and emits a change event for them.
+    In micro-batching mode the cells are buffered and written when the batch flushes.
+    """
+    if not updates:
+        return
+
+    batch = current_batch.get()
+    if batch is not None:
+        batch.record_write(phone_number, updates)
+        return
+
+    update_google_sheet_cells(updates)
+    emit_player_changed(phone_number, [column_name for _, column_name, _ in updates])
+
 # --- Handle Change Command ---
 def handle_change_command(phone_number: str, command_text: str) -> None:
     try:
         # Normalize input
         command_text_lower = command_text.lower().strip()
 
-        # Fetch player data
-        players_df = fetch_sheet_data("player-response-sheet", "Players")
-        players_df["Phone Number"] = players_df["Phone Number"].apply(str).str.strip()
-        player = players_df[players_df["Phone Number"] == phone_number]
+        # Look up the player in the shared registry
+        registry = get_player_registry()
+        player_data = registry.get(phone_number)
 
-        if player.empty:
+        if player_data is None:
             send_whatsapp_message(
                 phone_number, "You are not registered. Please contact support."
             )
             return
 
-        # Extract player's row index in Google Sheets
-        player_data = player.iloc[0]
-        row_index = player.index[0] + 2  # Adjust for header
+        # Player's row index in Google Sheets
+        row_index = registry.row_index(phone_number)
 
         # --- Handle Notification Frequency Update ---
         if command_text_lower.startswith("change notification frequency to"):
@@ -57,8 +75,8 @@ def handle_change_command(phone_number: str, command_text: str) -> None:
                 return
 
             # Update the notification frequency
-            update_google_sheet(
-                "Notification Frequency", SUPPORTED_FREQUENCIES[new_frequency], row_index
+            write_player_cells(
+                phone_number, [(row_index, "Notification Frequency", SUPPORTED_FREQUENCIES[new_frequency])]
             )
             send_whatsapp_message(
                 phone_number,
@@ -80,7 +98,7 @@ def handle_change_command(phone_number: str, command_text: str) -> None:
                 return
 
             # Update the notification time
-            update_google_sheet("Notification Time", new_time, row_index)
+            write_player_cells(phone_number, [(row_index, "Notification Time", new_time)])
             send_whatsapp_message(
                 phone_number, f"Your notification time has been updated to {new_time}."
             )
@@ -93,6 +111,7 @@ def handle_change_command(phone_number: str, command_text: str) -> None:
             return
 
         acknowledgment = []
+        sheet_updates = []
 
         if "sports" in updates:
             sports_update = updates["sports"]
@@ -107,8 +126,8 @@ def handle_change_command(phone_number: str, command_text: str) -> None:
 
                 if added_sports:
                     updated_preferences = list(current_preferences | added_sports)
-                    update_google_sheet(
-                        "Preferences", ", ".join(updated_preferences), row_index
+                    sheet_updates.append(
+                        (row_index, "Preferences", ", ".join(updated_preferences))
                     )
                     acknowledgment.append(
                         f"Added new sports: {', '.join(added_sports)}. "
@@ -130,8 +149,8 @@ def handle_change_command(phone_number: str, command_text: str) -> None:
                 invalid_sports = set(sports_update["new"]) - SUPPORTED_SPORTS
 
                 if valid_sports:
-                    update_google_sheet(
-                        "Preferences", ", ".join(valid_sports), row_index
+                    sheet_updates.append(
+                        (row_index, "Preferences", ", ".join(valid_sports))
                     )
                     acknowledgment.append(
                         f"Your sports preferences have been updated to {', '.join(valid_sports)}."
@@ -142,6 +161,9 @@ def handle_change_command(phone_number: str, command_text: str) -> None:
                         f"The following sports are not supported: {', '.join(invalid_sports)}."
                     )
 
+        # Apply all sheet writes in one batch request
+        write_player_cells(phone_number, sheet_updates)
+
         if acknowledgment:
             send_whatsapp_message(
                 phone_number,
@@ -169,20 +191,18 @@ def is_valid_time_format(time_str: str) -> bool:
 
 def handle_add_command(phone_number: str, result: dict) -> None:
     try:
-        # Fetch player data from Google Sheets
-        players_df = fetch_sheet_data("player-response-sheet", "Players")
-        players_df["Phone Number"] = players_df["Phone Number"].apply(str).str.strip()
-        player = players_df[players_df["Phone Number"] == phone_number]
+        # Look up the player in the shared registry
+        registry = get_player_registry()
+        player_data = registry.get(phone_number)
 
-        if player.empty:
+        if player_data is None:
             send_whatsapp_message(
                 phone_number, "You are not registered. Please contact support."
             )
             return
 
-        # Extract the player's row index
-        player_data = player.iloc[0]
-        row_index = player.index[0] + 2  # Adjust for header
+        # Player's row index in Google Sheets
+        row_index = registry.row_index(phone_number)
 
         # Extract current preferences (normalized)
         current_sports = set(
@@ -208,16 +228,17 @@ def handle_add_command(phone_number: str, result: dict) -> None:
         logger.debug(f"New sports to add: {new_sports_to_add}")
         logger.debug(f"Already added sports: {already_added_sports}")
 
-        # Prepare response messages
+        # Prepare response messages and sheet writes
         response_parts = []
+        sheet_updates = []
 
         if new_sports_to_add:
             updated_preferences = list(current_sports | new_sports_to_add)
-            update_google_sheet(
+            sheet_updates.append((
+                row_index,
                 "Preferences",
                 ", ".join(sport.capitalize() for sport in updated_preferences),
-                row_index,
-            )
+            ))
             response_parts.append(
                 f"Added new sports to your preferences: {', '.join(sport.capitalize() for sport in new_sports_to_add)}."
             )
@@ -238,6 +259,9 @@ def handle_add_command(phone_number: str, result: dict) -> None:
         if not response_parts:
             response_parts.append("No changes were made to your preferences.")
 
+        # Apply all sheet writes in one batch request
+        write_player_cells(phone_number, sheet_updates)
+
         # Send the final response to the user
         send_whatsapp_message(phone_number, "\n".join(response_parts))
 
@@ -250,20 +274,18 @@ def handle_add_command(phone_number: str, result: dict) -> None:
 
 def handle_remove_command(phone_number: str, result: dict) -> None:
     try:
-        # Fetch player data from Google Sheets
-        players_df = fetch_sheet_data("player-response-sheet", "Players")
-        players_df["Phone Number"] = players_df["Phone Number"].apply(str).str.strip()
-        player = players_df[players_df["Phone Number"] == phone_number]
+        # Look up the player in the shared registry
+        registry = get_player_registry()
+        player_data = registry.get(phone_number)
 
-        if player.empty:
+        if player_data is None:
             send_whatsapp_message(
                 phone_number, "You are not registered. Please contact support."
             )
             return
 
-        # Extract the player's row index
-        player_data = player.iloc[0]
-        row_index = player.index[0] + 2  # Adjust for header
+        # Player's row index in Google Sheets
+        row_index = registry.row_index(phone_number)
 
         # Extract current preferences
         current_sports = set(
@@ -287,16 +309,17 @@ def handle_remove_command(phone_number: str, result: dict) -> None:
         logger.debug(f"Invalid sports: {invalid_sports}")
         logger.debug(f"Not in preferences: {not_in_preferences}")
 
-        # Prepare response messages
+        # Prepare response messages and sheet writes
         response_parts = []
+        sheet_updates = []
 
         if valid_sports_to_remove:
             updated_preferences = list(current_sports - valid_sports_to_remove)
-            update_google_sheet(
+            sheet_updates.append((
+                row_index,
                 "Preferences",
                 ", ".join(sport.capitalize() for sport in updated_preferences),
-                row_index,
-            )
+            ))
             response_parts.append(
                 f"Removed: {', '.join(sport.capitalize() for sport in valid_sports_to_remove)}."
             )
@@ -317,6 +340,9 @@ def handle_remove_command(phone_number: str, result: dict) -> None:
         if not response_parts:
             response_parts.append("No changes were made to your preferences.")
 
+        # Apply all sheet writes in one batch request
+        write_player_cells(phone_number, sheet_updates)
+
         # Send the final response to the user
         send_whatsapp_message(phone_number, "\n".join(response_parts))
 
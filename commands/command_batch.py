@@ -0,0 +1,90 @@
+import logging
+import threading
+from contextvars import ContextVar
+
+from sheets.google_sheets import as_user_entered, normalize_phone_number, update_google_sheet_cells
+from utils.player_events import emit_player_changed
+
+logger = logging.getLogger(__name__)
+
+# Batch the current command belongs to, if it runs in micro-batching mode
+current_batch = ContextVar("current_command_batch", default=None)
+
+
+class BatchRegistry:
+    """
+    Read view of a registry snapshot with the batch's own buffered writes applied on top, so a
+    sender's later commands in the same batch see their earlier changes.
+    """
+
+    def __init__(self, registry):
+        self._registry = registry
+        self._overrides = {}
+
+    def get(self, phone_number: str):
+        record = self._registry.get(phone_number)
+        if record is not None:
+            record.update(self._overrides.get(normalize_phone_number(phone_number), {}))
+        return record
+
+    def override(self, phone_number: str, column_name: str, value) -> None:
+        self._overrides.setdefault(normalize_phone_number(phone_number), {})[column_name] = as_user_entered(value)
+
+    def __getattr__(self, name):
+        return getattr(self._registry, name)
+
+    def __contains__(self, phone_number: str) -> bool:
+        return phone_number in self._registry
+
+    def __iter__(self):
+        return (self.get(phone_number) for phone_number in self._registry.phone_numbers())
+
+    def __len__(self) -> int:
+        return len(self._registry)
+
+
+class CommandBatch:
+    """
+    Commands handled together against one registry snapshot. Sheet writes are buffered and flushed
+    in one batch update, after which change events are emitted for every affected player.
+    """
+
+    def __init__(self, registry):
+        self.registry = BatchRegistry(registry)
+        self._sheet_updates = []
+        self._changed_fields = {}
+        self._lock = threading.Lock()
+
+    def record_write(self, phone_number: str, updates: list) -> None:
+        with self._lock:
+            self._sheet_updates.extend(updates)
+            fields = self._changed_fields.setdefault(phone_number, [])
+            for _, column_name, value in updates:
+                self.registry.override(phone_number, column_name, value)
+                if column_name not in fields:
+                    fields.append(column_name)
+
+    def writers(self) -> list:
+        """
+        Phone numbers with buffered writes not yet flushed.
+        """
+        with self._lock:
+            return list(self._changed_fields)
+
+    def flush(self) -> int:
+        """
+        Writes every buffered cell in one request and emits the change events. Returns the cell count.
+        """
+        with self._lock:
+            sheet_updates, self._sheet_updates = self._sheet_updates, []
+            changed_fields, self._changed_fields = self._changed_fields, {}
+
+        if not sheet_updates:
+            return 0
+
+        update_google_sheet_cells(sheet_updates)
+        for phone_number, fields in changed_fields.items():
+            emit_player_changed(phone_number, fields)
+
+        logger.info(f"Flushed {len(sheet_updates)} cells for {len(changed_fields)} players in one batch update.")
+        return len(sheet_updates)
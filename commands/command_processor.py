@@ -7,12 +7,34 @@ from commands.help_command import handle_help_command
 from commands.update_command import (
     handle_updates_command,
     handle_court_updates_command,
+    handle_more_command,
 )
 from commands.view_preferences_command import handle_view_preferences_command
 import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, wait
 from commands.message_parser import parse_change_command, parse_add_command, parse_remove_command
+from commands.command_batch import CommandBatch, current_batch
+from config.environment import (
+    COMMAND_QUEUE_WORKERS,
+    COMMAND_MAX_PENDING_PER_PHONE,
+    COMMAND_BATCH_WINDOW_MS,
+    COMMAND_BATCH_MAX_SIZE,
+)
+from sheets.player_registry import get_player_registry, pinned_registry
+from utils.histogram import Histogram
+from utils.keyed_executor import KeyedExecutor, KeyQueueFull
 logger = logging.getLogger(__name__)
 
+# Runs each phone number's commands in order, and different phone numbers in parallel
+command_executor = KeyedExecutor(COMMAND_QUEUE_WORKERS, COMMAND_MAX_PENDING_PER_PHONE, name="command")
+
+# Replies for commands that were turned away or whose changes could not be saved
+SLOW_DOWN_MESSAGE = "You're sending commands faster than we can process them. Please wait a moment and try again."
+SAVE_FAILED_MESSAGE = "Sorry, we couldn't save your latest changes. Please send the command again in a moment."
+
 # Define Supported Commands
 COMMANDS = {
     "update": "Get updates based on your preferences.",
@@ -20,6 +42,7 @@ COMMANDS = {
     "discontinue": "Unsubscribe from notifications.",
     "change": "Change preferences such as sports, notification timings, or days.",
     "updates on": "Get updates on specific courts.",
+    "more": "Show more slots from the last update.",
 }
 
 
@@ -59,6 +82,8 @@ def process_command(phone_number: str, command_text: str) -> None:
             handle_updates_command(phone_number)
         elif command.startswith(("updates on", "update on")):
             handle_court_updates_command(phone_number, command)
+        elif command == "more":
+            handle_more_command(phone_number)
         elif command == "help":
             handle_help_command(phone_number)
         elif command == "discontinue":
@@ -72,3 +97,145 @@ def process_command(phone_number: str, command_text: str) -> None:
             )
     except Exception as e:
         logger.error(f"Error processing command for {phone_number}: {e}")
+
+
+# --- Micro-Batched Command Processing ---
+class CommandBatcher:
+    """
+    Collects commands for up to window_seconds (or max_size commands) and processes them as one
+    batch: every sender is resolved against a single registry snapshot, handlers run on the keyed
+    executor, and their sheet writes are flushed in one batch update. Batches run one at a time, in
+    order, so each starts from a snapshot that includes the previous batch's writes.
+    """
+
+    def __init__(self, window_seconds: float, max_size: int):
+        self.window_seconds = window_seconds
+        self.max_size = max_size
+        self._pending = []
+        self._timer = None
+        self._lock = threading.Lock()
+        self._batches = queue.Queue()
+        self._worker = None
+        self.batch_sizes = Histogram([1, 5, 10, 25, 50, 100, 250, 500])
+        self.batch_windows = Histogram([0.05, 0.1, 0.25, 0.5, 1, 2.5])
+        self.command_latencies = Histogram([0.1, 0.25, 0.5, 1, 2.5, 5, 10])
+
+    def submit(self, phone_number: str, command_text: str) -> Future:
+        future = Future()
+
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run_batches, name="command-batcher", daemon=True)
+                self._worker.start()
+
+            self._pending.append((phone_number, command_text, future, time.monotonic()))
+            if len(self._pending) >= self.max_size:
+                self._close_window()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.window_seconds, self._on_window_closed)
+                self._timer.daemon = True
+                self._timer.start()
+
+        return future
+
+    def _close_window(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._pending:
+            self._batches.put(self._pending)
+            self._pending = []
+
+    def _on_window_closed(self) -> None:
+        with self._lock:
+            self._close_window()
+
+    def _run_batches(self) -> None:
+        while True:
+            entries = self._batches.get()
+            try:
+                self._run_batch(entries)
+            except Exception as e:
+                logger.error(f"Failed to process a batch of {len(entries)} commands: {e}")
+                for _, _, future, _ in entries:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _run_batch(self, entries: list) -> None:
+        started_at = time.monotonic()
+        self.batch_sizes.observe(len(entries))
+        self.batch_windows.observe(started_at - entries[0][3])
+
+        batch = CommandBatch(get_player_registry())
+        handled = []
+        for phone_number, command_text, future, _ in entries:
+            try:
+                handled.append(command_executor.submit(
+                    phone_number, _process_in_batch, batch, phone_number, command_text
+                ))
+            except KeyQueueFull as e:
+                logger.warning(f"Too many pending commands from {phone_number}; dropping {command_text!r}.")
+                send_whatsapp_message(phone_number, SLOW_DOWN_MESSAGE)
+                future.set_exception(e)
+                handled.append(None)
+            except Exception as e:
+                future.set_exception(e)
+                handled.append(None)
+        wait([handler for handler in handled if handler is not None])
+
+        writers = batch.writers()
+        try:
+            batch.flush()
+            flush_error = None
+        except Exception as e:
+            logger.error(f"Failed to flush sheet writes for a batch of {len(entries)} commands: {e}")
+            flush_error = e
+            # Their handlers already confirmed the change, so tell them it didn't stick
+            for phone_number in writers:
+                send_whatsapp_message(phone_number, SAVE_FAILED_MESSAGE)
+
+        finished_at = time.monotonic()
+        for (phone_number, _, future, submitted_at), handler in zip(entries, handled):
+            if handler is None:
+                continue
+            self.command_latencies.observe(finished_at - submitted_at)
+            error = handler.exception() or flush_error
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(None)
+
+        logger.info(f"Processed a batch of {len(entries)} commands in {finished_at - started_at:.3f}s.")
+
+    def stats(self) -> dict:
+        return {
+            "window_seconds": self.window_seconds,
+            "max_size": self.max_size,
+            "batch_size": self.batch_sizes.snapshot(),
+            "batch_window_seconds": self.batch_windows.snapshot(),
+            "command_latency_seconds": self.command_latencies.snapshot(),
+        }
+
+
+def _process_in_batch(batch: CommandBatch, phone_number: str, command_text: str) -> None:
+    token = current_batch.set(batch)
+    try:
+        with pinned_registry(batch.registry):
+            process_command(phone_number, command_text)
+    finally:
+        current_batch.reset(token)
+
+
+command_batcher = CommandBatcher(COMMAND_BATCH_WINDOW_MS / 1000, COMMAND_BATCH_MAX_SIZE) if COMMAND_BATCH_WINDOW_MS > 0 else None
+
+
+# --- Ordered Command Submission ---
+def submit_command(phone_number: str, command_text: str):
+    """
+    Queues process_command behind the sender's earlier commands and returns its Future.
+    Raises KeyQueueFull if the sender already has too many commands waiting.
+    In micro-batching mode the command joins the current batch instead.
+    """
+    if command_batcher is not None:
+        return command_batcher.submit(phone_number, command_text)
+    return command_executor.submit(phone_number, process_command, phone_number, command_text)
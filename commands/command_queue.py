@@ -0,0 +1,171 @@
+import json
+import logging
+import queue
+import threading
+import time
+from collections import deque
+
+from commands.command_processor import SLOW_DOWN_MESSAGE, command_executor, submit_command
+from config.environment import COMMAND_QUEUE_KEY
+from notifications.whatsapp_notifier import send_whatsapp_message
+from utils.keyed_executor import KeyQueueFull
+from utils.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# How long the dispatcher blocks on an empty queue before checking the local fallback again
+POLL_TIMEOUT_SECONDS = 1
+
+
+class CommandQueue:
+    """
+    Queue of inbound commands, read in arrival order by one dispatcher thread and run on the
+    keyed command executor (ordered per phone number, parallel across phone numbers).
+    Commands go to a Redis list and sit on a processing list until they finish, so commands in
+    flight when the process dies are requeued on the next start. When Redis is unreachable,
+    commands fall back to an in-process queue.
+    """
+
+    def __init__(self, key: str, submit=submit_command):
+        self.key = key
+        self.processing_key = f"{key}:processing"
+        self.submit = submit
+        self._local = queue.Queue()
+        self._dispatcher = None
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=1000)
+        self.enqueued = 0
+        self.processed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.local_fallbacks = 0
+
+    def enqueue(self, phone_number: str, command_text: str) -> None:
+        payload = json.dumps({"phone_number": phone_number, "body": command_text, "received_at": time.time()})
+        try:
+            redis_client.lpush(self.key, payload)
+        except Exception as e:
+            logger.warning(f"Redis unavailable, queueing command from {phone_number} locally: {e}")
+            self._local.put(payload)
+            with self._lock:
+                self.local_fallbacks += 1
+
+        with self._lock:
+            self.enqueued += 1
+        self.start()
+
+    def start(self) -> None:
+        """
+        Starts the dispatcher once, requeueing commands a previous process left unfinished.
+        """
+        with self._lock:
+            if self._dispatcher:
+                return
+
+            try:
+                requeued = 0
+                # Newest claim first onto the consuming end, so the oldest unfinished command runs first
+                while redis_client.lmove(self.processing_key, self.key, "LEFT", "RIGHT") is not None:
+                    requeued += 1
+                if requeued:
+                    logger.info(f"Requeued {requeued} unfinished commands.")
+            except Exception as e:
+                logger.warning(f"Could not recover unfinished commands: {e}")
+
+            self._dispatcher = threading.Thread(target=self._dispatch_forever, name="command-dispatcher", daemon=True)
+            self._dispatcher.start()
+            logger.info("Started command queue dispatcher.")
+
+    def _dispatch_forever(self) -> None:
+        while True:
+            try:
+                self._dispatch(self._local.get_nowait(), from_redis=False)
+                continue
+            except queue.Empty:
+                pass
+
+            try:
+                payload = redis_client.blmove(self.key, self.processing_key, POLL_TIMEOUT_SECONDS, "RIGHT", "LEFT")
+            except Exception as e:
+                logger.error(f"Failed to read from command queue: {e}")
+                # Fall back to waiting on the local queue instead of spinning on Redis errors
+                try:
+                    self._dispatch(self._local.get(timeout=POLL_TIMEOUT_SECONDS), from_redis=False)
+                except queue.Empty:
+                    pass
+                continue
+
+            if payload is not None:
+                self._dispatch(payload, from_redis=True)
+
+    def _dispatch(self, payload, from_redis: bool) -> None:
+        try:
+            command = json.loads(payload)
+            future = self.submit(command["phone_number"], command["body"])
+        except KeyQueueFull:
+            logger.warning(f"Too many pending commands from {command['phone_number']}; dropping {command['body']!r}.")
+            with self._lock:
+                self.rejected += 1
+            self._acknowledge(payload, from_redis)
+            send_whatsapp_message(command["phone_number"], SLOW_DOWN_MESSAGE)
+            return
+        except Exception as e:
+            logger.error(f"Failed to dispatch queued command {payload!r}: {e}")
+            with self._lock:
+                self.failed += 1
+            self._acknowledge(payload, from_redis)
+            return
+
+        future.add_done_callback(lambda done: self._finish(done, payload, command, from_redis))
+
+    def _finish(self, future, payload, command: dict, from_redis: bool) -> None:
+        with self._lock:
+            if future.exception() is None:
+                self.processed += 1
+                self._latencies.append(time.time() - command["received_at"])
+            elif isinstance(future.exception(), KeyQueueFull):
+                # Turned away by the batcher, which has already asked the sender to slow down
+                self.rejected += 1
+            else:
+                logger.error(f"Failed to process queued command {payload!r}: {future.exception()}")
+                self.failed += 1
+        self._acknowledge(payload, from_redis)
+
+    def _acknowledge(self, payload, from_redis: bool) -> None:
+        if not from_redis:
+            return
+        try:
+            redis_client.lrem(self.processing_key, 1, payload)
+        except Exception as e:
+            logger.error(f"Failed to acknowledge command {payload!r}: {e}")
+
+    def depth(self) -> int:
+        try:
+            return redis_client.llen(self.key) + self._local.qsize()
+        except Exception:
+            return self._local.qsize()
+
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = {
+                "enqueued": self.enqueued,
+                "processed": self.processed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "local_fallbacks": self.local_fallbacks,
+            }
+
+        stats["depth"] = self.depth()
+        stats["executor"] = command_executor.stats()
+        if latencies:
+            stats["latency_seconds"] = {
+                "mean": round(sum(latencies) / len(latencies), 4),
+                "p50": round(latencies[len(latencies) // 2], 4),
+                "p95": round(latencies[int(len(latencies) * 0.95)], 4),
+                "max": round(latencies[-1], 4),
+            }
+        return stats
+
+
+command_queue = CommandQueue(COMMAND_QUEUE_KEY)
@@ -1,15 +1,13 @@
 from notifications.whatsapp_notifier import send_whatsapp_message
-from scheduler.notification_scheduler import scheduler
+from scheduler.notification_scheduler import unschedule_notification
 import logging
 
 logger = logging.getLogger(__name__)
 
 def handle_discontinue_command(phone_number: str) -> None:
     try:
-        job_id = f"{phone_number}_notification"
-
-        # Remove job from scheduler
-        scheduler.remove_job(job_id)
+        # Remove the player's job or bucket membership
+        unschedule_notification(phone_number)
         logger.info(f"Successfully unsubscribed {phone_number} from notifications.")
 
         # Send confirmation message
@@ -43,6 +43,7 @@ def handle_help_command(phone_number: str) -> None:
             
             "*4. General Commands*\n"
             "✅ *update*: Get notifications based on your preferences immediately.\n"
+            "✅ *more*: Show more slots from your last update.\n"
             "✅ *help*: Show this help message.\n"
             "✅ *discontinue*: Unsubscribe from updates.\n"
             "✅ *change sports from [old sports] to [new sports]*: Update sports preferences.\n"
@@ -1,36 +1,28 @@
 # commands/update_command.py
 
 from notifications.whatsapp_notifier import send_whatsapp_message
-from sheets.google_sheets import (
-    fetch_sheet_data, 
-    fetch_not_booked_slots, 
-    parse_date_from_sheet, 
-    validate_slot_timing
-)
+from notifications.message_builder import message_builder
+from sheets.google_sheets import fetch_not_booked_slots
+from sheets.player_registry import get_player_registry
 from commands.message_parser import parse_change_command, parse_court_name
 import logging
-import pandas as pd
 
 logger = logging.getLogger(__name__)
 
 # --- Handle Updates Command ---
 def handle_updates_command(phone_number: str) -> None:
     try:
-        players_df = fetch_sheet_data("player-response-sheet", "Players")
-        players_df["Phone Number"] = players_df["Phone Number"].apply(str).str.strip()
-
         # Check if the player exists
-        player = players_df[players_df["Phone Number"] == phone_number]
+        player_data = get_player_registry().get(phone_number)
 
-        if player.empty:
+        if player_data is None:
             send_whatsapp_message(
                 phone_number, 
                 "You are not registered. Please contact support."
             )
             return
 
-        # Extract player data and send updates
-        player_data = player.iloc[0]
+        # Send updates for the player's preferences
         send_latest_updates(player_data, phone_number)
     except Exception as e:
         logger.error(f"Error handling updates for {phone_number}: {e}")
@@ -70,7 +62,7 @@ def handle_court_updates_command(phone_number: str, command_text: str) -> None:
                 f"No available slots for {court_name} at the moment."
             )
         else:
-            message = construct_update_message(court_name, matching_slots)
+            message = message_builder.render(court_name, matching_slots, phone_number)
             send_whatsapp_message(phone_number, message)
 
     except Exception as e:
@@ -80,84 +72,27 @@ def handle_court_updates_command(phone_number: str, command_text: str) -> None:
 # --- Send Latest Updates ---
 def send_latest_updates(player, phone_number: str):
     try:
-        # Fetch all available slots
-        all_slots = fetch_not_booked_slots()
-
-        if all_slots.empty:
-            send_whatsapp_message(
-                phone_number, 
-                f"Hi {player['Player Name']}, no available slots match your preferences right now."
-            )
-            return
-
-        # Match player preferences
-        preferred_localities = [loc.strip().lower() for loc in player["Locality"].split(",")]
-        preferred_sports = [sport.strip().lower() for sport in player["Preferences"].split(",")]
-
-        matching_slots = all_slots[
-            (all_slots["Locality"].isin(preferred_localities)) & 
-            (all_slots["Sport"].isin(preferred_sports))
-        ]
+        # Match player preferences against the cached digests
+        message = message_builder.digest(
+            player["Player Name"], player["Locality"].split(","), player["Preferences"].split(","), phone_number
+        )
 
-        if matching_slots.empty:
+        if message is None:
             send_whatsapp_message(
                 phone_number, 
                 f"Hi {player['Player Name']}, no available slots match your preferences right now."
             )
         else:
-            message = construct_update_message(player["Player Name"], matching_slots)
             send_whatsapp_message(phone_number, message)
 
     except Exception as e:
         logger.error(f"Error fetching updates for {player['Player Name']}: {e}")
 
 
-# --- Construct WhatsApp Update Message ---
-def construct_update_message(player_name: str, slots_df: pd.DataFrame) -> str:
-    if slots_df.empty:
-        return f"Hi {player_name}, currently no available slots match your preferences."
-
-    message = f"Hi {player_name}, here are the latest updates for your preferences:\n\n"
-
-    for _, slot in slots_df.iterrows():
-        details = []
-
-        # Add Slot Details
-        if "Business" in slot:
-            details.append(f"*Turf*: {slot['Business'].capitalize()}")
-
-        if "Sport" in slot:
-            details.append(f"*Sport*: {slot['Sport'].capitalize()}")
-
-        if "Locality" in slot:
-            details.append(f"*Area*: {slot['Locality'].capitalize()}")
-
-        if "Date" in slot and slot["Date"] not in [None, ""]:
-            try:
-                formatted_date = parse_date_from_sheet(slot["Date"])
-                details.append(f"*Date*: {formatted_date}")
-            except ValueError:
-                details.append(f"*Date*: Invalid Date Format")
-        else:
-            details.append(f"*Date*: Not Provided")
-
-        if "Timing" in slot and validate_slot_timing(slot["Timing"]):
-            details.append(f"*Timing*: {slot['Timing']}")
-        else:
-            details.append(f"*Timing*: Invalid time format")
-
-        if "Price" in slot and slot["Price"] not in [None, ""]:
-            details.append(f"*Price*: ₹{slot['Price']}")
-        else:
-            details.append(f"*Price*: Not Provided")
-
-        if "Booking" in slot and slot["Booking"] not in [None, ""]:
-            details.append(f"👉 *Book Now*: {slot['Booking']}")
-        else:
-            details.append(f"👉 *Book Now*: Booking link not available")
-
-        # Join details with ' | ' and append to the message
-        message += " | ".join(details) + "\n\n"
-
-    logger.debug(f"Constructed message:\n{message}")
-    return message
+# --- Handle More Command ---
+def handle_more_command(phone_number: str) -> None:
+    try:
+        # Send the next page of the player's last digest
+        send_whatsapp_message(phone_number, message_builder.more(phone_number))
+    except Exception as e:
+        logger.error(f"Error sending more updates to {phone_number}: {e}")
@@ -1,26 +1,20 @@
 import logging
 from notifications.whatsapp_notifier import send_whatsapp_message
-from sheets.google_sheets import fetch_sheet_data
+from sheets.player_registry import get_player_registry
 
 logger = logging.getLogger(__name__)
 
 def handle_view_preferences_command(phone_number: str) -> None:
     try:
-        players_df = fetch_sheet_data("player-response-sheet", "Players")
-        players_df["Phone Number"] = players_df["Phone Number"].apply(str).str.strip()
+        player_data = get_player_registry().get(phone_number)
 
-        player = players_df[players_df["Phone Number"] == phone_number]
-
-        if player.empty:
+        if player_data is None:
             send_whatsapp_message(
                 phone_number, 
                 "You are not registered. Please contact support."
             )
             return
 
-        # Extract player data
-        player_data = player.iloc[0]
-
         preferences_message = (
             f"Your current preferences are:\n\n"
             f"• *Sports*: {player_data['Preferences']}\n"
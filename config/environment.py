@@ -25,3 +25,73 @@ TWILIO_SANDBOX_NUMBER = os.getenv("TWILIO_SANDBOX_NUMBER")
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
 REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
 REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", None)
+
+# Google Sheets Read Cache
+SHEET_CACHE_TTL_SECONDS = float(os.getenv("SHEET_CACHE_TTL_SECONDS", 30))
+SHEET_CACHE_MAX_ENTRIES = int(os.getenv("SHEET_CACHE_MAX_ENTRIES", 32))
+SHEET_HANDLE_REFRESH_SECONDS = float(os.getenv("SHEET_HANDLE_REFRESH_SECONDS", 300))
+
+# Business Workspace Slot Reads ("batch" or "concurrent")
+SLOT_FETCH_MODE = os.getenv("SLOT_FETCH_MODE", "batch").lower()
+SLOT_FETCH_WORKERS = int(os.getenv("SLOT_FETCH_WORKERS", 4))
+
+# Sheet Date Parsing
+DATE_PARSE_CACHE_SIZE = int(os.getenv("DATE_PARSE_CACHE_SIZE", 4096))
+
+# Notification Scheduling ("per_player" or "bucketed")
+NOTIFICATION_SCHEDULING_MODE = os.getenv("NOTIFICATION_SCHEDULING_MODE", "per_player").lower()
+NOTIFICATION_BATCH_SIZE = int(os.getenv("NOTIFICATION_BATCH_SIZE", 200))
+
+# Scheduler Job Store ("apscheduler" or "indexed")
+SCHEDULER_JOBSTORE = os.getenv("SCHEDULER_JOBSTORE", "apscheduler").lower()
+SCHEDULER_JOB_LOAD_BATCH_SIZE = int(os.getenv("SCHEDULER_JOB_LOAD_BATCH_SIZE", 1000))
+# Compressed job payloads are only readable by the indexed store and are ignored otherwise
+SCHEDULER_JOB_COMPRESSION = os.getenv("SCHEDULER_JOB_COMPRESSION", "false").lower() == "true"
+
+# Full Notification Resync (minutes between background runs)
+NOTIFICATION_RESYNC_MINUTES = float(os.getenv("NOTIFICATION_RESYNC_MINUTES", 60))
+
+# Inbound Command Queue
+COMMAND_QUEUE_KEY = os.getenv("COMMAND_QUEUE_KEY", "command_queue")
+COMMAND_QUEUE_WORKERS = int(os.getenv("COMMAND_QUEUE_WORKERS", 4))
+TWILIO_VALIDATE_SIGNATURE = os.getenv("TWILIO_VALIDATE_SIGNATURE", "false").lower() == "true"
+COMMAND_MAX_PENDING_PER_PHONE = int(os.getenv("COMMAND_MAX_PENDING_PER_PHONE", 10))
+
+# Micro-Batched Command Processing (0 disables batching)
+COMMAND_BATCH_WINDOW_MS = float(os.getenv("COMMAND_BATCH_WINDOW_MS", 0))
+COMMAND_BATCH_MAX_SIZE = int(os.getenv("COMMAND_BATCH_MAX_SIZE", 200))
+
+# Outbound WhatsApp Pipeline (0 workers sends inline)
+OUTBOUND_WORKERS = int(os.getenv("OUTBOUND_WORKERS", 8))
+OUTBOUND_RATE_PER_SECOND = float(os.getenv("OUTBOUND_RATE_PER_SECOND", 10))
+# Per sender overrides as "number=rate" pairs, e.g. "+14155238886=1,+919800000000=20"
+OUTBOUND_SENDER_RATES = {
+    number.strip(): float(rate)
+    for number, rate in (pair.split("=") for pair in os.getenv("OUTBOUND_SENDER_RATES", "").split(",") if "=" in pair)
+}
+TWILIO_API_BASE_URL = os.getenv("TWILIO_API_BASE_URL")
+
+# Failed WhatsApp Sends
+WHATSAPP_RETRY_KEY = os.getenv("WHATSAPP_RETRY_KEY", "whatsapp_retry")
+WHATSAPP_DEAD_LETTER_KEY = os.getenv("WHATSAPP_DEAD_LETTER_KEY", "whatsapp_dead_letter")
+WHATSAPP_RETRY_MAX_DELAY_SECONDS = float(os.getenv("WHATSAPP_RETRY_MAX_DELAY_SECONDS", 300))
+# How long a retry claimed by a process that stopped may stay unsent before another process claims it.
+# Live processes extend their claims every third of this, however long the dispatcher queue makes them wait.
+WHATSAPP_RETRY_VISIBILITY_SECONDS = float(os.getenv("WHATSAPP_RETRY_VISIBILITY_SECONDS", 600))
+
+# Digest Waves ("dispatcher" queues each digest; "async" sends a wave from one event loop)
+DIGEST_SEND_MODE = os.getenv("DIGEST_SEND_MODE", "dispatcher").lower()
+ASYNC_SEND_CONCURRENCY = int(os.getenv("ASYNC_SEND_CONCURRENCY", 200))
+
+# Rendered Digest Cache (entries per slot snapshot, locality set and sport set)
+MESSAGE_CACHE_MAX_ENTRIES = int(os.getenv("MESSAGE_CACHE_MAX_ENTRIES", 1024))
+
+# Digest Pages (slots and UTF-8 bytes per message; pages kept for "more" replies and for how long)
+DIGEST_TOP_K = int(os.getenv("DIGEST_TOP_K", 10))
+DIGEST_MAX_BYTES = int(os.getenv("DIGEST_MAX_BYTES", 1600))
+DIGEST_MORE_PAGES = int(os.getenv("DIGEST_MORE_PAGES", 5))
+DIGEST_MORE_TTL_SECONDS = int(os.getenv("DIGEST_MORE_TTL_SECONDS", 86400))
+
+# Digest Contents ("delta" sends only slots a player hasn't been sent yet; "full" sends every match)
+NOTIFICATION_CONTENT_MODE = os.getenv("NOTIFICATION_CONTENT_MODE", "delta").lower()
+SEEN_SLOTS_DEFAULT_TTL_SECONDS = int(os.getenv("SEEN_SLOTS_DEFAULT_TTL_SECONDS", 7 * 24 * 3600))
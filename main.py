@@ -1,7 +1,14 @@
 from flask import Flask, jsonify, request
 from scheduler.scheduler_service import scheduler
 from sheets.player_data import process_player_notifications
-from commands.command_processor import process_command
+from commands.command_queue import command_queue
+from commands.command_processor import command_batcher
+from notifications.message_builder import message_builder
+from notifications.seen_slots import seen_slots
+from notifications.whatsapp_notifier import get_outbound_stats, retry_queue
+from sheets.google_sheets import get_sheet_cache_stats, get_sheet_fetch_stats, get_date_parser_stats
+from config.environment import NOTIFICATION_RESYNC_MINUTES, TWILIO_AUTH_TOKEN, TWILIO_VALIDATE_SIGNATURE
+from twilio.request_validator import RequestValidator
 import logging
 from datetime import datetime, timedelta
 
@@ -12,6 +19,23 @@ app = Flask(__name__)
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+RESYNC_JOB_ID = "player_notifications_resync"
+
+# --- Full Notification Resync ---
+def schedule_notification_resync(run_now: bool = False):
+    """
+    Registers the periodic background job that resyncs every player's notifications with the sheet.
+    With run_now, the next run happens immediately.
+    """
+    scheduler.add_job(
+        func=process_player_notifications,
+        trigger="interval",
+        minutes=NOTIFICATION_RESYNC_MINUTES,
+        id=RESYNC_JOB_ID,
+        replace_existing=True,
+        **({"next_run_time": datetime.now(scheduler.timezone)} if run_now else {}),
+    )
+
 # --- Scheduler Initialization ---
 def initialize_scheduler():
     """
@@ -26,6 +50,7 @@ def initialize_scheduler():
 
         logger.info("Restoring scheduled jobs from Google Sheets...")
         process_player_notifications()  # Restore jobs on startup
+        schedule_notification_resync()
 
         # Print jobs for detailed review
         scheduled_jobs = scheduler.get_jobs()
@@ -47,59 +72,91 @@ def index():
     """
     return {"status": "running"}, 200
 
+# --- Metrics Endpoint ---
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """
+    Exposes in-process cache counters for monitoring.
+    """
+    return {
+        "sheet_cache": get_sheet_cache_stats(),
+        "sheet_fetch": get_sheet_fetch_stats(),
+        "date_parser": get_date_parser_stats(),
+        "command_queue": command_queue.stats(),
+        "command_batching": command_batcher.stats() if command_batcher else None,
+        "outbound": get_outbound_stats(),
+        "message_cache": message_builder.stats(),
+        "seen_slots": seen_slots.stats(),
+    }, 200
+
 # --- Manual Schedule Endpoint ---
 @app.route("/schedule", methods=["GET"])
 def schedule():
     """
-    Manually trigger job scheduling for notifications.
+    Manually trigger job scheduling for notifications. The full resync runs in the background.
     """
     try:
-        logger.info("Fetching player notifications from Google Sheets...")
-        process_player_notifications()  # Manual scheduling trigger
+        logger.info("Queueing a full notification resync...")
+        schedule_notification_resync(run_now=True)  # Manual scheduling trigger
 
-        # Print scheduled jobs after processing
-        scheduled_jobs = scheduler.get_jobs()
-        if scheduled_jobs:
-            logger.info("Updated scheduled jobs:")
-            for job in scheduled_jobs:
-                logger.info(f"Job: {job.id} | Next Run: {job.next_run_time}")
-        else:
-            logger.warning("No jobs scheduled after manual scheduling.")
-
-        return {"status": "notifications scheduled"}, 200
+        return {"status": "notification resync queued", "job_id": RESYNC_JOB_ID}, 202
     except Exception as e:
         logger.error(f"Error scheduling notifications: {e}")
         return jsonify({"status": "error", "message": str(e)}), 500
 
+# --- Dead-Lettered Messages Endpoints ---
+@app.route("/dead-letters", methods=["GET"])
+def dead_letters():
+    """
+    Lists WhatsApp messages that exhausted their retries, newest first.
+    """
+    try:
+        limit = int(request.args.get("limit", 100))
+        return {"dead_letters": retry_queue.dead_letters(limit)}, 200
+    except Exception as e:
+        logger.error(f"Error reading dead letters: {e}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+@app.route("/dead-letters/replay", methods=["POST"])
+def replay_dead_letters():
+    """
+    Moves dead-lettered messages (all, or the oldest `limit`) back onto the retry queue.
+    """
+    try:
+        limit = request.args.get("limit")
+        replayed = retry_queue.replay_dead_letters(int(limit) if limit else None)
+        return {"status": "replayed", "count": replayed}, 200
+    except Exception as e:
+        logger.error(f"Error replaying dead letters: {e}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
 # --- Webhook for Twilio WhatsApp Messages ---
-# --- Webhook for Twilio WhatsApp Messages ---
+twilio_validator = RequestValidator(TWILIO_AUTH_TOKEN)
+
 @app.route("/twilio-webhook", methods=["POST"])
 def twilio_webhook():
     """
     Handle incoming WhatsApp messages from Twilio.
-    Reschedules jobs after every change command.
+    Commands are queued and processed by background workers so Twilio gets an immediate reply.
     """
     try:
+        if TWILIO_VALIDATE_SIGNATURE and not twilio_validator.validate(
+            request.url, request.form, request.headers.get("X-Twilio-Signature", "")
+        ):
+            logger.warning("Rejected /twilio-webhook request with an invalid Twilio signature.")
+            return "Forbidden", 403
+
         incoming_message = request.form.get("Body")
-        phone_number = request.form.get("From").replace("whatsapp:", "")
+        sender = request.form.get("From")
+        if incoming_message is None or not sender:
+            logger.warning("Rejected /twilio-webhook request without Body or From.")
+            return "Bad Request", 400
 
+        phone_number = sender.replace("whatsapp:", "")
         logger.info(f"Message from {phone_number}: {incoming_message}")
-        
-        # Process the command and update Google Sheets
-        process_command(phone_number, incoming_message)
 
-        # Fetch updated notifications from Google Sheets
-        logger.info("Rescheduling notifications after preference update...")
-        process_player_notifications()
-
-        # Print updated jobs
-        scheduled_jobs = scheduler.get_jobs()
-        if scheduled_jobs:
-            logger.info("Updated scheduled jobs after processing command:")
-            for job in scheduled_jobs:
-                logger.info(f"Job: {job.id} | Next Run: {job.next_run_time}")
-        else:
-            logger.warning("No jobs scheduled after processing command.")
+        # Queue the command; workers update Google Sheets and reply
+        command_queue.enqueue(phone_number, incoming_message)
 
         return "OK", 200
     except Exception as e:
@@ -124,7 +181,7 @@ def test_schedule():
             trigger="date",
             run_date=datetime.utcnow() + timedelta(seconds=60),
             id=job_id,
-            args=[player, "Test notification from Flask!"],
+            args=[player],
             replace_existing=True,
         )
         logger.info(f"Scheduled test job {job_id}.")
@@ -147,4 +204,6 @@ def test_schedule():
 if __name__ == "__main__":
     logger.info("Starting Flask app...")
     initialize_scheduler()  # Initialize scheduler and restore jobs
+    command_queue.start()
+    retry_queue.start()  # Resume retries left from a previous run
     app.run(host="0.0.0.0", port=8000, debug=True, use_reloader=False)
@@ -0,0 +1,89 @@
+import asyncio
+import logging
+import time
+
+from aiohttp import ClientSession, TCPConnector
+from twilio.http.async_http_client import AsyncTwilioHttpClient
+from twilio.rest import Client
+
+from config.environment import (
+    ASYNC_SEND_CONCURRENCY,
+    TWILIO_API_BASE_URL,
+    TWILIO_AUTH_TOKEN,
+    TWILIO_SID,
+)
+from notifications.outbound_dispatcher import PRIORITY_DIGEST
+from notifications.seen_slots import seen_slots
+from notifications.twilio_client import TWILIO_SANDBOX_NUMBER
+from notifications.whatsapp_notifier import outbound_dispatcher, retry_queue
+
+logger = logging.getLogger(__name__)
+
+
+async def send_messages_async(messages: list, sender: str = TWILIO_SANDBOX_NUMBER,
+                              concurrency: int = ASYNC_SEND_CONCURRENCY, priority: int = PRIORITY_DIGEST,
+                              retries: int = 3, delay: int = 5) -> dict:
+    """
+    Sends (to, body) messages concurrently over one pooled aiohttp session, with at most
+    concurrency requests in flight and the sender's token bucket, shared with the outbound
+    dispatcher, applied. Failed sends go to the retry queue. Returns counts of sent and failed messages.
+    """
+    http_client = AsyncTwilioHttpClient(pool_connections=False)
+    http_client.session = ClientSession(connector=TCPConnector(limit=concurrency))
+    client = Client(TWILIO_SID, TWILIO_AUTH_TOKEN, http_client=http_client)
+    if TWILIO_API_BASE_URL:
+        client.api.base_url = TWILIO_API_BASE_URL
+
+    semaphore = asyncio.Semaphore(concurrency)
+    # The same bucket the dispatcher's workers draw from, so both paths together stay within the rate
+    bucket = outbound_dispatcher.bucket(sender)
+    results = {"sent": 0, "failed": 0}
+
+    async def send_one(to: str, body: str) -> None:
+        async with semaphore:
+            wait = bucket.reserve()
+            if wait:
+                await asyncio.sleep(wait)
+
+            try:
+                await client.messages.create_async(from_=f"whatsapp:{sender}", body=body, to=f"whatsapp:{to}")
+                results["sent"] += 1
+                if getattr(body, "slots", None):
+                    await asyncio.to_thread(seen_slots.mark_delivered, to, body)
+            except Exception as e:
+                logger.error(f"Attempt 1: Failed to send message to {to}. Error: {e}")
+                results["failed"] += 1
+                # Scheduling the retry talks to Redis, so keep it off the event loop
+                await asyncio.to_thread(
+                    retry_queue.retry_later,
+                    {
+                        "sender": sender,
+                        "to": to,
+                        "body": body,
+                        "priority": priority,
+                        "attempt": 1,
+                        "max_attempts": retries,
+                        "base_delay": delay,
+                        "seen_slots": getattr(body, "slots", []),
+                    },
+                    e,
+                )
+
+    started_at = time.perf_counter()
+    try:
+        await asyncio.gather(*(send_one(to, body) for to, body in messages))
+    finally:
+        await http_client.close()
+
+    elapsed = time.perf_counter() - started_at
+    logger.info(f"Sent {results['sent']} of {len(messages)} messages asynchronously in {elapsed:.2f}s.")
+    return results
+
+
+def send_messages(messages: list, **kwargs) -> dict:
+    """
+    Blocking entry point for send_messages_async, for scheduler jobs and other threads without a running loop.
+    """
+    if not messages:
+        return {"sent": 0, "failed": 0}
+    return asyncio.run(send_messages_async(messages, **kwargs))
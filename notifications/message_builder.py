@@ -0,0 +1,346 @@
+import heapq
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from datetime import datetime
+
+import pandas as pd
+
+from config.environment import (
+    DIGEST_MAX_BYTES,
+    DIGEST_MORE_PAGES,
+    DIGEST_MORE_TTL_SECONDS,
+    DIGEST_TOP_K,
+    MESSAGE_CACHE_MAX_ENTRIES,
+    NOTIFICATION_CONTENT_MODE,
+)
+from notifications.seen_slots import SlotMessage, seen_slots, slot_fingerprint, slot_id
+from sheets.google_sheets import format_slot_date, parse_slot_date, validate_slot_timing
+from sheets.slot_index import get_slot_index
+from utils.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+DIGEST_GREETING = "Hi {player_name}, here are the latest updates for your preferences:\n\n"
+MORE_GREETING = "Here are more available slots:\n\n"
+MORE_FOOTER = "Reply *more* to see {remaining} more slots."
+NO_MATCHES_MESSAGE = "Hi {player_name}, currently no available slots match your preferences."
+NO_MORE_MESSAGE = "There are no more slots to show. Reply *update* for the latest slots."
+
+# Redis list of the rendered slot lines a player can still page through with "more"
+MORE_KEY = "digest_more:{phone_number}"
+
+# Slots ranked per digest: the first page and every page kept for "more"
+RANKED_SLOTS = DIGEST_TOP_K * (DIGEST_MORE_PAGES + 1)
+
+# A matched slot, ready to rank, render and remember as seen
+RankedSlot = namedtuple("RankedSlot", ["rank_key", "position", "line", "slot_id", "fingerprint", "starts_at"])
+
+
+# --- Render One Slot ---
+def render_slot_line(slot) -> str:
+    """
+    Renders one slot as a digest line, e.g. "*Turf*: Turfxl | *Sport*: Padel | ... | 👉 *Book Now*: <link>".
+    """
+    details = []
+
+    # Add Slot Details
+    if "Business" in slot:
+        details.append(f"*Turf*: {slot['Business'].capitalize()}")
+
+    if "Sport" in slot:
+        details.append(f"*Sport*: {slot['Sport'].capitalize()}")
+
+    if "Locality" in slot:
+        details.append(f"*Area*: {slot['Locality'].capitalize()}")
+
+    if "Date" in slot and slot["Date"] not in [None, ""]:
+        try:
+            slot_date = parse_slot_date(slot["Date"], context=(slot.get("Business"), "Date"))
+            details.append(f"*Date*: {format_slot_date(slot_date)}")
+        except ValueError:
+            details.append(f"*Date*: Invalid Date Format")
+    else:
+        details.append(f"*Date*: Not Provided")
+
+    if "Timing" in slot and validate_slot_timing(slot["Timing"]):
+        details.append(f"*Timing*: {slot['Timing']}")
+    else:
+        details.append(f"*Timing*: Invalid time format")
+
+    if "Price" in slot and slot["Price"] not in [None, ""]:
+        details.append(f"*Price*: ₹{slot['Price']}")
+    else:
+        details.append(f"*Price*: Not Provided")
+
+    if "Booking" in slot and slot["Booking"] not in [None, ""]:
+        details.append(f"👉 *Book Now*: {slot['Booking']}")
+    else:
+        details.append(f"👉 *Book Now*: Booking link not available")
+
+    return " | ".join(details)
+
+
+# --- Rank One Slot ---
+def slot_rank_key(slot) -> tuple:
+    """
+    Orders slots by soonest start, then lowest price. Slots without a readable start or price sort last.
+    """
+    try:
+        slot_date = parse_slot_date(slot["Date"], context=(slot.get("Business"), "Date"))
+        start_time = datetime.strptime(str(slot["Timing"]).replace(" ", "").split("-")[0], "%I:%M%p").time()
+        starts_at = datetime.combine(slot_date, start_time)
+    except (KeyError, TypeError, ValueError):
+        starts_at = datetime.max
+
+    try:
+        price = float(slot["Price"])
+    except (KeyError, TypeError, ValueError):
+        price = float("inf")
+    if price != price:
+        price = float("inf")
+
+    return starts_at, price
+
+
+# --- Drop Slots That Already Started ---
+def upcoming(entries: list, now: float) -> list:
+    """
+    Returns the entries whose slot starts after now. Slots without a readable start are kept.
+    """
+    return [entry for entry in entries if entry.starts_at is None or entry.starts_at > now]
+
+
+def started_count(ranked: list, now: float) -> int:
+    """
+    Counts the slots at the head of a ranking that start at or before now. Rankings order slots by
+    start, so every slot that already started is at the head.
+    """
+    for count, entry in enumerate(ranked):
+        if entry.starts_at is None or entry.starts_at > now:
+            return count
+    return len(ranked)
+
+
+# --- Fit Rendered Lines into One Message ---
+def take_page(lines: list, budget_bytes: int, max_slots: int = DIGEST_TOP_K) -> int:
+    """
+    Returns how many of lines fit in one message: at most max_slots and budget_bytes, but always at least one.
+    """
+    used = 0
+    for count, line in enumerate(lines[:max_slots]):
+        used += len(line.encode("utf-8"))
+        if used > budget_bytes and count:
+            return count
+    return min(len(lines), max_slots)
+
+
+def _footer_bytes() -> int:
+    return len(MORE_FOOTER.format(remaining=DIGEST_TOP_K * DIGEST_MORE_PAGES).encode("utf-8"))
+
+
+class MessageBuilder:
+    """
+    Shared cache of rendered digests. Slot lines and rank keys are computed once per slot index
+    (keyed by the slot's values, and dropped when the index is rebuilt), and the matched and ranked
+    slots for a (slot snapshot version, locality set, sport set) are kept in an LRU, so players
+    with the same preferences share one ranking and only the greeting is filled in per player.
+    Slots that have already started are never ranked or paged.
+
+    A digest shows the best DIGEST_TOP_K slots that fit in DIGEST_MAX_BYTES. Up to
+    DIGEST_MORE_PAGES further pages are kept per player in Redis and served by more().
+    Given a player's seen slots, only new or changed slots are ranked, and in "delta" content
+    mode pages for a phone number are SlotMessages, whose slots are remembered as seen once delivered.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._ranked = OrderedDict()
+        self._lines = {}
+        self._lines_index = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.pages_sent = 0
+        self.more_pages_sent = 0
+
+    def _entries(self, slot_index, slots_df: pd.DataFrame) -> list:
+        """
+        Returns a RankedSlot for every slot in slots_df, rendering each slot once per slot index.
+        """
+        with self._lock:
+            if self._lines_index is not slot_index:
+                self._lines = {}
+                self._lines_index = slot_index
+            lines = self._lines
+
+        entries = []
+        for position, slot in enumerate(slots_df.to_dict("records")):
+            key = tuple(slot.items())
+            rendered = lines.get(key)
+            if rendered is None:
+                rank_key = slot_rank_key(slot)
+                starts_at = None if rank_key[0] == datetime.max else rank_key[0].timestamp()
+                rendered = lines[key] = (
+                    rank_key, render_slot_line(slot) + "\n\n", slot_id(slot), slot_fingerprint(slot), starts_at
+                )
+            rank_key, line, rendered_slot_id, fingerprint, starts_at = rendered
+            entries.append(RankedSlot(rank_key, position, line, rendered_slot_id, fingerprint, starts_at))
+        return entries
+
+    @staticmethod
+    def _best(entries: list) -> list:
+        """
+        Returns the slots worth paging through, best first, selected with a heap.
+        """
+        return heapq.nsmallest(RANKED_SLOTS, entries)
+
+    @staticmethod
+    def _unseen(entries: list, seen: dict) -> list:
+        fresh = [entry for entry in entries if seen.get(entry.slot_id) != entry.fingerprint]
+        seen_slots.record_delta(len(entries), len(fresh))
+        return fresh
+
+    @staticmethod
+    def _tracked(message: str, shown: list) -> str:
+        if NOTIFICATION_CONTENT_MODE != "delta":
+            return message
+        return SlotMessage(message, [(entry.slot_id, entry.fingerprint, entry.starts_at) for entry in shown])
+
+    def _first_page(self, greeting: str, ranked: list, phone_number: str = None) -> str:
+        budget = DIGEST_MAX_BYTES - len(greeting.encode("utf-8"))
+        if phone_number is not None:
+            budget -= _footer_bytes()
+
+        count = take_page([entry.line for entry in ranked], budget)
+        message = greeting + "".join(entry.line for entry in ranked[:count])
+
+        with self._lock:
+            self.pages_sent += 1
+
+        if phone_number is not None:
+            if self._save_more(phone_number, ranked[count:]):
+                message += MORE_FOOTER.format(remaining=len(ranked) - count)
+            message = self._tracked(message, ranked[:count])
+
+        logger.debug(f"Constructed message:\n{message}")
+        return message
+
+    def _save_more(self, phone_number: str, remaining: list) -> bool:
+        key = MORE_KEY.format(phone_number=phone_number)
+        try:
+            with redis_client.pipeline() as pipe:
+                pipe.delete(key)
+                if remaining:
+                    pipe.rpush(key, *(json.dumps([entry.line, entry.slot_id, entry.fingerprint, entry.starts_at])
+                                      for entry in remaining))
+                    pipe.expire(key, DIGEST_MORE_TTL_SECONDS)
+                pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to keep remaining digest pages for {phone_number}: {e}")
+            return False
+        return bool(remaining)
+
+    def render(self, player_name: str, slots_df: pd.DataFrame, phone_number: str = None, seen: dict = None):
+        """
+        Builds the first digest page for already matched slots. With a phone_number, the rest is
+        kept for more(). Given the player's seen slots, returns None when nothing is new.
+        """
+        entries = self._entries(get_slot_index(), slots_df) if not slots_df.empty else []
+        entries = upcoming(entries, time.time())
+
+        if seen is not None:
+            entries = self._unseen(entries, seen)
+            if not entries:
+                return None
+        elif not entries:
+            return NO_MATCHES_MESSAGE.format(player_name=player_name)
+
+        return self._first_page(DIGEST_GREETING.format(player_name=player_name), self._best(entries), phone_number)
+
+    def digest(self, player_name: str, localities, sports, phone_number: str = None, seen: dict = None):
+        """
+        Returns the first digest page of available slots matching any of the localities and sports,
+        or None if nothing matches. With a phone_number, the rest is kept for more(). Given the
+        player's seen slots, only new or changed slots are included.
+        """
+        slot_index = get_slot_index()
+        locality_set = frozenset(locality.strip().lower() for locality in localities)
+        sport_set = frozenset(sport.strip().lower() for sport in sports)
+        key = (slot_index.version, locality_set, sport_set)
+
+        with self._lock:
+            cached = self._ranked.get(key)
+            if cached is not None:
+                self._ranked.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if cached is None:
+            # The whole ranking is kept, so the slots that start while it is cached can be skipped
+            entries = self._entries(slot_index, slot_index.match(sorted(locality_set), sorted(sport_set)))
+            cached = (entries, sorted(entries))
+
+            with self._lock:
+                self._ranked[key] = cached
+                while len(self._ranked) > self.max_entries:
+                    self._ranked.popitem(last=False)
+
+        entries, ranking = cached
+        now = time.time()
+        if seen is not None:
+            ranked = self._best(self._unseen(upcoming(entries, now), seen))
+        else:
+            started = started_count(ranking, now)
+            ranked = ranking[started:started + RANKED_SLOTS]
+
+        if not ranked:
+            return None
+        return self._first_page(DIGEST_GREETING.format(player_name=player_name), ranked, phone_number)
+
+    def more(self, phone_number: str) -> str:
+        """
+        Returns the player's next digest page from the lines kept by their last digest.
+        """
+        key = MORE_KEY.format(phone_number=phone_number)
+        budget = DIGEST_MAX_BYTES - len(MORE_GREETING.encode("utf-8")) - _footer_bytes()
+
+        # The kept pages are few and short, so they are read whole to skip slots that started since the digest
+        entries = [RankedSlot(None, None, *json.loads(payload)) for payload in redis_client.lrange(key, 0, -1)]
+        started = started_count(entries, time.time())
+        entries = entries[started:]
+        if not entries:
+            redis_client.delete(key)
+            return NO_MORE_MESSAGE
+
+        count = take_page([entry.line for entry in entries], budget)
+        with redis_client.pipeline() as pipe:
+            pipe.ltrim(key, started + count, -1)
+            pipe.llen(key)
+            _, remaining = pipe.execute()
+
+        with self._lock:
+            self.more_pages_sent += 1
+
+        message = MORE_GREETING + "".join(entry.line for entry in entries[:count])
+        if remaining:
+            message += MORE_FOOTER.format(remaining=remaining)
+        return self._tracked(message, entries[:count])
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._ranked),
+                "max_entries": self.max_entries,
+                "rendered_slot_lines": len(self._lines),
+                "pages_sent": self.pages_sent,
+                "more_pages_sent": self.more_pages_sent,
+            }
+
+
+message_builder = MessageBuilder(MESSAGE_CACHE_MAX_ENTRIES)
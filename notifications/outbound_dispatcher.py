@@ -0,0 +1,152 @@
+import itertools
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from utils.histogram import Histogram
+
+logger = logging.getLogger(__name__)
+
+# Priority lanes: lower values are sent first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_DIGEST = 1
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_DIGEST: "digest"}
+
+# Window over which throughput is reported
+THROUGHPUT_WINDOW_SECONDS = 60
+
+
+class TokenBucket:
+    """
+    Token bucket allowing rate_per_second sends on average with bursts of up to burst sends.
+    """
+
+    def __init__(self, rate_per_second: float, burst: float = None):
+        self.rate_per_second = rate_per_second
+        self.capacity = burst or max(rate_per_second, 1)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Takes one token and returns how many seconds the caller must wait before using it.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate_per_second)
+            self._updated_at = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate_per_second
+
+    def acquire(self) -> float:
+        """
+        Blocks until a token is available. Returns the time spent waiting.
+        """
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+        return delay
+
+
+class OutboundDispatcher:
+    """
+    Bounded pool of workers sending queued messages through send(sender, to, body, priority, **kwargs),
+    highest priority lane first and in submission order within a lane. Each sender number is held
+    to its own token-bucket rate.
+    """
+
+    def __init__(self, send, workers: int, default_rate: float, sender_rates: dict = None):
+        self.send = send
+        self.workers = workers
+        self.default_rate = default_rate
+        self.sender_rates = dict(sender_rates or {})
+        self._buckets = {}
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._sent_at = deque()
+        self.sent = {name: 0 for name in PRIORITY_NAMES.values()}
+        self.failed = {name: 0 for name in PRIORITY_NAMES.values()}
+        self.queue_waits = Histogram([0.01, 0.1, 0.5, 1, 5, 15, 60, 300])
+        self.send_latencies = Histogram([0.05, 0.1, 0.25, 0.5, 1, 2.5, 5])
+        self.rate_limit_waits = Histogram([0.01, 0.1, 0.5, 1, 5])
+
+    def submit(self, sender: str, to: str, body: str, priority: int = PRIORITY_INTERACTIVE, **send_kwargs) -> Future:
+        future = Future()
+        self._queue.put((priority, next(self._sequence), time.monotonic(), sender, to, body, send_kwargs, future))
+        self.start()
+        return future
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            for number in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"outbound-{number}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            logger.info(f"Started {self.workers} outbound message workers.")
+
+    def bucket(self, sender: str) -> TokenBucket:
+        """
+        Returns the sender's token bucket. Code sending around the dispatcher for the same number must
+        draw from it too, or the two paths together exceed the sender's rate.
+        """
+        with self._lock:
+            bucket = self._buckets.get(sender)
+            if bucket is None:
+                bucket = self._buckets[sender] = TokenBucket(self.sender_rates.get(sender, self.default_rate))
+            return bucket
+
+    def _work(self) -> None:
+        while True:
+            priority, _, queued_at, sender, to, body, send_kwargs, future = self._queue.get()
+            lane = PRIORITY_NAMES.get(priority, str(priority))
+
+            self.rate_limit_waits.observe(self.bucket(sender).acquire())
+            self.queue_waits.observe(time.monotonic() - queued_at)
+
+            started_at = time.monotonic()
+            try:
+                result = self.send(sender, to, body, priority, **send_kwargs)
+            except Exception as e:
+                with self._lock:
+                    self.failed[lane] = self.failed.get(lane, 0) + 1
+                future.set_exception(e)
+                continue
+            finally:
+                self.send_latencies.observe(time.monotonic() - started_at)
+
+            with self._lock:
+                self.sent[lane] = self.sent.get(lane, 0) + 1
+                self._sent_at.append(time.monotonic())
+            future.set_result(result)
+
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> dict:
+        with self._lock:
+            cutoff = time.monotonic() - THROUGHPUT_WINDOW_SECONDS
+            while self._sent_at and self._sent_at[0] < cutoff:
+                self._sent_at.popleft()
+
+            return {
+                "workers": len(self._threads),
+                "depth": self.depth(),
+                "sent": dict(self.sent),
+                "failed": dict(self.failed),
+                "throughput_per_second": round(len(self._sent_at) / THROUGHPUT_WINDOW_SECONDS, 3),
+                "default_rate_per_second": self.default_rate,
+                "sender_rates_per_second": dict(self.sender_rates),
+                "queue_wait_seconds": self.queue_waits.snapshot(),
+                "rate_limit_wait_seconds": self.rate_limit_waits.snapshot(),
+                "send_latency_seconds": self.send_latencies.snapshot(),
+            }
@@ -0,0 +1,293 @@
+import heapq
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+
+from utils.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on how long the retrier waits before checking for due messages again
+POLL_INTERVAL_SECONDS = 1
+
+# Due messages claimed per round trip
+CLAIM_BATCH_SIZE = 100
+
+
+class RetryQueue:
+    """
+    Delay queue for failed sends, kept in a Redis sorted set scored by the time each retry is due.
+    A dedicated retrier thread hands due messages back to resend(message); messages that run out
+    of attempts are pushed onto a dead-letter list, from which they can be inspected and replayed.
+    Retries fall back to an in-process heap while Redis is unreachable.
+
+    Due messages are claimed by moving them to a processing set, scored by when the claim expires,
+    and acknowledged once resend returns (or once the Future it returns is done). The retrier keeps
+    extending the claims this process still holds, so a resend may wait in the outbound dispatcher
+    for as long as it takes; only claims left by a process that died mid-send fall due again, once
+    visibility_timeout_seconds have passed.
+    """
+
+    def __init__(self, key: str, dead_letter_key: str, resend, max_delay_seconds: float,
+                 visibility_timeout_seconds: float = 600):
+        self.key = key
+        self.processing_key = f"{key}:processing"
+        self.dead_letter_key = dead_letter_key
+        self.resend = resend
+        self.max_delay_seconds = max_delay_seconds
+        self.visibility_timeout_seconds = visibility_timeout_seconds
+        self._local = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._retrier = None
+        self._in_flight = set()
+        self._claims_extended_at = time.monotonic()
+        self.scheduled = 0
+        self.resent = 0
+        self.dead_lettered = 0
+        self.replayed = 0
+        self.reclaimed = 0
+
+    # --- Scheduling ---
+    def backoff_seconds(self, attempt: int, base_delay: float) -> float:
+        """
+        Exponential backoff with equal jitter: half the capped delay, plus up to another half at random.
+        """
+        delay = min(self.max_delay_seconds, base_delay * 2 ** (attempt - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def retry_later(self, message: dict, error: Exception) -> None:
+        """
+        Schedules the message's next attempt, or dead-letters it if it has used all its attempts.
+        message carries sender, to, body, priority, attempt, max_attempts and base_delay.
+        """
+        message = dict(message, id=message.get("id") or uuid.uuid4().hex, last_error=str(error))
+
+        if message["attempt"] >= message["max_attempts"]:
+            self.dead_letter(message)
+            return
+
+        due_at = time.time() + self.backoff_seconds(message["attempt"], message["base_delay"])
+        message["attempt"] += 1
+        payload = json.dumps(message)
+        try:
+            redis_client.zadd(self.key, {payload: due_at})
+        except Exception as e:
+            logger.warning(f"Redis unavailable, holding retry for {message['to']} in memory: {e}")
+            with self._lock:
+                heapq.heappush(self._local, (due_at, payload))
+
+        with self._lock:
+            self.scheduled += 1
+        logger.info(f"Retrying message to {message['to']} (attempt {message['attempt']}) in {due_at - time.time():.1f}s.")
+        self.start()
+        self._wakeup.set()
+
+    def dead_letter(self, message: dict) -> None:
+        message = dict(message, dead_lettered_at=time.time())
+        logger.error(f"Giving up on message to {message['to']} after {message['attempt']} attempts: {message.get('last_error')}")
+        try:
+            redis_client.lpush(self.dead_letter_key, json.dumps(message))
+        except Exception as e:
+            logger.error(f"Failed to dead-letter message to {message['to']}: {e}")
+        with self._lock:
+            self.dead_lettered += 1
+
+    # --- Dead Letters ---
+    def dead_letters(self, limit: int = 100) -> list:
+        """
+        Returns up to limit dead-lettered messages, newest first.
+        """
+        return [json.loads(payload) for payload in redis_client.lrange(self.dead_letter_key, 0, limit - 1)]
+
+    def replay_dead_letters(self, limit: int = None) -> int:
+        """
+        Moves up to limit dead-lettered messages (oldest first) back onto the retry queue, due now and
+        with a fresh set of attempts. Returns how many were replayed.
+        """
+        def fresh(payload) -> str:
+            message = json.loads(payload)
+            message.pop("dead_lettered_at", None)
+            message["attempt"] = 1
+            return json.dumps(message)
+
+        def move(pipe) -> list:
+            count = CLAIM_BATCH_SIZE if limit is None else min(CLAIM_BATCH_SIZE, limit - replayed)
+            # Oldest dead letters are at the tail of the list
+            payloads = pipe.lrange(self.dead_letter_key, -count, -1)
+            pipe.multi()
+            if payloads:
+                pipe.ltrim(self.dead_letter_key, 0, -len(payloads) - 1)
+                pipe.zadd(self.key, {fresh(payload): time.time() for payload in payloads})
+            return payloads
+
+        replayed = 0
+        while limit is None or replayed < limit:
+            # Popped and requeued in one transaction, so a crash can't lose a dead letter in between
+            moved = redis_client.transaction(move, self.dead_letter_key, value_from_callable=True)
+            if not moved:
+                break
+            replayed += len(moved)
+
+        with self._lock:
+            self.replayed += replayed
+        if replayed:
+            logger.info(f"Replayed {replayed} dead-lettered messages.")
+            self.start()
+            self._wakeup.set()
+        return replayed
+
+    # --- Retrier ---
+    def start(self) -> None:
+        with self._lock:
+            if self._retrier:
+                return
+            self._retrier = threading.Thread(target=self._retry_forever, name="whatsapp-retrier", daemon=True)
+            self._retrier.start()
+            logger.info("Started WhatsApp retry queue.")
+
+    def _retry_forever(self) -> None:
+        while True:
+            try:
+                self._extend_claims()
+                resent = self._resend_due()
+            except Exception as e:
+                logger.error(f"Failed to process due retries: {e}")
+                resent = 0
+
+            if not resent:
+                self._wakeup.wait(self._seconds_until_next_due())
+                self._wakeup.clear()
+
+    def _move_due(self, source: str, destination: str, now: float, score: float) -> list:
+        """
+        Atomically moves up to CLAIM_BATCH_SIZE members of source scored at or before now into
+        destination with the given score. Returns the moved payloads.
+        """
+        def move(pipe) -> list:
+            due = pipe.zrangebyscore(source, "-inf", now, start=0, num=CLAIM_BATCH_SIZE)
+            pipe.multi()
+            if due:
+                pipe.zrem(source, *due)
+                pipe.zadd(destination, {payload: score for payload in due})
+            return due
+
+        # WATCH makes a concurrent claim of the same messages retry instead of double-claiming
+        return redis_client.transaction(move, source, value_from_callable=True)
+
+    def _claim_due(self) -> list:
+        """
+        Returns (payload, from_redis) for every due message this process now owns.
+        """
+        now = time.time()
+        claimed = []
+
+        with self._lock:
+            while self._local and self._local[0][0] <= now:
+                claimed.append((heapq.heappop(self._local)[1], False))
+
+        try:
+            reclaimed = self._move_due(self.processing_key, self.key, now, now)
+            if reclaimed:
+                logger.warning(f"Requeued {len(reclaimed)} retries whose claim expired before they were resent.")
+                with self._lock:
+                    self.reclaimed += len(reclaimed)
+
+            due = self._move_due(self.key, self.processing_key, now, now + self.visibility_timeout_seconds)
+            claimed += [(payload, True) for payload in due]
+        except Exception as e:
+            logger.error(f"Failed to read due retries from Redis: {e}")
+
+        return claimed
+
+    def _extend_claims(self) -> None:
+        """
+        Pushes back the expiry of every claim still held by this process, a few times per timeout.
+        """
+        if time.monotonic() - self._claims_extended_at < self.visibility_timeout_seconds / 3:
+            return
+        self._claims_extended_at = time.monotonic()
+
+        with self._lock:
+            in_flight = list(self._in_flight)
+        if not in_flight:
+            return
+
+        expires_at = time.time() + self.visibility_timeout_seconds
+        try:
+            # XX leaves alone claims acknowledged in the meantime
+            redis_client.zadd(self.processing_key, {payload: expires_at for payload in in_flight}, xx=True)
+        except Exception as e:
+            logger.error(f"Failed to extend {len(in_flight)} retry claims: {e}")
+
+    def _acknowledge(self, payload) -> None:
+        with self._lock:
+            self._in_flight.discard(payload)
+        try:
+            redis_client.zrem(self.processing_key, payload)
+        except Exception as e:
+            # The claim expires and the message is resent once more
+            logger.error(f"Failed to acknowledge resent message: {e}")
+
+    def _resend_due(self) -> int:
+        claimed = self._claim_due()
+        with self._lock:
+            self._in_flight.update(payload for payload, from_redis in claimed if from_redis)
+
+        for payload, from_redis in claimed:
+            message = json.loads(payload)
+            try:
+                pending = self.resend(message)
+            except Exception as e:
+                self.retry_later(message, e)
+                pending = None
+
+            if not from_redis:
+                continue
+            if pending is None:
+                self._acknowledge(payload)
+            else:
+                # A failed send has already been rescheduled by the time the Future is done
+                pending.add_done_callback(lambda _, payload=payload: self._acknowledge(payload))
+
+        with self._lock:
+            self.resent += len(claimed)
+        return len(claimed)
+
+    def _seconds_until_next_due(self) -> float:
+        next_due = []
+        with self._lock:
+            if self._local:
+                next_due.append(self._local[0][0])
+        try:
+            head = redis_client.zrange(self.key, 0, 0, withscores=True)
+            if head:
+                next_due.append(head[0][1])
+        except Exception:
+            pass
+
+        if not next_due:
+            return POLL_INTERVAL_SECONDS
+        return max(0, min(POLL_INTERVAL_SECONDS, min(next_due) - time.time()))
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {
+                "scheduled": self.scheduled,
+                "resent": self.resent,
+                "dead_lettered": self.dead_lettered,
+                "replayed": self.replayed,
+                "reclaimed": self.reclaimed,
+                "pending_in_memory": len(self._local),
+                "claims_held": len(self._in_flight),
+            }
+        try:
+            stats["pending"] = redis_client.zcard(self.key)
+            stats["in_flight"] = redis_client.zcard(self.processing_key)
+            stats["dead_letters"] = redis_client.llen(self.dead_letter_key)
+        except Exception as e:
+            logger.warning(f"Failed to read retry queue sizes: {e}")
+        return stats
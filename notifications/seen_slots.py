@@ -0,0 +1,142 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from config.environment import SEEN_SLOTS_DEFAULT_TTL_SECONDS
+from utils.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Redis hash of slot id -> fingerprint for the slots a player has already been sent
+SEEN_KEY = "seen_slots:{phone_number}"
+
+# Columns that identify a slot, and the details whose change makes it worth sending again
+SLOT_ID_COLUMNS = ("Business", "Locality", "Sport", "Date", "Timing")
+SLOT_DETAIL_COLUMNS = ("Price", "Booking")
+
+
+def _digest(slot, columns) -> str:
+    values = "\x1f".join(str(slot.get(column, "")) for column in columns)
+    return hashlib.blake2b(values.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def slot_id(slot) -> str:
+    """
+    Stable id for a slot: the same business, place, sport, date and timing always map to the same id.
+    """
+    return _digest(slot, SLOT_ID_COLUMNS)
+
+
+def slot_fingerprint(slot) -> str:
+    return _digest(slot, SLOT_DETAIL_COLUMNS)
+
+
+class SlotMessage(str):
+    """
+    A message body that carries the (slot id, fingerprint, starts at timestamp or None) entries it
+    shows, so the send path can record them as seen once the message is actually delivered.
+    """
+
+    def __new__(cls, body: str, slots=()):
+        message = super().__new__(cls, body)
+        message.slots = [tuple(slot) for slot in slots]
+        return message
+
+
+class SeenSlots:
+    """
+    Per-player memory of the slots already sent, so scheduled digests only carry new or changed
+    slots. Each player has a Redis hash of slot id -> fingerprint of the slot's price and booking
+    link. Every field expires when its slot starts (HEXPIREAT), or after default_ttl_seconds when
+    the start can't be read, so the hash only ever holds upcoming slots.
+    """
+
+    def __init__(self, default_ttl_seconds: int):
+        self.default_ttl_seconds = default_ttl_seconds
+        self._lock = threading.Lock()
+        self.marked = 0
+        self.delta_sends = 0
+        self.suppressed_sends = 0
+        self.suppressed_slots = 0
+
+    def seen(self, phone_number: str) -> dict:
+        return self.seen_many([phone_number])[phone_number]
+
+    def seen_many(self, phone_numbers: list) -> dict:
+        """
+        Returns {phone number: {slot id: fingerprint}} for many players in one round trip.
+        Players whose memory can't be read are treated as having seen nothing.
+        """
+        try:
+            with redis_client.pipeline(transaction=False) as pipe:
+                for phone_number in phone_numbers:
+                    pipe.hgetall(SEEN_KEY.format(phone_number=phone_number))
+                results = pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to read seen slots for {len(phone_numbers)} players: {e}")
+            results = [{}] * len(phone_numbers)
+
+        return {
+            phone_number: {field.decode("utf-8"): value.decode("utf-8") for field, value in seen.items()}
+            for phone_number, seen in zip(phone_numbers, results)
+        }
+
+    def mark_seen(self, phone_number: str, slots: list) -> None:
+        """
+        Records (slot id, fingerprint, starts at timestamp or None) entries as sent to the player.
+        Slots that have already started are skipped: their field would expire the moment it was set.
+        """
+        now = time.time()
+        slots = [slot for slot in slots if not slot[2] or slot[2] > now]
+        if not slots:
+            return
+
+        key = SEEN_KEY.format(phone_number=phone_number)
+        default_expiry = int(now) + self.default_ttl_seconds
+        fields_by_expiry = defaultdict(list)
+        for seen_slot_id, _, starts_at in slots:
+            fields_by_expiry[int(starts_at) if starts_at else default_expiry].append(seen_slot_id)
+
+        try:
+            with redis_client.pipeline() as pipe:
+                pipe.hset(key, mapping={seen_slot_id: fingerprint for seen_slot_id, fingerprint, _ in slots})
+                for expires_at, fields in fields_by_expiry.items():
+                    pipe.hexpireat(key, expires_at, *fields)
+                pipe.execute()
+        except Exception as e:
+            logger.warning(f"Failed to record seen slots for {phone_number}: {e}")
+            return
+
+        with self._lock:
+            self.marked += len(slots)
+
+    def mark_delivered(self, phone_number: str, message) -> None:
+        """
+        Records the slots shown by a delivered SlotMessage. Plain messages are ignored.
+        """
+        self.mark_seen(phone_number, getattr(message, "slots", ()))
+
+    def record_delta(self, matched: int, fresh: int) -> None:
+        """
+        Counts one delta digest: matched slots before filtering, fresh slots left to send.
+        """
+        with self._lock:
+            self.suppressed_slots += matched - fresh
+            if fresh:
+                self.delta_sends += 1
+            else:
+                self.suppressed_sends += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "marked": self.marked,
+                "delta_sends": self.delta_sends,
+                "suppressed_sends": self.suppressed_sends,
+                "suppressed_slots": self.suppressed_slots,
+            }
+
+
+seen_slots = SeenSlots(SEEN_SLOTS_DEFAULT_TTL_SECONDS)
@@ -1,5 +1,5 @@
 from twilio.rest import Client
-from config.environment import TWILIO_SID, TWILIO_AUTH_TOKEN
+from config.environment import TWILIO_SID, TWILIO_AUTH_TOKEN, TWILIO_API_BASE_URL
 from dotenv import load_dotenv
 import os 
 
@@ -7,4 +7,7 @@ import os
 load_dotenv()
 # Initialize Twilio Client
 twilio_client = Client(TWILIO_SID, TWILIO_AUTH_TOKEN)
+# Point API requests elsewhere, e.g. at a local fake Twilio server in tests
+if TWILIO_API_BASE_URL:
+    twilio_client.api.base_url = TWILIO_API_BASE_URL
 TWILIO_SANDBOX_NUMBER = os.getenv('TWILIO_SANDBOX_NUMBER')
\ No newline at end of file
@@ -1,27 +1,90 @@
 from notifications.twilio_client import twilio_client, TWILIO_SANDBOX_NUMBER
+from notifications.outbound_dispatcher import OutboundDispatcher, PRIORITY_INTERACTIVE, PRIORITY_DIGEST
+from notifications.retry_queue import RetryQueue
+from notifications.seen_slots import SlotMessage, seen_slots
+from config.environment import (
+    OUTBOUND_WORKERS,
+    OUTBOUND_RATE_PER_SECOND,
+    OUTBOUND_SENDER_RATES,
+    WHATSAPP_RETRY_KEY,
+    WHATSAPP_DEAD_LETTER_KEY,
+    WHATSAPP_RETRY_MAX_DELAY_SECONDS,
+    WHATSAPP_RETRY_VISIBILITY_SECONDS,
+)
 import logging
-import time
 
 logger = logging.getLogger(__name__)
 
-def send_whatsapp_message(to: str, message: str, retries: int = 3, delay: int = 5) -> None:
-    attempt = 0
+def _deliver(sender: str, to: str, message: str, priority: int = PRIORITY_INTERACTIVE,
+             attempt: int = 1, retries: int = 3, delay: int = 5) -> None:
+    """
+    Makes one send attempt. On failure the message goes to the retry queue, and the error is re-raised.
+    Slots shown by a SlotMessage are recorded as seen only once it has been sent.
+    """
+    try:
+        twilio_client.messages.create(
+            from_=f"whatsapp:{sender}",
+            body=message,
+            to=f"whatsapp:{to}"
+        )
+        logger.info(f"Message successfully sent to {to}")
+        seen_slots.mark_delivered(to, message)
+    except Exception as e:
+        logger.error(f"Attempt {attempt}: Failed to send message to {to}. Error: {e}")
+        retry_queue.retry_later(
+            {
+                "sender": sender,
+                "to": to,
+                "body": message,
+                "priority": priority,
+                "attempt": attempt,
+                "max_attempts": retries,
+                "base_delay": delay,
+                "seen_slots": getattr(message, "slots", []),
+            },
+            e,
+        )
+        raise
 
-    while attempt < retries:
+def _resend(message: dict):
+    return _dispatch(
+        message["sender"], message["to"], SlotMessage(message["body"], message.get("seen_slots", ())), message["priority"],
+        attempt=message["attempt"], retries=message["max_attempts"], delay=message["base_delay"],
+    )
+
+def _dispatch(sender: str, to: str, message: str, priority: int, **send_kwargs):
+    """
+    Sends inline or queues on the outbound dispatcher. Returns the dispatcher's Future, or None once sent inline.
+    """
+    if OUTBOUND_WORKERS <= 0:
         try:
-            twilio_client.messages.create(
-                from_=f"whatsapp:{TWILIO_SANDBOX_NUMBER}",
-                body=message,
-                to=f"whatsapp:{to}"
-            )
-            logger.info(f"Message successfully sent to {to}")
-            return
-        except Exception as e:
-            attempt += 1
-            logger.error(f"Attempt {attempt}: Failed to send message to {to}. Error: {e}")
-
-            if attempt < retries:
-                logger.info(f"Retrying in {delay} seconds...")
-                time.sleep(delay)
-
-    logger.error(f"All attempts failed. Could not send message to {to}.")
+            _deliver(sender, to, message, priority, **send_kwargs)
+        except Exception:
+            pass  # Already logged and queued for retry
+        return None
+
+    return outbound_dispatcher.submit(sender, to, message, priority, **send_kwargs)
+
+# Outbound pipeline: rate-limited per sender number, interactive replies ahead of digests
+outbound_dispatcher = OutboundDispatcher(_deliver, OUTBOUND_WORKERS, OUTBOUND_RATE_PER_SECOND, OUTBOUND_SENDER_RATES)
+
+# Failed sends wait here, with exponential backoff, instead of blocking a thread
+retry_queue = RetryQueue(
+    WHATSAPP_RETRY_KEY, WHATSAPP_DEAD_LETTER_KEY, _resend, WHATSAPP_RETRY_MAX_DELAY_SECONDS, WHATSAPP_RETRY_VISIBILITY_SECONDS
+)
+
+def send_whatsapp_message(to: str, message: str, retries: int = 3, delay: int = 5, priority: int = PRIORITY_INTERACTIVE) -> None:
+    """
+    Queues a WhatsApp message on the outbound dispatcher. With OUTBOUND_WORKERS=0 it is sent inline.
+    A failed send is retried up to retries attempts in all, backing off from delay seconds.
+    """
+    _dispatch(TWILIO_SANDBOX_NUMBER, to, message, priority, retries=retries, delay=delay)
+
+def send_digest_message(to: str, message: str) -> None:
+    """
+    Queues a scheduled digest behind any pending interactive replies.
+    """
+    send_whatsapp_message(to, message, priority=PRIORITY_DIGEST)
+
+def get_outbound_stats() -> dict:
+    return dict(outbound_dispatcher.stats(), retries=retry_queue.stats())
@@ -2,7 +2,7 @@
 
 from apscheduler.triggers.cron import CronTrigger
 from scheduler.scheduler_service import scheduler
-from sheets.google_sheets import fetch_sheet_data
+from sheets.player_registry import get_player_registry
 from utils.time_parser import parse_time
 from notifications.whatsapp_notifier import send_whatsapp_message
 import logging
@@ -75,14 +75,14 @@ def _notify_player(player: dict):
 # --- Schedule Notifications from Sheets ---
 def schedule_notifications_from_sheets():
     try:
-        players_df = fetch_sheet_data("player-response-sheet", "Players")
+        registry = get_player_registry()
 
-        if players_df.empty:
+        if not len(registry):
             logger.warning("No player data found in Google Sheets.")
             return
 
         # Iterate through players and schedule notifications
-        for _, player in players_df.iterrows():
+        for player in registry:
             schedule_job(player)
 
         logger.info("All notifications successfully scheduled.")
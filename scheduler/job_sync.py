@@ -0,0 +1,130 @@
+import logging
+from datetime import datetime
+
+from apscheduler.events import EVENT_JOB_ADDED, EVENT_JOB_MODIFIED, EVENT_JOB_REMOVED, JobEvent
+from apscheduler.job import Job
+from apscheduler.schedulers.base import STATE_STOPPED
+from apscheduler.util import get_callable_name, obj_to_ref
+
+from scheduler.scheduler_service import scheduler
+
+logger = logging.getLogger(__name__)
+
+
+# Scheduler internals the batched path relies on (APScheduler 3.x; pinned in requirements.txt)
+_BATCH_ATTRIBUTES = ("_jobstores_lock", "_lookup_jobstore", "_job_defaults", "_dispatch_event")
+
+
+def _job_matches(job, func_ref: str, trigger, args: tuple) -> bool:
+    # Triggers have no equality; their repr covers fields, dates and timezone
+    return job.func_ref == func_ref and repr(job.trigger) == repr(trigger) and tuple(job.args) == args
+
+
+def _upsert_jobs_one_by_one(func, desired: list, is_stale, jobstore: str) -> dict:
+    """
+    upsert_jobs through the public scheduler API only, one store call per changed job.
+    """
+    func_ref = obj_to_ref(func)
+    existing = {job.id: job for job in scheduler.get_jobs(jobstore=jobstore)}
+
+    summary = {"added": 0, "modified": 0, "removed": 0, "unchanged": 0}
+    desired_ids = set()
+    for job_id, trigger, args in desired:
+        args = tuple(args)
+        desired_ids.add(job_id)
+        current = existing.get(job_id)
+
+        if current is not None and _job_matches(current, func_ref, trigger, args):
+            summary["unchanged"] += 1
+            continue
+
+        scheduler.add_job(func, trigger, args=args, id=job_id, jobstore=jobstore, replace_existing=True)
+        summary["added" if current is None else "modified"] += 1
+
+    for job_id, job in existing.items():
+        if job_id not in desired_ids and is_stale is not None and is_stale(job):
+            scheduler.remove_job(job_id, jobstore=jobstore)
+            summary["removed"] += 1
+
+    logger.info(f"Upserted {len(desired)} jobs for {func_ref} one by one: {summary}")
+    return summary
+
+
+# --- Bulk Job Upsert ---
+def upsert_jobs(func, desired: list, is_stale=None, jobstore: str = "default") -> dict:
+    """
+    Brings the job store in line with desired, a list of (job_id, trigger, args) entries for func.
+    Jobs that already match are left alone, so unchanged jobs keep their next run time. Stored jobs
+    not in desired are removed only if is_stale(job) returns True.
+
+    All changes are written in one batch when the store supports it (one Redis transaction for the
+    indexed RedisJobStore) and the scheduler is woken once. Returns counts of each kind of change.
+    Schedulers without the 3.x internals this needs fall back to one public add_job per change.
+    """
+    if scheduler.state == STATE_STOPPED:
+        raise RuntimeError("Cannot upsert jobs while the scheduler is stopped.")
+
+    if not all(hasattr(scheduler, attribute) for attribute in _BATCH_ATTRIBUTES):
+        return _upsert_jobs_one_by_one(func, desired, is_stale, jobstore)
+
+    func_ref = obj_to_ref(func)
+    store = scheduler._lookup_jobstore(jobstore)
+    now = datetime.now(scheduler.timezone)
+
+    with scheduler._jobstores_lock:
+        existing = {job.id: job for job in store.get_all_jobs()}
+
+        added, modified, unchanged = [], [], 0
+        desired_ids = set()
+        for job_id, trigger, args in desired:
+            args = tuple(args)
+            desired_ids.add(job_id)
+            current = existing.get(job_id)
+
+            if current is not None and _job_matches(current, func_ref, trigger, args):
+                unchanged += 1
+                continue
+
+            job = Job(
+                scheduler,
+                id=job_id,
+                func=func,
+                trigger=trigger,
+                executor="default",
+                args=args,
+                kwargs={},
+                name=get_callable_name(func),
+                next_run_time=trigger.get_next_fire_time(None, now),
+                **scheduler._job_defaults,
+            )
+            (added if current is None else modified).append(job)
+
+        removed_ids = [
+            job_id for job_id, job in existing.items()
+            if job_id not in desired_ids and is_stale is not None and is_stale(job)
+        ]
+
+        if hasattr(store, "apply_job_changes"):
+            store.apply_job_changes(added, modified, removed_ids)
+        else:
+            for job in added:
+                store.add_job(job)
+            for job in modified:
+                store.update_job(job)
+            for job_id in removed_ids:
+                store.remove_job(job_id)
+
+    for event_code, job_ids in (
+        (EVENT_JOB_ADDED, [job.id for job in added]),
+        (EVENT_JOB_MODIFIED, [job.id for job in modified]),
+        (EVENT_JOB_REMOVED, removed_ids),
+    ):
+        for job_id in job_ids:
+            scheduler._dispatch_event(JobEvent(event_code, job_id, jobstore))
+
+    if added or modified:
+        scheduler.wakeup()
+
+    summary = {"added": len(added), "modified": len(modified), "removed": len(removed_ids), "unchanged": unchanged}
+    logger.info(f"Upserted {len(desired)} jobs for {func_ref}: {summary}")
+    return summary
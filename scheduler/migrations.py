@@ -0,0 +1,62 @@
+import logging
+
+from config.environment import REDIS_HOST, REDIS_PORT, REDIS_PASSWORD, SCHEDULER_JOBSTORE, SCHEDULER_JOB_COMPRESSION
+from scheduler.redis_jobstore import RedisJobStore
+from sheets.google_sheets import normalize_phone_number
+
+logger = logging.getLogger(__name__)
+
+
+# --- Compact Notification Job Payloads ---
+def migrate_notification_job_payloads(dry_run: bool = False) -> dict:
+    """
+    Rewrites per-player notification jobs that still carry a pickled player record so they carry
+    only the phone number. Reports the stored payload bytes before and after, as measured in Redis.
+    Works on the job store directly, so it runs without starting a second scheduler.
+    """
+    # The stock APScheduler store can't read compressed payloads, so only the indexed store gets them
+    jobstore = RedisJobStore(
+        host=REDIS_HOST,
+        port=REDIS_PORT,
+        password=REDIS_PASSWORD,
+        compress_payloads=SCHEDULER_JOB_COMPRESSION and SCHEDULER_JOBSTORE == "indexed",
+    )
+    report = {"migrated": 0, "skipped": 0, "failed": 0, "bytes_before": 0, "bytes_after": 0}
+
+    try:
+        for job in jobstore.get_all_jobs():
+            if not job.id.endswith("_notification") or not job.args or isinstance(job.args[0], str):
+                report["skipped"] += 1
+                continue
+
+            try:
+                bytes_before = jobstore.redis.hstrlen(jobstore.jobs_key, job.id)
+                job.args = (normalize_phone_number(job.args[0]["Phone Number"]),)
+                bytes_after = len(jobstore._serialize_job(job))
+
+                if not dry_run:
+                    jobstore.update_job(job)
+
+                report["migrated"] += 1
+                report["bytes_before"] += bytes_before
+                report["bytes_after"] += bytes_after
+
+            except Exception as e:
+                report["failed"] += 1
+                logger.error(f"Failed to migrate job {job.id}: {e}")
+
+    finally:
+        jobstore.shutdown()
+
+    migrated = report["migrated"]
+    report["bytes_saved_per_job"] = round((report["bytes_before"] - report["bytes_after"]) / migrated) if migrated else 0
+
+    logger.info(f"Notification job payload migration{' (dry run)' if dry_run else ''}: {report}")
+    return report
+
+
+if __name__ == "__main__":
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+    migrate_notification_job_payloads(dry_run="--dry-run" in sys.argv)
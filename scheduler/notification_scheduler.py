@@ -1,13 +1,27 @@
 from scheduler.scheduler_service import scheduler
+from scheduler.job_sync import upsert_jobs
 from apscheduler.triggers.cron import CronTrigger
-from sheets.google_sheets import fetch_not_booked_slots, parse_date_from_sheet
-from notifications.whatsapp_notifier import send_whatsapp_message
+from sheets.player_registry import get_player_registry
+from sheets.slot_index import get_slot_index
+from notifications.message_builder import NO_MATCHES_MESSAGE, message_builder
+from notifications.seen_slots import seen_slots
+from notifications.whatsapp_notifier import send_digest_message
+from notifications.async_sender import send_messages
 from utils.time_parser import parse_time
+from utils.redis_client import redis_client
+from utils.player_events import on_player_changed
+from config.environment import NOTIFICATION_SCHEDULING_MODE, NOTIFICATION_BATCH_SIZE, DIGEST_SEND_MODE, NOTIFICATION_CONTENT_MODE
 import pandas as pd
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Player sheet columns that determine when a player's notification job runs
+SCHEDULE_FIELDS = {"Notification Time", "Notification Frequency"}
+
+# Redis hash from phone number to the bucket it is notified in
+BUCKET_OF_PHONE_KEY = "notification_bucket_of"
+
 # Booking Links
 BUSINESS_LINKS = {
     "turfXL": "https://rebrand.ly/sy6d8zz",
@@ -34,31 +48,111 @@ def normalize_phone_number(phone_number):
         raise
 
 # Notify Player Function
-def _notify_player(player: dict, context=None):
+def _notify_player(player, scheduled_version=None):
+    """
+    Runs one player's notification job. Jobs carry only the phone number (and optionally the registry
+    version they were scheduled from); the player's record is resolved from the current registry.
+    Jobs scheduled with a full player record are still accepted.
+    """
+    phone_number = player_name = None
     try:
-        phone_number = normalize_phone_number(player["Phone Number"])
+        stored_player = None if isinstance(player, str) else player
+        phone_number = normalize_phone_number(player if stored_player is None else stored_player["Phone Number"])
+
+        registry = get_player_registry()
+        player = registry.get(phone_number)
+        if player is None and stored_player is not None:
+            player = dict(stored_player)
+        if player is None:
+            logger.warning(f"{phone_number} is no longer registered; skipping notification.")
+            return
+
+        if scheduled_version is not None and scheduled_version != registry.version:
+            logger.debug(f"Job for {phone_number} scheduled from registry v{scheduled_version}, running on v{registry.version}.")
+
         player_name = player["Player Name"]
 
         logger.info(f"Fetching available slots for {player_name} ({phone_number}).")
 
-        # Match Player with Available Slots
-        matched_slots = match_player_with_slots(player)
-
-        # Construct Notification Message
-        if not matched_slots.empty:
-            message_body = construct_update_message(player_name, matched_slots)
-        else:
-            message_body = f"Hi {player_name}, currently no available slots match your preferences."
+        # Build the Digest from the Shared Cache, Leaving Out Slots Already Sent
+        delta = NOTIFICATION_CONTENT_MODE == "delta"
+        message_body = message_builder.digest(
+            player_name, player["Locality"].split(","), player["Preferences"].split(","), phone_number,
+            seen=seen_slots.seen(phone_number) if delta else None,
+        )
+        if message_body is None:
+            if delta:
+                logger.info(f"No new slots for {phone_number}; skipping notification.")
+                return
+            message_body = NO_MATCHES_MESSAGE.format(player_name=player_name)
 
-        # Send the WhatsApp Message
-        send_whatsapp_message(phone_number, message_body)
-        logger.info(f"Notification sent successfully to {phone_number}.")
+        send_digest_message(phone_number, message_body)
+        logger.info(f"Notification queued for {phone_number}.")
 
     except Exception as e:
         logger.error(f"Failed to send notification to {player_name} ({phone_number}): {e}")
 
+# Notify a Wave of Players
+def _notify_players(players: list):
+    """
+    Sends digests to many players at once, matching all of them with a single join.
+    In "delta" content mode, players with nothing new are skipped.
+    In "async" digest send mode the whole wave is sent concurrently from one event loop.
+    """
+    matches = match_players_with_slots(players)
+    seen_by_phone = seen_slots.seen_many(list(matches)) if NOTIFICATION_CONTENT_MODE == "delta" else {}
+
+    messages = []
+    suppressed = 0
+    for player in players:
+        phone_number = normalize_phone_number(player["Phone Number"])
+        try:
+            message_body = message_builder.render(
+                player["Player Name"], matches.get(phone_number, pd.DataFrame()), phone_number,
+                seen=seen_by_phone.get(phone_number),
+            )
+            if message_body is None:
+                suppressed += 1
+            elif DIGEST_SEND_MODE == "async":
+                messages.append((phone_number, message_body))
+            else:
+                send_digest_message(phone_number, message_body)
+        except Exception as e:
+            logger.error(f"Failed to send notification to {player['Player Name']} ({phone_number}): {e}")
+
+    if suppressed:
+        logger.info(f"Skipped {suppressed} of {len(players)} digests with no new slots.")
+    if messages:
+        send_messages(messages)
+
+# Notification Job Specification
+def _notification_job_id(phone_number: str) -> str:
+    return f"{phone_number}_notification"
+
+def notification_job_spec(player: dict, notification_frequency: str, notification_time: str, version: int = None) -> tuple:
+    """
+    Returns the (job_id, trigger, args) for a player's per-player notification job.
+    Raises ValueError for an invalid time or frequency.
+    """
+    # Validate and parse time
+    hour, minute = parse_time(notification_time)
+
+    # Validate Frequency
+    if notification_frequency.lower() not in FREQUENCY_TO_DAYS:
+        raise ValueError(f"Invalid notification frequency: {notification_frequency}")
+
+    phone_number = normalize_phone_number(player["Phone Number"])
+    trigger = CronTrigger(
+        day_of_week=FREQUENCY_TO_DAYS[notification_frequency.lower()],
+        hour=hour,
+        minute=minute,
+    )
+    # The player's record is looked up when the job runs
+    args = [phone_number] if version is None else [phone_number, version]
+    return _notification_job_id(phone_number), trigger, args
+
 # Schedule Notification Function
-def schedule_notification(player: dict, notification_frequency: str, notification_time: str):
+def schedule_notification(player: dict, notification_frequency: str, notification_time: str, version: int = None):
     try:
         # Validate and parse time
         hour, minute = parse_time(notification_time)
@@ -66,7 +160,7 @@ def schedule_notification(player: dict, notification_frequency: str, notificatio
 
         # Define Job ID
         phone_number = normalize_phone_number(player["Phone Number"])
-        job_id = f"{phone_number}_notification"
+        job_id = _notification_job_id(phone_number)
 
         # Validate Frequency
         if notification_frequency.lower() not in FREQUENCY_TO_DAYS:
@@ -77,16 +171,19 @@ def schedule_notification(player: dict, notification_frequency: str, notificatio
             logger.info(f"Removing existing job {job_id}")
             scheduler.remove_job(job_id)
 
+        # In bucketed mode the player joins the shared job for their days and minute
+        if NOTIFICATION_SCHEDULING_MODE == "bucketed":
+            return assign_to_bucket(phone_number, FREQUENCY_TO_DAYS[notification_frequency.lower()], hour, minute)
+
+        remove_from_bucket(phone_number)
+
         # Schedule the Job
+        job_id, trigger, args = notification_job_spec(player, notification_frequency, notification_time, version)
         scheduler.add_job(
             func=_notify_player,
-            trigger=CronTrigger(
-                day_of_week=FREQUENCY_TO_DAYS[notification_frequency.lower()],
-                hour=hour,
-                minute=minute,
-            ),
+            trigger=trigger,
             id=job_id,
-            args=[player, None],  # Ensure context is passed
+            args=args,
             replace_existing=True,
         )
 
@@ -97,22 +194,202 @@ def schedule_notification(player: dict, notification_frequency: str, notificatio
         logger.error(f"Error scheduling notification for player {player['Player Name']}: {e}")
         raise
 
+# Schedule Many Notifications Function
+def schedule_notifications(entries: list) -> dict:
+    """
+    Schedules many players at once from (player, notification_frequency, notification_time) entries.
+    Per-player jobs are diffed against the job store and written in one batch. Jobs for numbers no
+    longer in the registry are removed, unless the Players sheet is unavailable. Invalid entries are
+    logged and skipped.
+    """
+    specs = []
+    bucket_assignments = []
+    for player, notification_frequency, notification_time in entries:
+        try:
+            spec = notification_job_spec(player, notification_frequency, notification_time)
+        except Exception as e:
+            logger.error(f"Error scheduling notification for player {player['Player Name']}: {e}")
+            continue
+
+        if NOTIFICATION_SCHEDULING_MODE == "bucketed":
+            hour, minute = parse_time(notification_time)
+            bucket_assignments.append((spec[2][0], FREQUENCY_TO_DAYS[notification_frequency.lower()], hour, minute))
+        else:
+            specs.append(spec)
+
+    for phone_number, days, hour, minute in bucket_assignments:
+        assign_to_bucket(phone_number, days, hour, minute)
+
+    # Players now on per-player jobs leave any bucket they were in
+    bucketed_phone_numbers = {phone.decode() for phone in redis_client.hkeys(BUCKET_OF_PHONE_KEY)}
+    for job_id, _, args in specs:
+        if args[0] in bucketed_phone_numbers:
+            remove_from_bucket(args[0])
+
+    registry = get_player_registry()
+    bucketed_job_ids = {_notification_job_id(phone_number) for phone_number, *_ in bucket_assignments}
+    if not registry.available:
+        # Every stored player would look unregistered; only prune jobs that moved into buckets
+        logger.warning("Players sheet unavailable; keeping per-player jobs for numbers not in the registry.")
+
+    def is_stale(job) -> bool:
+        # Only per-player jobs, whose ids are a normalized phone number plus the suffix
+        phone_number = job.id[:-len("_notification")]
+        if not job.id.endswith("_notification") or not phone_number.startswith("+"):
+            return False
+        if job.id in bucketed_job_ids:
+            return True
+        return registry.available and phone_number not in registry
+
+    summary = upsert_jobs(_notify_player, specs, is_stale=is_stale)
+    summary["bucketed"] = len(bucket_assignments)
+    return summary
+
+# Unschedule Notification Function
+def unschedule_notification(phone_number: str) -> bool:
+    """
+    Removes a player's notifications in either scheduling mode. Returns False if none were scheduled.
+    """
+    phone_number = normalize_phone_number(phone_number)
+    job_id = _notification_job_id(phone_number)
+
+    removed = remove_from_bucket(phone_number)
+    if scheduler.get_job(job_id):
+        scheduler.remove_job(job_id)
+        removed = True
+
+    logger.info(f"Unscheduled notifications for {phone_number}: {removed}.")
+    return removed
+
+# Reschedule Player Function
+@on_player_changed
+def reschedule_player(phone_number: str, changed_fields: list = None):
+    """
+    Updates a single player's notification job after their sheet row changed. Changes to fields that
+    do not affect scheduling are ignored, since jobs look up the player's record when they run.
+    Returns the job id, or None if nothing was scheduled.
+    """
+    if changed_fields is not None and not SCHEDULE_FIELDS & set(changed_fields):
+        return None
+
+    player = get_player_registry().get(phone_number)
+    if player is None:
+        unschedule_notification(phone_number)
+        return None
+
+    try:
+        return schedule_notification(
+            player, player["Notification Frequency"].strip().lower(), player["Notification Time"].strip()
+        )
+    except Exception as e:
+        logger.error(f"Failed to reschedule {phone_number} after a change to {changed_fields}: {e}")
+        return None
+
+# --- Bucketed Scheduling ---
+def _bucket_members_key(bucket_id: str) -> str:
+    return f"notification_bucket:{bucket_id}"
+
+def _bucket_job_id(bucket_id: str) -> str:
+    return f"bucket_{bucket_id}"
+
+def assign_to_bucket(phone_number: str, days: str, hour: int, minute: int) -> str:
+    """
+    Moves a phone number into the bucket for (days, HH:MM), creating the bucket's cron job if needed.
+    Returns the bucket's job id.
+    """
+    bucket_id = f"{days.replace(',', '-')}_{hour:02d}{minute:02d}"
+    job_id = _bucket_job_id(bucket_id)
+
+    previous_bucket = redis_client.hget(BUCKET_OF_PHONE_KEY, phone_number)
+    previous_bucket = previous_bucket.decode() if previous_bucket else None
+
+    if previous_bucket != bucket_id:
+        pipeline = redis_client.pipeline()
+        if previous_bucket:
+            pipeline.srem(_bucket_members_key(previous_bucket), phone_number)
+        pipeline.sadd(_bucket_members_key(bucket_id), phone_number)
+        pipeline.hset(BUCKET_OF_PHONE_KEY, phone_number, bucket_id)
+        pipeline.execute()
+        logger.info(f"Moved {phone_number} from bucket {previous_bucket} to {bucket_id}.")
+
+        if previous_bucket:
+            _remove_bucket_job_if_empty(previous_bucket)
+
+    if not scheduler.get_job(job_id):
+        scheduler.add_job(
+            func=_notify_bucket,
+            trigger=CronTrigger(day_of_week=days, hour=hour, minute=minute),
+            id=job_id,
+            args=[bucket_id],
+            replace_existing=True,
+        )
+        logger.info(f"Scheduled bucket job {job_id}.")
+
+    return job_id
+
+def remove_from_bucket(phone_number: str) -> bool:
+    """
+    Removes a phone number from its bucket, if any. Returns True if it was in one.
+    """
+    bucket_id = redis_client.hget(BUCKET_OF_PHONE_KEY, phone_number)
+    if not bucket_id:
+        return False
+
+    bucket_id = bucket_id.decode()
+    pipeline = redis_client.pipeline()
+    pipeline.srem(_bucket_members_key(bucket_id), phone_number)
+    pipeline.hdel(BUCKET_OF_PHONE_KEY, phone_number)
+    pipeline.execute()
+
+    _remove_bucket_job_if_empty(bucket_id)
+    return True
+
+def _remove_bucket_job_if_empty(bucket_id: str):
+    job_id = _bucket_job_id(bucket_id)
+    if redis_client.scard(_bucket_members_key(bucket_id)) == 0 and scheduler.get_job(job_id):
+        scheduler.remove_job(job_id)
+        logger.info(f"Removed empty bucket job {job_id}.")
+
+# Notify Bucket Function
+def _notify_bucket(bucket_id: str):
+    """
+    Runs one bucket job: resolves its members from the registry and notifies them in batches.
+    """
+    registry = get_player_registry()
+    if not registry.available:
+        # Every member would look unregistered; leave the bucket as it is until the sheet is back
+        logger.warning(f"Players sheet unavailable; skipping bucket {bucket_id} this run.")
+        return
+
+    phone_numbers = sorted(member.decode() for member in redis_client.smembers(_bucket_members_key(bucket_id)))
+
+    players = []
+    for phone_number in phone_numbers:
+        player = registry.get(phone_number)
+        if player is None:
+            logger.warning(f"{phone_number} is no longer registered; removing it from bucket {bucket_id}.")
+            remove_from_bucket(phone_number)
+            continue
+        players.append(player)
+
+    for start in range(0, len(players), NOTIFICATION_BATCH_SIZE):
+        _notify_players(players[start:start + NOTIFICATION_BATCH_SIZE])
+
+    logger.info(f"Bucket {bucket_id} notified {len(players)} players.")
+
 # Match Player with Available Slots
 def match_player_with_slots(player: dict) -> pd.DataFrame:
     try:
-        all_slots = fetch_not_booked_slots()
+        slot_index = get_slot_index()
 
-        if all_slots.empty:
+        if not len(slot_index):
             logger.warning("No available slots fetched from business sheets.")
             return pd.DataFrame()
 
         player_localities = [loc.strip().lower() for loc in player["Locality"].split(",")]
         player_preferences = [sport.strip().lower() for sport in player["Preferences"].split(",")]
 
-        matched_slots = all_slots[
-            (all_slots["Locality"].isin(player_localities)) & 
-            (all_slots["Sport"].isin(player_preferences))
-        ]
+        matched_slots = slot_index.match(player_localities, player_preferences)
 
         logger.info(f"Matched slots for {player['Player Name']}:\n{matched_slots}")
         return matched_slots
@@ -121,51 +398,42 @@ def match_player_with_slots(player: dict) -> pd.DataFrame:
         logger.error(f"Error matching player {player['Player Name']} with slots: {e}")
         return pd.DataFrame()
 
-logger = logging.getLogger(__name__)
-
-# --- Construct WhatsApp Update Message ---
-def construct_update_message(player_name: str, slots_df: pd.DataFrame) -> str:
-    if slots_df.empty:
-        return f"Hi {player_name}, currently no available slots match your preferences."
-
-    message = f"Hi {player_name}, here are the latest updates for your preferences:\n\n"
-
-    for _, slot in slots_df.iterrows():
-        details = []
+# Match Many Players with Available Slots
+def match_players_with_slots(players: list) -> dict:
+    """
+    Matches a wave of players against all available slots with one relational join.
+    Returns {phone number: DataFrame of matched slots} with an entry for every player.
+    """
+    matches = {normalize_phone_number(player["Phone Number"]): pd.DataFrame() for player in players}
 
-        # Add Slot Details
-        if "Business" in slot:
-            details.append(f"*Turf*: {slot['Business'].capitalize()}")
+    try:
+        all_slots = get_slot_index().live_slots()
 
-        if "Sport" in slot:
-            details.append(f"*Sport*: {slot['Sport'].capitalize()}")
+        if all_slots.empty or not players:
+            logger.warning("No available slots fetched from business sheets.")
+            return matches
 
-        if "Locality" in slot:
-            details.append(f"*Area*: {slot['Locality'].capitalize()}")
+        # One row per (player, locality, sport) preference; a phone listed twice gets both rows' preferences
+        preferences = pd.DataFrame({
+            "Phone Number": [normalize_phone_number(player["Phone Number"]) for player in players],
+            "Locality": [str(player["Locality"]).split(",") for player in players],
+            "Sport": [str(player["Preferences"]).split(",") for player in players],
+        }).explode("Locality").explode("Sport")
+        preferences["Locality"] = preferences["Locality"].str.strip().str.lower()
+        preferences["Sport"] = preferences["Sport"].str.strip().str.lower()
+        preferences = preferences.drop_duplicates()
 
-        if "Date" in slot and slot["Date"] not in [None, ""]:
-            formatted_date = parse_date_from_sheet(slot["Date"])
-            details.append(f"*Date*: {formatted_date}")
-        else:
-            details.append(f"*Date*: Not Provided")
+        # Join every preference against every slot at once
+        slots_long = all_slots.rename_axis("Slot Id").reset_index()
+        matched = preferences.merge(slots_long, on=["Locality", "Sport"], how="inner")
+        matched = matched.drop_duplicates(["Phone Number", "Slot Id"]).sort_values(["Phone Number", "Slot Id"])
 
-        if "Timing" in slot and slot["Timing"] not in [None, ""]:
-            details.append(f"*Timing*: {slot['Timing']}")
-        else:
-            details.append(f"*Timing*: Invalid time format")
+        for phone_number, player_slots in matched.groupby("Phone Number", sort=False):
+            matches[phone_number] = player_slots.set_index("Slot Id")[all_slots.columns].rename_axis(None)
 
-        if "Price" in slot and slot["Price"] not in [None, ""]:
-            details.append(f"*Price*: ₹{slot['Price']}")
-        else:
-            details.append(f"*Price*: Not Provided")
+        logger.info(f"Matched {len(matched)} slots across {len(players)} players in one join.")
+        return matches
 
-        if "Booking" in slot and slot["Booking"] not in [None, ""]:
-            details.append(f"👉 *Book Now*: {slot['Booking']}")
-        else:
-            details.append(f"👉 *Book Now*: Booking link not available")
-
-        # Join details with ' | ' and append to the message
-        message += " | ".join(details) + "\n\n"
-
-    logger.debug(f"Constructed message:\n{message}")
-    return message
+    except Exception as e:
+        logger.error(f"Error matching {len(players)} players with slots: {e}")
+        return matches
@@ -1,100 +1,184 @@
-from apscheduler.job import Job
-from apscheduler.jobstores.base import BaseJobStore
-from apscheduler.util import maybe_ref
-import redis
-import pickle
 import logging
+import pickle
+import zlib
+
+import redis
+from apscheduler.job import Job
+from apscheduler.jobstores.base import BaseJobStore, ConflictingIdError, JobLookupError
+from apscheduler.util import datetime_to_utc_timestamp, utc_timestamp_to_datetime
 
 logger = logging.getLogger(__name__)
 
-class RedisJobStore:
-    def __init__(self, host="localhost", port=6379, db=0, password=None):
+
+class RedisJobStore(BaseJobStore):
+    """
+    APScheduler job store keeping job payloads in a Redis hash and next run times in a sorted set.
+    Due jobs and the next wakeup are answered from the sorted set; payloads are loaded with
+    pipelined HMGET in chunks of load_batch_size, so no call scans the keyspace or does one
+    round trip per job.
+    Payloads can be zlib-compressed; compressed and plain pickled payloads are both readable.
+    """
+
+    def __init__(
+        self,
+        host="localhost",
+        port=6379,
+        db=0,
+        password=None,
+        jobs_key="apscheduler.jobs",
+        run_times_key="apscheduler.run_times",
+        pickle_protocol=pickle.HIGHEST_PROTOCOL,
+        load_batch_size=1000,
+        compress_payloads=False,
+    ):
+        super().__init__()
+        self.jobs_key = jobs_key
+        self.run_times_key = run_times_key
+        self.pickle_protocol = pickle_protocol
+        self.load_batch_size = load_batch_size
+        self.compress_payloads = compress_payloads
         self.redis = redis.Redis(host=host, port=port, db=db, password=password)
         logger.info("Connected to Redis.")
 
-    def add_job(self, job_id, job_data):
-        try:
-            serialized_data = pickle.dumps(job_data)
-            self.redis.set(job_id, serialized_data)
-            logger.info(f"Added job {job_id} to Redis.")
-        except Exception as e:
-            logger.error(f"Failed to add job {job_id} to Redis: {e}")
-
-    def get_job(self, job_id):
-        try:
-            serialized_data = self.redis.get(job_id)
-            if serialized_data is None:
-                logger.error(f"Job {job_id} not found in Redis.")
-                return None
-            job = pickle.loads(serialized_data)
-            logger.info(f"Loaded job {job_id} from Redis.")
-            return job
-        except Exception as e:
-            logger.error(f"Failed to load job {job_id} from Redis: {e}")
+    # --- Lookups ---
+    def lookup_job(self, job_id):
+        job_state = self.redis.hget(self.jobs_key, job_id)
+        if job_state is None:
             return None
-
-    def remove_job(self, job_id):
-        try:
-            self.redis.delete(job_id)
-            logger.info(f"Removed job {job_id} from Redis.")
-        except Exception as e:
-            logger.error(f"Failed to remove job {job_id} from Redis: {e}")
+        return self._reconstitute_job(job_state)
 
     def get_due_jobs(self, now):
-        jobs = []
-        for key in self.redis.keys("job:*"):
-            job_data = self.redis.get(key)
-            try:
-                job_state = pickle.loads(job_data)
-                job = self._reconstitute_job(job_state)
-                if job.next_run_time and job.next_run_time <= now:
-                    jobs.append(job)
-            except Exception as e:
-                logger.error(f"Failed to load job from Redis: {e}")
-        return jobs
-
-    def get_all_jobs(self):
-        jobs = []
-        for key in self.redis.keys("job:*"):
-            job_data = self.redis.get(key)
-            try:
-                job_state = pickle.loads(job_data)
-                job = self._reconstitute_job(job_state)
-                jobs.append(job)
-            except Exception as e:
-                logger.error(f"Failed to load job from Redis: {e}")
-        return jobs
+        timestamp = datetime_to_utc_timestamp(now)
+        job_ids = self.redis.zrangebyscore(self.run_times_key, 0, timestamp)
+        return self._load_jobs(job_ids)
 
     def get_next_run_time(self):
-        jobs = self.get_all_jobs()
-        return min((job.next_run_time for job in jobs), default=None)
-
-    def lookup_job(self, job_id):
-        job_key = f"job:{job_id}"
-        job_data = self.redis.get(job_key)
-        if job_data:
-            try:
-                job_state = pickle.loads(job_data)
-                return self._reconstitute_job(job_state)
-            except Exception as e:
-                logger.error(f"Failed to lookup job {job_id}: {e}")
+        next_run = self.redis.zrange(self.run_times_key, 0, 0, withscores=True)
+        if next_run:
+            return utc_timestamp_to_datetime(next_run[0][1])
         return None
 
+    def get_all_jobs(self):
+        # Scheduled jobs in run time order, then paused jobs (which have no run time)
+        job_ids = self.redis.zrange(self.run_times_key, 0, -1)
+        scheduled_ids = set(job_ids)
+        job_ids += [job_id for job_id in self.redis.hkeys(self.jobs_key) if job_id not in scheduled_ids]
+        return self._load_jobs(job_ids)
+
+    # --- Writes ---
+    def add_job(self, job):
+        if self.redis.hexists(self.jobs_key, job.id):
+            raise ConflictingIdError(job.id)
+        self._write_job(job)
+
     def update_job(self, job):
-        self.add_job(job)
+        if not self.redis.hexists(self.jobs_key, job.id):
+            raise JobLookupError(job.id)
+        self._write_job(job)
+
+    def remove_job(self, job_id):
+        if not self.redis.hexists(self.jobs_key, job_id):
+            raise JobLookupError(job_id)
+
+        with self.redis.pipeline() as pipe:
+            pipe.hdel(self.jobs_key, job_id)
+            pipe.zrem(self.run_times_key, job_id)
+            pipe.execute()
 
     def remove_all_jobs(self):
-        for key in self.redis.keys("job:*"):
-            self.redis.delete(key)
+        with self.redis.pipeline() as pipe:
+            pipe.delete(self.jobs_key)
+            pipe.delete(self.run_times_key)
+            pipe.execute()
         logger.info("Removed all jobs from Redis.")
 
-    def _reconstitute_job(self, job_state):
-        """Recreate a job from its serialized state."""
-        try:
-            job_class = maybe_ref(job_state["job_class"])
-            job = job_class.__new__(job_class)
-            job.__setstate__(job_state)
-            return job
-        except Exception as e:
-            logger.error(f"Failed to reconstitute job: {e}")
-            raise
+    def apply_job_changes(self, added: list, modified: list, removed_ids: list):
+        """
+        Writes a batch of job additions, modifications and removals in one MULTI/EXEC transaction.
+        """
+        with self.redis.pipeline() as pipe:
+            run_times = {}
+            unscheduled_ids = list(removed_ids)
+            payloads = {}
+            for job in list(added) + list(modified):
+                payloads[job.id] = self._serialize_job(job)
+                if job.next_run_time:
+                    run_times[job.id] = datetime_to_utc_timestamp(job.next_run_time)
+                else:
+                    unscheduled_ids.append(job.id)
+
+            if payloads:
+                pipe.hset(self.jobs_key, mapping=payloads)
+            if run_times:
+                pipe.zadd(self.run_times_key, run_times)
+            if removed_ids:
+                pipe.hdel(self.jobs_key, *removed_ids)
+            if unscheduled_ids:
+                pipe.zrem(self.run_times_key, *unscheduled_ids)
+            pipe.execute()
+
+    def shutdown(self):
+        self.redis.connection_pool.disconnect()
+
+    # --- Serialization ---
+    def _write_job(self, job):
+        with self.redis.pipeline() as pipe:
+            pipe.hset(self.jobs_key, job.id, self._serialize_job(job))
+            if job.next_run_time:
+                pipe.zadd(self.run_times_key, {job.id: datetime_to_utc_timestamp(job.next_run_time)})
+            else:
+                pipe.zrem(self.run_times_key, job.id)
+            pipe.execute()
+
+    def _serialize_job(self, job) -> bytes:
+        job_state = pickle.dumps(job.__getstate__(), self.pickle_protocol)
+        if self.compress_payloads:
+            return zlib.compress(job_state)
+        return job_state
+
+    def _reconstitute_job(self, job_state: bytes):
+        # Pickles from protocol 2 on start with the PROTO opcode; anything else is compressed
+        if not job_state.startswith(pickle.PROTO):
+            job_state = zlib.decompress(job_state)
+
+        job = Job.__new__(Job)
+        job.__setstate__(pickle.loads(job_state))
+        job._scheduler = self._scheduler
+        job._jobstore_alias = self._alias
+        return job
+
+    def _load_jobs(self, job_ids: list) -> list:
+        """
+        Loads payloads for job_ids with one pipelined round trip of chunked HMGETs.
+        Jobs that can no longer be restored are logged and removed from the store.
+        """
+        if not job_ids:
+            return []
+
+        with self.redis.pipeline(transaction=False) as pipe:
+            for start in range(0, len(job_ids), self.load_batch_size):
+                pipe.hmget(self.jobs_key, job_ids[start:start + self.load_batch_size])
+            job_states = [state for chunk in pipe.execute() for state in chunk]
+
+        jobs = []
+        failed_job_ids = []
+        for job_id, job_state in zip(job_ids, job_states):
+            if job_state is None:
+                # Removed between the index read and the payload read
+                continue
+            try:
+                jobs.append(self._reconstitute_job(job_state))
+            except BaseException:
+                self._logger.exception(f"Unable to restore job {job_id!r} -- removing it")
+                failed_job_ids.append(job_id)
+
+        if failed_job_ids:
+            with self.redis.pipeline() as pipe:
+                pipe.hdel(self.jobs_key, *failed_job_ids)
+                pipe.zrem(self.run_times_key, *failed_job_ids)
+                pipe.execute()
+
+        return jobs
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} (jobs_key={self.jobs_key!r})>"
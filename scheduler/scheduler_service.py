@@ -5,16 +5,39 @@ from apscheduler.jobstores.redis import RedisJobStore
 from apscheduler.executors.pool import ThreadPoolExecutor
 import logging
 from pytz import timezone
+from config.environment import (
+    REDIS_HOST,
+    REDIS_PORT,
+    REDIS_PASSWORD,
+    SCHEDULER_JOBSTORE,
+    SCHEDULER_JOB_LOAD_BATCH_SIZE,
+    SCHEDULER_JOB_COMPRESSION,
+)
+from scheduler.redis_jobstore import RedisJobStore as IndexedRedisJobStore
 # Initialize Logger
 logger = logging.getLogger(__name__)
 
-# Configure Redis Job Store
-jobstores = {
-    "default": RedisJobStore(
+# Configure Redis Job Store ("indexed" loads due jobs with pipelined HMGET in batches)
+if SCHEDULER_JOBSTORE == "indexed":
+    default_jobstore = IndexedRedisJobStore(
+        host=REDIS_HOST,
+        port=REDIS_PORT,
+        db=0,
+        password=REDIS_PASSWORD,
+        load_batch_size=SCHEDULER_JOB_LOAD_BATCH_SIZE,
+        compress_payloads=SCHEDULER_JOB_COMPRESSION,
+    )
+else:
+    if SCHEDULER_JOB_COMPRESSION:
+        logger.warning("SCHEDULER_JOB_COMPRESSION only applies to the indexed job store; storing jobs uncompressed.")
+    default_jobstore = RedisJobStore(
         host="localhost",
         port=6379,
         db=0,
     )
+
+jobstores = {
+    "default": default_jobstore,
 }
 
 # Configure APScheduler Executors
@@ -26,4 +49,4 @@ executors = {
 scheduler = BackgroundScheduler(jobstores=jobstores, executors=executors, timezone=timezone("Asia/Kolkata"), job_defaults={"coalesce": False, "max_instances": 1},)
 scheduler.start()
 
-logger.info("APScheduler initialized with Redis-backed job store.")
+logger.info(f"APScheduler initialized with Redis-backed job store ({SCHEDULER_JOBSTORE}).")
@@ -0,0 +1,85 @@
+import logging
+import re
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+
+logger = logging.getLogger(__name__)
+
+ORDINAL_SUFFIX_PATTERN = re.compile(r"(\d+)(st|nd|rd|th)")
+
+# Cached marker for strings no supported format can parse
+_UNPARSEABLE = object()
+
+
+class SheetDateParser:
+    """
+    Bounded memoizing parser from sheet date strings to date objects.
+    Remembers which format last succeeded per context (e.g. sheet and column) and tries it first.
+    """
+
+    def __init__(self, formats: list, max_entries: int):
+        self.formats = list(formats)
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._preferred_formats = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.strptime_calls = 0
+
+    def parse(self, date_str: str, context=None) -> date:
+        """
+        Returns the date for date_str, raising ValueError if no supported format matches.
+        """
+        key = str(date_str).strip()
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                if cached is _UNPARSEABLE:
+                    raise ValueError(f"Date format not supported: {date_str}")
+                return cached
+
+            self.misses += 1
+            preferred = self._preferred_formats.get(context)
+
+        cleaned = ORDINAL_SUFFIX_PATTERN.sub(r"\1", key)
+        candidates = [preferred] + [fmt for fmt in self.formats if fmt != preferred] if preferred else self.formats
+
+        parsed = _UNPARSEABLE
+        attempts = 0
+        for fmt in candidates:
+            attempts += 1
+            try:
+                parsed = datetime.strptime(cleaned, fmt).date()
+            except ValueError:
+                continue
+
+            if fmt != preferred:
+                with self._lock:
+                    self._preferred_formats[context] = fmt
+            break
+
+        with self._lock:
+            self.strptime_calls += attempts
+            self._cache[key] = parsed
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+        if parsed is _UNPARSEABLE:
+            raise ValueError(f"Date format not supported: {date_str}")
+        return parsed
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "strptime_calls": self.strptime_calls,
+                "entries": len(self._cache),
+                "max_entries": self.max_entries,
+                "preferred_formats": {str(context): fmt for context, fmt in self._preferred_formats.items()},
+            }
@@ -1,10 +1,154 @@
 import pandas as pd
 import logging
+import threading
+import time
+from gspread.exceptions import APIError, SpreadsheetNotFound, WorksheetNotFound
+from concurrent.futures import ThreadPoolExecutor
+from gspread.utils import ValueInputOption, absolute_range_name, fill_gaps, numericise_all, rowcol_to_a1, to_records
 from .google_auth import gspread_client
-from datetime import datetime
-import re
+from .sheet_cache import SheetCache, CacheEntry
+from .date_parser import SheetDateParser
+from config.environment import (
+    SHEET_CACHE_TTL_SECONDS,
+    SHEET_CACHE_MAX_ENTRIES,
+    SHEET_HANDLE_REFRESH_SECONDS,
+    SLOT_FETCH_MODE,
+    SLOT_FETCH_WORKERS,
+    DATE_PARSE_CACHE_SIZE,
+)
+from datetime import date, datetime
 logger = logging.getLogger(__name__)
 
+
+# --- Spreadsheet Handle Cache ---
+class SheetHandleCache:
+    """
+    Keeps opened Spreadsheet and Worksheet handles plus each worksheet's header-to-column map.
+    Spreadsheets are resolved by title (a Drive search) once and reopened by key afterwards.
+    """
+
+    def __init__(self, client, refresh_seconds: float):
+        self._client = client
+        self._refresh_seconds = refresh_seconds
+        self._keys = {}
+        self._spreadsheets = {}
+        self._worksheets = {}
+        self._worksheet_lists = {}
+        self._headers = {}
+        self._lock = threading.RLock()
+
+    def spreadsheet(self, workspace_name: str):
+        with self._lock:
+            spreadsheet = self._spreadsheets.get(workspace_name)
+            if spreadsheet is None:
+                key = self._keys.get(workspace_name)
+                if key:
+                    try:
+                        spreadsheet = self._client.open_by_key(key)
+                    except (APIError, SpreadsheetNotFound) as e:
+                        if not is_stale_handle_error(e):
+                            raise
+                        logger.warning(f"Spreadsheet key {key} for '{workspace_name}' no longer opens; resolving by title.")
+                        self._keys.pop(workspace_name, None)
+                        key = None
+                if not key:
+                    spreadsheet = self._client.open(workspace_name)
+                    logger.info(f"Resolved spreadsheet '{workspace_name}' to key {spreadsheet.id}.")
+                self._keys[workspace_name] = spreadsheet.id
+                self._spreadsheets[workspace_name] = spreadsheet
+            return spreadsheet
+
+    def worksheet(self, workspace_name: str, worksheet_name: str):
+        with self._lock:
+            worksheet = self._worksheets.get((workspace_name, worksheet_name))
+            if worksheet is None:
+                worksheet = self.spreadsheet(workspace_name).worksheet(worksheet_name)
+                self._worksheets[(workspace_name, worksheet_name)] = worksheet
+            return worksheet
+
+    def worksheets(self, workspace_name: str) -> list:
+        """
+        Returns all worksheets of a spreadsheet, re-listing tabs at most every refresh interval.
+        """
+        with self._lock:
+            cached = self._worksheet_lists.get(workspace_name)
+            if cached is not None and time.monotonic() - cached[0] < self._refresh_seconds:
+                return cached[1]
+
+            worksheets = self.spreadsheet(workspace_name).worksheets()
+            self._worksheet_lists[workspace_name] = (time.monotonic(), worksheets)
+            return worksheets
+
+    def remember_header(self, workspace_name: str, worksheet_name: str, header: list) -> None:
+        with self._lock:
+            self._headers[(workspace_name, worksheet_name)] = {
+                column: position + 1 for position, column in enumerate(header) if column != ""
+            }
+
+    def column_index(self, workspace_name: str, worksheet_name: str, column_name: str) -> int:
+        """
+        Returns the 1-based column index for a header, re-reading the header row only when unknown.
+        """
+        with self._lock:
+            columns = self._headers.get((workspace_name, worksheet_name))
+            if columns is None or column_name not in columns:
+                header = self.worksheet(workspace_name, worksheet_name).row_values(1)
+                self.remember_header(workspace_name, worksheet_name, header)
+                columns = self._headers[(workspace_name, worksheet_name)]
+
+            if column_name not in columns:
+                raise ValueError(f"Column '{column_name}' not found in the worksheet.")
+            return columns[column_name]
+
+    def invalidate(self, workspace_name: str) -> None:
+        """
+        Drops every handle of a spreadsheet. Its resolved key is kept, so the next access reopens
+        it by key rather than searching Drive by title.
+        """
+        with self._lock:
+            self._spreadsheets.pop(workspace_name, None)
+            self._worksheet_lists.pop(workspace_name, None)
+            for key in [key for key in self._worksheets if key[0] == workspace_name]:
+                self._worksheets.pop(key, None)
+            for key in [key for key in self._headers if key[0] == workspace_name]:
+                self._headers.pop(key, None)
+
+
+# Shared handle cache and read-through cache for worksheet data
+sheet_handles = SheetHandleCache(gspread_client, refresh_seconds=SHEET_HANDLE_REFRESH_SECONDS)
+sheet_cache = SheetCache(ttl_seconds=SHEET_CACHE_TTL_SECONDS, max_entries=SHEET_CACHE_MAX_ENTRIES)
+
+# Download timings and conditional-fetch counters, per cached sheet
+fetch_stats = {}
+_fetch_stats_lock = threading.Lock()
+
+# Cache key of the parsed 'Not Booked' slots across all business tabs
+NOT_BOOKED_SLOTS_KEY = ("business-workspace", "Not Booked Slots")
+
+
+def is_stale_handle_error(error: Exception) -> bool:
+    """
+    True when an error means a cached handle points at a spreadsheet or worksheet that no longer exists.
+    Quota (429) and server (5xx) errors say nothing about the handles, so they don't count.
+    """
+    if isinstance(error, (SpreadsheetNotFound, WorksheetNotFound)):
+        return True
+    return isinstance(error, APIError) and error.code == 404
+
+
+def with_worksheet(workspace_name: str, worksheet_name: str, operation):
+    """
+    Runs operation(worksheet) on a cached handle, refreshing the handles once if the worksheet is gone.
+    """
+    try:
+        return operation(sheet_handles.worksheet(workspace_name, worksheet_name))
+    except (APIError, WorksheetNotFound) as e:
+        if not is_stale_handle_error(e):
+            raise
+        logger.warning(f"Refreshing handles for {workspace_name}/{worksheet_name} after error: {e}")
+        sheet_handles.invalidate(workspace_name)
+        return operation(sheet_handles.worksheet(workspace_name, worksheet_name))
+
 # --- Normalize Phone Number ---
 def normalize_phone_number(phone_number: str) -> str:
     phone_number_str = str(phone_number).strip()
@@ -25,41 +169,76 @@ def validate_slot_timing(timing_str: str) -> bool:
         logger.error(f"Invalid slot timing format: '{timing_str}'")
         return False
 
+# Date formats accepted in the sheets' Date columns, tried in order
+SUPPORTED_DATE_FORMATS = [
+    "%d %B, %Y", "%d %B %Y", 
+    "%d-%m-%Y", "%d/%m/%Y", 
+    "%d-%m-%y", "%d/%m/%y"
+]
+
+# Shared memoizing parser for sheet date strings
+date_parser = SheetDateParser(SUPPORTED_DATE_FORMATS, max_entries=DATE_PARSE_CACHE_SIZE)
+
 # --- Parse Date from Sheet ---
+def parse_slot_date(date_str: str, context=None) -> date:
+    """
+    Parses a sheet date string into a date, memoized. Pass a context such as (sheet, column)
+    so the format that matched earlier rows of the same column is tried first.
+    """
+    return date_parser.parse(date_str, context)
+
+
+# --- Format Date for Messages ---
+def format_slot_date(slot_date: date) -> str:
+    """
+    Formats a date as "18th December, 2024", "1st January, 2024", etc.
+    """
+    return f"{slot_date.day}{get_day_suffix(slot_date.day)} {slot_date.strftime('%B')}, {slot_date.year}"
+
+
 def parse_date_from_sheet(date_str: str) -> str:
     """
     Parses multiple date formats from Google Sheets and formats them as:
     "18th December, 2024", "1st January, 2024", etc.
     """
     try:
-        cleaned_date_str = re.sub(r"(\d+)(st|nd|rd|th)", r"\1", date_str.strip())
-        supported_formats = [
-            "%d %B, %Y", "%d %B %Y", 
-            "%d-%m-%Y", "%d/%m/%Y", 
-            "%d-%m-%y", "%d/%m/%y"
-        ]
-
-        parsed_date = None
-        for fmt in supported_formats:
-            try:
-                parsed_date = datetime.strptime(cleaned_date_str, fmt)
-                break
-            except ValueError:
-                continue
+        return format_slot_date(parse_slot_date(date_str))
+    except Exception as e:
+        raise ValueError(f"Error parsing date '{date_str}': {e}")
 
-        if not parsed_date:
-            raise ValueError(f"Date format not supported: {date_str}")
 
-        day = parsed_date.day
-        month = parsed_date.strftime("%B")
-        year = parsed_date.year
-        day_suffix = get_day_suffix(day)
+def get_date_parser_stats() -> dict:
+    return date_parser.stats()
 
-        formatted_date = f"{day}{day_suffix} {month}, {year}"
-        return formatted_date
 
-    except Exception as e:
-        raise ValueError(f"Error parsing date '{date_str}': {e}")
+# --- Parse a Date Column from Sheet ---
+def parse_sheet_dates(date_values: pd.Series, context=None) -> pd.Series:
+    """
+    Vectorized parse_slot_date: returns a datetime64 Series, NaT where no format matches.
+    Each distinct string is parsed once through the memoizing parser.
+    """
+    def to_timestamp(date_str):
+        try:
+            return pd.Timestamp(parse_slot_date(date_str, context))
+        except ValueError:
+            return pd.NaT
+
+    date_strings = date_values.astype(str)
+    parsed_by_string = {date_str: to_timestamp(date_str) for date_str in date_strings.unique()}
+    return pd.to_datetime(date_strings.map(parsed_by_string)).astype("datetime64[ns]")
+
+
+# --- Format a Date Column for Messages ---
+def format_sheet_dates(dates: pd.Series) -> pd.Series:
+    """
+    Formats a datetime64 Series like parse_date_from_sheet: "18th December, 2024".
+    """
+    day_labels = {day: f"{day}{get_day_suffix(day)}" for day in range(1, 32)}
+    return (
+        dates.dt.day.map(day_labels)
+        + " " + dates.dt.month_name()
+        + ", " + dates.dt.year.astype(str)
+    )
 
 # --- Helper Function for Day Suffix ---
 def get_day_suffix(day: int) -> str:
@@ -78,19 +257,74 @@ def get_day_suffix(day: int) -> str:
         return "rd"
     else:
         return "th"
-# --- Fetch Data from Google Sheets ---
-def fetch_sheet_data(workspace_name: str, worksheet_name: str) -> pd.DataFrame:
+# --- Conditional Read-Through Fetch ---
+def _record_fetch_stats(cache_key: tuple, **fields) -> None:
+    with _fetch_stats_lock:
+        stats = fetch_stats.setdefault(f"{cache_key[0]}/{cache_key[1]}", {"downloads": 0, "not_modified": 0})
+        for name, value in fields.items():
+            if name in ("downloads", "not_modified"):
+                stats[name] += value
+            else:
+                stats[name] = value
+
+
+def _spreadsheet_revision(workspace_name: str):
     """
-    Fetches all data from a specified Google Sheet worksheet and returns a DataFrame.
+    Returns the spreadsheet's Drive modifiedTime, or None if it cannot be read.
     """
     try:
-        spreadsheet = gspread_client.open(workspace_name)
-        worksheet = spreadsheet.worksheet(worksheet_name)
-        data = worksheet.get_all_records()
+        return sheet_handles.spreadsheet(workspace_name).get_lastUpdateTime()
+    except Exception as e:
+        logger.warning(f"Could not read revision of '{workspace_name}': {e}")
+        return None
+
+
+def _read_through(cache_key: tuple, download, force_refresh: bool) -> CacheEntry:
+    """
+    Serves cache_key from the sheet cache. Once its TTL expires, the previous frame is kept
+    when the spreadsheet revision is unchanged; otherwise download() is called for a new frame.
+    download() returns (frame, complete); an incomplete frame is cached without a revision, so
+    it is downloaded again when its TTL expires even if the spreadsheet hasn't changed.
+    """
+    if not force_refresh:
+        entry = sheet_cache.lookup(cache_key)
+        if entry is not None:
+            return entry
+
+    revision = _spreadsheet_revision(cache_key[0])
+
+    previous = sheet_cache.peek(cache_key)
+    if not force_refresh and previous is not None and revision is not None and previous.revision == revision:
+        sheet_cache.touch(cache_key)
+        _record_fetch_stats(cache_key, not_modified=1)
+        logger.debug(f"{cache_key[0]}/{cache_key[1]} not modified since {revision}.")
+        return previous
+
+    started = time.perf_counter()
+    frame, complete = download()
+    _record_fetch_stats(cache_key, downloads=1, last_download_seconds=round(time.perf_counter() - started, 4))
+    if not complete:
+        logger.warning(f"{cache_key[0]}/{cache_key[1]} downloaded partially; it will be downloaded again after its TTL.")
+        revision = None
+    return sheet_cache.store(cache_key, frame, revision=revision)
+
+
+# --- Fetch Data from Google Sheets ---
+def fetch_sheet_snapshot(workspace_name: str, worksheet_name: str, force_refresh: bool = False) -> CacheEntry:
+    """
+    Returns the cached snapshot of a worksheet, downloading it when missing or modified.
+    The snapshot frame is shared between callers and must not be modified.
+    A failed download yields an empty, uncached snapshot with version 0.
+    """
+    def download() -> tuple:
+        data = with_worksheet(workspace_name, worksheet_name, lambda worksheet: worksheet.get_all_records())
 
         if not data:
             logger.warning(f"No records found in {workspace_name}/{worksheet_name}.")
-            return pd.DataFrame()
+            return pd.DataFrame(), True
+
+        # Records carry the header in column order; keep the write-side column map current
+        sheet_handles.remember_header(workspace_name, worksheet_name, list(data[0].keys()))
 
         df = pd.DataFrame(data)
         
@@ -98,73 +332,196 @@ def fetch_sheet_data(workspace_name: str, worksheet_name: str) -> pd.DataFrame:
             df["Phone Number"] = df["Phone Number"].apply(normalize_phone_number)
 
         logger.info(f"Fetched {len(df)} records from {workspace_name}/{worksheet_name}.")
-        return df
+        return df, True
+
+    try:
+        return _read_through((workspace_name, worksheet_name), download, force_refresh)
     
     except Exception as e:
         logger.error(f"Error fetching sheet data from {workspace_name}/{worksheet_name}: {e}")
-        return pd.DataFrame()
+        return CacheEntry(frame=pd.DataFrame(), fetched_at=0.0, version=0)
 
 
-# --- Fetch Not Booked Slots from Business Workspace ---
-def fetch_not_booked_slots() -> pd.DataFrame:
+def fetch_sheet_data(workspace_name: str, worksheet_name: str, force_refresh: bool = False) -> pd.DataFrame:
     """
-    Fetches 'Not Booked' slots from all sheets in the business workspace.
+    Fetches all data from a specified Google Sheet worksheet and returns a DataFrame.
+    Served from the sheet cache until the entry's TTL expires, unless force_refresh is set.
     """
+    return fetch_sheet_snapshot(workspace_name, worksheet_name, force_refresh).frame.copy()
+
+
+# --- Read Business Workspace Tabs ---
+def _read_business_tabs_batched():
+    """
+    Reads every business tab with a single values batch_get and builds records like get_all_records.
+    Returns ({tab title: records}, {tab title: timings}).
+    """
+    def batch_get(spreadsheet):
+        worksheets = sheet_handles.worksheets("business-workspace")
+        ranges = [absolute_range_name(worksheet.title) for worksheet in worksheets]
+        response = spreadsheet.values_batch_get(ranges)
+        return worksheets, response.get("valueRanges", [])
+
     try:
-        spreadsheet = gspread_client.open("business-workspace")
-        all_business_data = []
+        worksheets, value_ranges = batch_get(sheet_handles.spreadsheet("business-workspace"))
+    except (APIError, WorksheetNotFound) as e:
+        # A tab renamed or deleted since the tab list was cached fails the whole batch with a 400
+        # "Unable to parse range", so that also re-lists the tabs once
+        range_error = isinstance(e, APIError) and e.code == 400
+        if not (range_error or is_stale_handle_error(e)):
+            raise
+        logger.warning(f"Refreshing handles for business-workspace after error: {e}")
+        sheet_handles.invalidate("business-workspace")
+        worksheets, value_ranges = batch_get(sheet_handles.spreadsheet("business-workspace"))
+
+    tab_records = {}
+    tab_timings = {}
+    for worksheet, value_range in zip(worksheets, value_ranges):
+        started = time.perf_counter()
+        values = fill_gaps(value_range.get("values", [[]]))
+        if len(values) < 2:
+            records = []
+        else:
+            records = to_records(values[0], [numericise_all(row) for row in values[1:]])
+        tab_records[worksheet.title] = records
+        tab_timings[worksheet.title] = {"decode_seconds": round(time.perf_counter() - started, 4)}
 
-        for sheet in spreadsheet.worksheets():
-            sheet_name = sheet.title.strip().lower()
-            logger.debug(f"Processing sheet: '{sheet_name}'")
+    return tab_records, tab_timings
 
-            try:
-                data = sheet.get_all_records()
-                if not data:
-                    logger.info(f"No data found in sheet '{sheet.title}'.")
-                    continue
-
-                df = pd.DataFrame(data)
-
-                # Ensure Required Columns Exist
-                required_columns = {"Locality", "Sport", "Status", "Date", "Timing", "Price", "Booking"}
-                missing_columns = required_columns - set(df.columns)
-
-                if missing_columns:
-                    logger.warning(f"Sheet '{sheet.title}' missing columns: {', '.join(missing_columns)}.")
-
-                # Normalize Relevant Columns
-                if "Locality" in df.columns:
-                    df["Locality"] = df["Locality"].astype(str).str.strip().str.lower()
-                if "Sport" in df.columns:
-                    df["Sport"] = df["Sport"].astype(str).str.strip().str.lower()
-                if "Status" in df.columns:
-                    df["Status"] = df["Status"].astype(str).str.strip().str.lower()
-
-                # Filter for Not Booked Slots
-                if "Status" in df.columns:
-                    not_booked = df[df["Status"] == "not booked"].copy()
-                    if not not_booked.empty:
-                        not_booked["Business"] = sheet_name
-                        all_business_data.append(not_booked)
-                    else:
-                        logger.info(f"No 'Not Booked' slots in sheet '{sheet.title}'.")
 
+def _read_business_tabs_concurrently():
+    """
+    Reads every business tab through a bounded thread pool, timing each tab's download.
+    Returns ({tab title: records}, {tab title: timings}); failed tabs are left out of the records
+    and carry their error in the timings.
+    """
+    def read_tab(worksheet):
+        started = time.perf_counter()
+        records = worksheet.get_all_records()
+        return records, time.perf_counter() - started
+
+    worksheets = sheet_handles.worksheets("business-workspace")
+    tab_records = {}
+    tab_timings = {}
+
+    with ThreadPoolExecutor(max_workers=SLOT_FETCH_WORKERS) as pool:
+        futures = {worksheet.title: pool.submit(read_tab, worksheet) for worksheet in worksheets}
+        for title, future in futures.items():
+            try:
+                records, seconds = future.result()
+                tab_records[title] = records
+                tab_timings[title] = {"read_seconds": round(seconds, 4)}
             except Exception as sheet_error:
-                logger.error(f"Error processing sheet '{sheet.title}': {sheet_error}")
+                logger.error(f"Error reading sheet '{title}': {sheet_error}")
+                tab_timings[title] = {"error": str(sheet_error)}
+                if is_stale_handle_error(sheet_error):
+                    sheet_handles.invalidate("business-workspace")
+
+    return tab_records, tab_timings
+
+
+def _parse_business_tab(title: str, data: list):
+    """
+    Normalizes one business tab and returns its 'Not Booked' rows, or None if there are none.
+    """
+    sheet_name = title.strip().lower()
+    logger.debug(f"Processing sheet: '{sheet_name}'")
+
+    if not data:
+        logger.info(f"No data found in sheet '{title}'.")
+        return None
+
+    df = pd.DataFrame(data)
+
+    # Ensure Required Columns Exist
+    required_columns = {"Locality", "Sport", "Status", "Date", "Timing", "Price", "Booking"}
+    missing_columns = required_columns - set(df.columns)
+
+    if missing_columns:
+        logger.warning(f"Sheet '{title}' missing columns: {', '.join(missing_columns)}.")
+
+    # Normalize Relevant Columns
+    if "Locality" in df.columns:
+        df["Locality"] = df["Locality"].astype(str).str.strip().str.lower()
+    if "Sport" in df.columns:
+        df["Sport"] = df["Sport"].astype(str).str.strip().str.lower()
+    if "Status" in df.columns:
+        df["Status"] = df["Status"].astype(str).str.strip().str.lower()
+
+    # Filter for Not Booked Slots
+    if "Status" not in df.columns:
+        return None
+
+    not_booked = df[df["Status"] == "not booked"].copy()
+    if not_booked.empty:
+        logger.info(f"No 'Not Booked' slots in sheet '{title}'.")
+        return None
+
+    not_booked["Business"] = sheet_name
+    return not_booked
 
-        if all_business_data:
-            result_df = pd.concat(all_business_data, ignore_index=True)
-            logger.info(f"Fetched {len(result_df)} 'Not Booked' slots with details.")
-            return result_df
-        
-        else:
-            logger.info("No 'Not Booked' slots found across all sheets.")
-            return pd.DataFrame()
+
+# --- Fetch Not Booked Slots from Business Workspace ---
+def _download_not_booked_slots() -> tuple:
+    """
+    Reads all business tabs in one batch request, or concurrently when SLOT_FETCH_MODE is "concurrent".
+    Returns (their 'Not Booked' rows, whether every tab was read and parsed).
+    """
+    started = time.perf_counter()
+    if SLOT_FETCH_MODE == "concurrent":
+        tab_records, tab_timings = _read_business_tabs_concurrently()
+    else:
+        tab_records, tab_timings = _read_business_tabs_batched()
+    fetch_seconds = time.perf_counter() - started
+    complete = len(tab_records) == len(tab_timings)
+
+    all_business_data = []
+    for title, records in tab_records.items():
+        parse_started = time.perf_counter()
+        try:
+            not_booked = _parse_business_tab(title, records)
+            if not_booked is not None:
+                all_business_data.append(not_booked)
+        except Exception as sheet_error:
+            logger.error(f"Error processing sheet '{title}': {sheet_error}")
+            complete = False
+        tab_timings[title]["parse_seconds"] = round(time.perf_counter() - parse_started, 4)
+
+    _record_fetch_stats(NOT_BOOKED_SLOTS_KEY, mode=SLOT_FETCH_MODE, tabs=tab_timings)
+    logger.info(f"Read {len(tab_records)} business sheets in {fetch_seconds:.3f}s: {tab_timings}")
+
+    if all_business_data:
+        result_df = pd.concat(all_business_data, ignore_index=True)
+        logger.info(f"Fetched {len(result_df)} 'Not Booked' slots with details.")
+        return result_df, complete
+
+    logger.info("No 'Not Booked' slots found across all sheets.")
+    return pd.DataFrame(), complete
+
+
+def fetch_not_booked_slots_snapshot(force_refresh: bool = False) -> CacheEntry:
+    """
+    Returns the cached snapshot of 'Not Booked' slots across all business sheets.
+    The snapshot frame is shared between callers and must not be modified.
+    """
+    try:
+        return _read_through(NOT_BOOKED_SLOTS_KEY, _download_not_booked_slots, force_refresh)
 
     except Exception as e:
         logger.error(f"Error fetching business data: {e}")
-        return pd.DataFrame()
+        return CacheEntry(frame=pd.DataFrame(), fetched_at=0.0, version=0)
+
+
+def fetch_not_booked_slots(force_refresh: bool = False) -> pd.DataFrame:
+    """
+    Fetches 'Not Booked' slots from all sheets in the business workspace.
+    """
+    return fetch_not_booked_slots_snapshot(force_refresh).frame.copy()
+
+
+def get_sheet_fetch_stats() -> dict:
+    with _fetch_stats_lock:
+        return {label: dict(stats) for label, stats in fetch_stats.items()}
 
 
 # --- Format Notification Time ---
@@ -183,28 +540,66 @@ def format_notification_time(time_str: str) -> str:
         raise ValueError(f"Invalid time format: {time_str}")
 
 
+# --- Sheet Cache Helpers ---
+def as_user_entered(value):
+    """
+    Mirrors how Sheets stores a USER_ENTERED string: a leading apostrophe only marks it as text.
+    """
+    if isinstance(value, str) and value.startswith("'"):
+        return value[1:]
+    return value
+
+
+def get_sheet_cache_stats() -> dict:
+    return sheet_cache.stats()
+
+
 # --- Update Google Sheet using gspread ---
 def update_google_sheet(column_name: str, value: str, row_index: int) -> None:
-    try:
-        spreadsheet = gspread_client.open("player-response-sheet")
-        worksheet = spreadsheet.worksheet("Players")
+    update_google_sheet_cells([(row_index, column_name, value)])
 
-        # Format time if updating the Notification Time
-        if column_name.lower() == "notification time":
-            value = format_notification_time(value)
 
-        # Find the Column Index Dynamically
-        header = worksheet.row_values(1)
-        if column_name not in header:
-            raise ValueError(f"Column '{column_name}' not found in the worksheet.")
+# --- Batch Update Google Sheet ---
+def update_google_sheet_cells(updates: list) -> None:
+    """
+    Writes many (row_index, column_name, value) cells of the Players sheet, possibly across players,
+    in a single values batch_update request, after one read of the header row.
+    """
+    if not updates:
+        return
 
-        col_index = header.index(column_name) + 1
+    try:
+        # Columns may have been inserted or reordered since the header was cached; re-read it once per write
+        header = with_worksheet("player-response-sheet", "Players", lambda worksheet: worksheet.row_values(1))
+        sheet_handles.remember_header("player-response-sheet", "Players", header)
+
+        data = []
+        written = []
+        for row_index, column_name, value in updates:
+            # Format time if updating the Notification Time
+            if column_name.lower() == "notification time":
+                value = format_notification_time(value)
+
+            # Find the Column Index from the header map
+            col_index = sheet_handles.column_index("player-response-sheet", "Players", column_name)
+            data.append({"range": rowcol_to_a1(row_index, col_index), "values": [[value]]})
+            written.append((row_index, column_name, value))
 
         # Update the Google Sheet
-        worksheet.update_cell(row_index, col_index, value)
-        logger.info(f"Updated {column_name} to '{value}' for row {row_index} in Google Sheet.")
+        with_worksheet(
+            "player-response-sheet", "Players",
+            lambda worksheet: worksheet.batch_update(data, value_input_option=ValueInputOption.user_entered),
+        )
+
+        # Keep cached reads consistent with the write, patching one copy for the whole batch (row 2 is the first data row)
+        patched = []
+        for row_index, column_name, value in written:
+            logger.info(f"Updated {column_name} to '{value}' for row {row_index} in Google Sheet.")
+            if column_name == "Phone Number":
+                value = normalize_phone_number(value)
+            patched.append((row_index - 2, column_name, as_user_entered(value)))
+        sheet_cache.patch_cells(("player-response-sheet", "Players"), patched)
 
     except Exception as e:
         logger.error(f"Error updating Google Sheet: {e}")
         raise
-
@@ -1,71 +1,82 @@
 import pandas as pd
-from sheets.google_sheets import fetch_sheet_data, parse_date_from_sheet, validate_slot_timing
+from sheets.google_sheets import fetch_sheet_snapshot, parse_sheet_dates, format_sheet_dates
+from sheets.player_registry import get_player_registry
 from notifications.whatsapp_notifier import send_whatsapp_message
-from scheduler.notification_scheduler import schedule_notification
+from scheduler.notification_scheduler import schedule_notification, schedule_notifications
 from utils.time_parser import parse_time
-from datetime import datetime, time
+from datetime import datetime
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 VALID_FREQUENCIES = ["daily", "weekly", "twice a week", "thrice a week"]
 
-# --- Check If Slot Is Valid ---
-from datetime import datetime, time
-
-# --- Check If Slot Is Valid ---
-def is_valid_slot(row: pd.Series, notif_time_today: time, now: datetime) -> bool:
+# --- Parse Slot Times ---
+def parse_slot_times(slots_df: pd.DataFrame, context=("Slots", "Date")) -> pd.DataFrame:
     """
-    Validates if a given slot is upcoming and after the user's notification time.
+    Parses every slot's Date and Timing once into typed "Slot Start" / "Slot End" datetime columns.
+    Rows with an unparseable date or timing get NaT. Dates are parsed with the (sheet, column)
+    context so the date parser learns each sheet's format; slots carrying a Business column use
+    one context per business.
     """
-    try:
-        # Validate Slot Timing
-        if not validate_slot_timing(row["Timing"]):
-            logger.error(f"Invalid slot timing format for row: {row}")
-            return False
-
-        # Parse Slot Date and Timing
-        slot_date = parse_date_from_sheet(row["Date"])
-        slot_date_obj = datetime.strptime(slot_date, "%d%B, %Y").date()
-
-        # Extract Start Time of the Slot
-        slot_start_time_str = row["Timing"].split("-")[0].strip()
-        slot_start_time = datetime.strptime(slot_start_time_str, "%I:%M %p").time()
-
-        # Current Date and Time
-        current_date = now.date()
-        current_time = now.time()
-
-        # Check for Future Dates or Today’s Upcoming Slots
-        if slot_date_obj > current_date:
-            return True  # Future slots are valid
+    parsed = slots_df.copy()
+    if parsed.empty or "Date" not in parsed.columns or "Timing" not in parsed.columns:
+        parsed["Slot Start"] = pd.Series(pd.NaT, index=parsed.index, dtype="datetime64[ns]")
+        parsed["Slot End"] = pd.Series(pd.NaT, index=parsed.index, dtype="datetime64[ns]")
+        return parsed
+
+    if "Business" in parsed.columns:
+        slot_dates = pd.concat(
+            [parse_sheet_dates(dates, (business, "Date")) for business, dates in parsed.groupby("Business")["Date"]]
+        ).reindex(parsed.index)
+    else:
+        slot_dates = parse_sheet_dates(parsed["Date"], context)
+
+    # "6:00PM - 7:00PM" or "6:00 PM - 7:00 PM"; anything other than exactly two times is invalid
+    timing_parts = parsed["Timing"].astype(str).str.replace(" ", "", regex=False).str.split("-")
+    well_formed = timing_parts.str.len() == 2
+    start_times = pd.to_datetime(timing_parts.str[0].where(well_formed), format="%I:%M%p", errors="coerce")
+    end_times = pd.to_datetime(timing_parts.str[1].where(well_formed), format="%I:%M%p", errors="coerce")
+
+    parsed["Slot Start"] = slot_dates + (start_times - start_times.dt.normalize())
+    parsed["Slot End"] = slot_dates + (end_times - end_times.dt.normalize())
+
+    invalid_count = int((parsed["Slot Start"].isna() | parsed["Slot End"].isna()).sum())
+    if invalid_count:
+        logger.error(f"Skipping {invalid_count} slots with an invalid date or timing format.")
+
+    return parsed
 
-        if slot_date_obj == current_date:
-            # Ensure Slot Start Time Is In The Future
-            if current_time < slot_start_time and slot_start_time >= notif_time_today:
-                return True
-
-        return False
-
-    except Exception as e:
-        logger.error(f"Error processing row: {row} | Error: {e}")
-        return False
-  
 # --- Filter Valid Slots ---
 def filter_valid_slots(slots_df: pd.DataFrame, user_notification_time: str) -> pd.DataFrame:
     """
     Filters slots for upcoming dates and today's slots after the user's notification time.
+    Accepts raw slots or the output of parse_slot_times, so a snapshot can be parsed once.
     """
     try:
         user_notification_time = user_notification_time.strip("'")
         notif_time_today = datetime.strptime(user_notification_time, "%I:%M %p").time()
         now = datetime.now()
 
-        # Apply the slot filtering logic
-        valid_slots = slots_df[slots_df.apply(is_valid_slot, axis=1, args=(notif_time_today, now))].copy()
+        if "Slot Start" not in slots_df.columns:
+            slots_df = parse_slot_times(slots_df)
+
+        slot_start = slots_df["Slot Start"]
+        slot_day = slot_start.dt.normalize()
+        today = pd.Timestamp(now.date())
+
+        # Future dates are valid; today's slots must start later and after the notification time.
+        # A timing whose end doesn't parse is invalid even though its start does.
+        valid_mask = slots_df["Slot End"].notna() & ((slot_day > today) | (
+            (slot_day == today)
+            & (slot_start > pd.Timestamp(now))
+            & (slot_start >= pd.Timestamp(datetime.combine(now.date(), notif_time_today)))
+        ))
+        valid_slots = slots_df[valid_mask].copy()
 
         # Ensure Dates Are Properly Formatted
-        valid_slots["Date"] = valid_slots["Date"].apply(parse_date_from_sheet)
+        valid_slots["Date"] = format_sheet_dates(valid_slots["Slot Start"])
         logger.info(f"Filtered {len(valid_slots)} valid slots after applying timing logic.")
         return valid_slots
 
@@ -90,43 +101,65 @@ def schedule_player_notification(player: pd.Series):
 
 # --- Process All Player Notifications ---
 def process_player_notifications():
+    """
+    Schedules notifications for all players in one pass. Players and slots are fetched and parsed
+    once, and slot eligibility is computed once per distinct notification time.
+    """
     try:
+        stage_timings = {}
+        stage_started = time.perf_counter()
+
         # Fetch Player Data
-        players_df = fetch_sheet_data("player-response-sheet", "Players")
-        logger.info(f"Fetched {len(players_df)} player records from Google Sheets.")
+        registry = get_player_registry()
+        logger.info(f"Fetched {len(registry)} player records from Google Sheets.")
 
-        for _, player in players_df.iterrows():
+        # Validate Players and Group Them by Notification Time
+        players_by_time = {}
+        for player in registry:
             try:
-                # Validate Player Data
-                if not validate_player_data(player):
-                    continue
-
-                # Extract Data and Fetch Slots
-                phone_number = str(player["Phone Number"]).strip()
-                player_name = player["Player Name"].strip()
-                notification_time = player["Notification Time"].strip()
-                notification_frequency = player["Notification Frequency"].strip().lower()
-
-                # Fetch Slots and Apply Filters
-                slots_df = fetch_sheet_data("business-workspace", "Slots")
-                valid_slots = filter_valid_slots(slots_df, notification_time)
-
-                if valid_slots.empty:
-                    logger.info(f"No valid slots for player {player_name}. Skipping notification.")
-                    continue
-
-                # Schedule Notifications
-                job_id = schedule_notification(player, notification_frequency, notification_time)
-                logger.info(f"Successfully scheduled notifications for {player_name} (Job ID: {job_id}).")
-
+                if validate_player_data(player):
+                    players_by_time.setdefault(player["Notification Time"].strip(), []).append(player)
             except Exception as e:
                 logger.error(f"Error processing player {player['Player Name']}: {e}")
+        stage_timings["players"] = round(time.perf_counter() - stage_started, 4)
+
+        # Fetch and Parse Slots Once
+        stage_started = time.perf_counter()
+        slots_df = parse_slot_times(fetch_sheet_snapshot("business-workspace", "Slots").frame)
+        stage_timings["slots"] = round(time.perf_counter() - stage_started, 4)
+
+        # Check Slot Availability per Distinct Notification Time
+        stage_started = time.perf_counter()
+        has_valid_slots = {
+            notification_time: not filter_valid_slots(slots_df, notification_time).empty
+            for notification_time in players_by_time
+        }
+        stage_timings["eligibility"] = round(time.perf_counter() - stage_started, 4)
+
+        # Schedule Notifications in One Batch
+        stage_started = time.perf_counter()
+        entries = []
+        for notification_time, players in players_by_time.items():
+            if not has_valid_slots[notification_time]:
+                logger.info(f"No valid slots for {len(players)} players notified at {notification_time}. Skipping.")
+                continue
+
+            for player in players:
+                entries.append((player, player["Notification Frequency"].strip().lower(), notification_time))
+
+        summary = schedule_notifications(entries)
+        stage_timings["schedule"] = round(time.perf_counter() - stage_started, 4)
+
+        logger.info(
+            f"Scheduled {len(entries)} players across {len(players_by_time)} notification times ({summary}). "
+            f"Stage timings (s): {stage_timings}"
+        )
 
     except Exception as e:
         logger.error(f"Error fetching player data from Google Sheets: {e}")
 
 # --- Validate Player Data ---
-def validate_player_data(player: pd.Series) -> bool:
+def validate_player_data(player: dict) -> bool:
     required_fields = ["Phone Number", "Notification Frequency", "Notification Time", 
                        "Player Name", "Preferences", "Locality"]
     missing_fields = [field for field in required_fields if field not in player or pd.isna(player[field])]
@@ -0,0 +1,137 @@
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import pandas as pd
+
+from sheets.google_sheets import fetch_sheet_snapshot, normalize_phone_number
+
+logger = logging.getLogger(__name__)
+
+PLAYERS_WORKSPACE = "player-response-sheet"
+PLAYERS_WORKSHEET = "Players"
+
+# Data rows start below the header row, and sheet rows are 1-based
+FIRST_DATA_ROW = 2
+
+
+class PlayerRegistry:
+    """
+    Index of the Players sheet keyed by normalized phone number.
+    Built once per downloaded snapshot; each record keeps its sheet row number. Cells written
+    since the download are applied to the affected records with apply_patches.
+    """
+
+    def __init__(self, players_df: pd.DataFrame, version: int = 0):
+        self.version = version
+        self.base_version = version
+        self.applied_patches = 0
+        self._players = {}
+        self._rows = {}
+
+        for position, record in enumerate(players_df.to_dict("records")):
+            phone_number = record.get("Phone Number")
+            if phone_number in (None, "") or phone_number in self._players:
+                continue
+
+            self._players[phone_number] = record
+            self._rows[phone_number] = position + FIRST_DATA_ROW
+
+    @property
+    def available(self) -> bool:
+        """
+        False for the empty registry served until the Players sheet has been downloaded once.
+        """
+        return self.version != 0
+
+    def apply_patches(self, patches: tuple, version: int) -> bool:
+        """
+        Applies (row position, column, value) cells written to the sheet, replacing the affected
+        records. Returns False if a patch changes a phone number, which needs a rebuild instead.
+        """
+        phones_by_row = {row: phone_number for phone_number, row in self._rows.items()}
+        for row_position, column, value in patches:
+            if column == "Phone Number":
+                return False
+            phone_number = phones_by_row.get(row_position + FIRST_DATA_ROW)
+            if phone_number is not None:
+                self._players[phone_number] = dict(self._players[phone_number], **{column: value})
+
+        self.applied_patches += len(patches)
+        self.version = version
+        return True
+
+    def get(self, phone_number: str):
+        """
+        Returns a copy of the player's record, or None if the number is not registered.
+        """
+        record = self._players.get(normalize_phone_number(phone_number))
+        return dict(record) if record is not None else None
+
+    def row_index(self, phone_number: str):
+        """
+        Returns the player's 1-based row number in the Players sheet, or None.
+        """
+        return self._rows.get(normalize_phone_number(phone_number))
+
+    def phone_numbers(self) -> list:
+        return list(self._players)
+
+    def __contains__(self, phone_number: str) -> bool:
+        return normalize_phone_number(phone_number) in self._players
+
+    def __iter__(self):
+        return (dict(record) for record in self._players.values())
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+
+_registry = PlayerRegistry(pd.DataFrame())
+_registry_lock = threading.Lock()
+
+# Registry that get_player_registry returns instead of the shared one, e.g. for a command batch
+_pinned_registry = ContextVar("pinned_player_registry", default=None)
+
+
+@contextmanager
+def pinned_registry(registry):
+    """
+    Makes get_player_registry return registry within the block, in the current thread or task only.
+    """
+    token = _pinned_registry.set(registry)
+    try:
+        yield registry
+    finally:
+        _pinned_registry.reset(token)
+
+
+# --- Shared Player Registry ---
+def get_player_registry(force_refresh: bool = False) -> PlayerRegistry:
+    """
+    Returns the registry for the current Players snapshot, rebuilding it only when the snapshot changed.
+    Inside pinned_registry, returns the pinned registry instead.
+    """
+    global _registry
+
+    pinned = _pinned_registry.get()
+    if pinned is not None and not force_refresh:
+        return pinned
+
+    snapshot = fetch_sheet_snapshot(PLAYERS_WORKSPACE, PLAYERS_WORKSHEET, force_refresh)
+
+    with _registry_lock:
+        if snapshot.version == 0:
+            logger.warning(f"Players sheet unavailable; serving registry snapshot v{_registry.version}.")
+        elif snapshot.version != _registry.version:
+            if not (
+                snapshot.base_version == _registry.base_version
+                and _registry.apply_patches(snapshot.patches[_registry.applied_patches:], snapshot.version)
+            ):
+                # The snapshot frame already includes its patches
+                _registry = PlayerRegistry(snapshot.frame, snapshot.version)
+                _registry.base_version = snapshot.base_version or snapshot.version
+                _registry.applied_patches = len(snapshot.patches)
+                logger.info(f"Indexed {len(_registry)} players from snapshot v{snapshot.version}.")
+        return _registry
@@ -0,0 +1,146 @@
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+logger = logging.getLogger(__name__)
+
+# Monotonic snapshot versions, unique across all cache entries
+_versions = itertools.count(1)
+
+
+@dataclass
+class CacheEntry:
+    frame: pd.DataFrame
+    fetched_at: float
+    version: int
+    revision: str = None
+    # Version of the download this frame was patched from, and the (row, column, value) cells patched since
+    base_version: int = None
+    patches: tuple = ()
+
+
+class SheetCache:
+    """
+    In-process TTL cache of worksheet DataFrames keyed by (workspace, worksheet).
+    Least recently used entries are evicted once max_entries is reached.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    def lookup(self, key: tuple):
+        """
+        Returns the entry for key if it is still within its TTL, otherwise None.
+        Expired entries are kept (and counted as stale) until they are replaced.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if time.monotonic() - entry.fetched_at > self.ttl_seconds:
+                self.stale += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def peek(self, key: tuple):
+        """
+        Returns the entry for key whether or not it has expired, without touching the counters.
+        """
+        with self._lock:
+            return self._entries.get(key)
+
+    def touch(self, key: tuple) -> None:
+        """
+        Restarts an entry's TTL after its source was confirmed unchanged.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.fetched_at = time.monotonic()
+                self._entries.move_to_end(key)
+
+    def store(self, key: tuple, frame: pd.DataFrame, revision: str = None) -> CacheEntry:
+        with self._lock:
+            entry = CacheEntry(
+                frame=frame, fetched_at=time.monotonic(), version=next(_versions), revision=revision
+            )
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                evicted_key, _ = self._entries.popitem(last=False)
+                logger.debug(f"Evicted {evicted_key} from sheet cache.")
+
+            return entry
+
+    def patch_cell(self, key: tuple, row_position: int, column: str, value) -> bool:
+        return self.patch_cells(key, [(row_position, column, value)])
+
+    def patch_cells(self, key: tuple, cells: list) -> bool:
+        """
+        Applies written (row position, column, value) cells to one copy of the cached frame so reads
+        after a write stay correct, and replaces the entry once; frames already handed out are never
+        modified. Falls back to invalidating the entry when any cell cannot be located.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not cells:
+                return False
+
+            for row_position, column, _ in cells:
+                if column not in entry.frame.columns or not 0 <= row_position < len(entry.frame):
+                    logger.info(f"Cannot patch {key} row {row_position} column '{column}'; invalidating.")
+                    self._entries.pop(key, None)
+                    return False
+
+            frame = entry.frame.copy()
+            for row_position, column, value in cells:
+                if isinstance(value, str) and is_numeric_dtype(frame[column]):
+                    frame[column] = frame[column].astype(object)
+                frame.iat[row_position, frame.columns.get_loc(column)] = value
+
+            self._entries[key] = CacheEntry(
+                frame=frame,
+                fetched_at=entry.fetched_at,
+                version=next(_versions),
+                # The write moved the spreadsheet past the revision this frame was downloaded at
+                revision=None,
+                base_version=entry.base_version or entry.version,
+                patches=entry.patches + tuple(cells),
+            )
+            return True
+
+    def invalidate(self, key: tuple = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "stale": self.stale,
+                "entries": len(self._entries),
+                "ttl_seconds": self.ttl_seconds,
+                "max_entries": self.max_entries,
+            }
@@ -0,0 +1,117 @@
+import logging
+import threading
+
+import pandas as pd
+
+from sheets.google_sheets import fetch_not_booked_slots_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+class SlotIndex:
+    """
+    Inverted index from (locality, sport) to the row ids of available slots.
+    Row ids are stable for the life of the index, so slots can be added or booked in place.
+    """
+
+    def __init__(self, slots_df: pd.DataFrame, version: int = 0):
+        self.version = version
+        self._slots = slots_df.reset_index(drop=True)
+        self._postings = {}
+        self._row_ids_by_key = {}
+        self._booked = set()
+        self._lock = threading.RLock()
+        self._index_rows(self._slots)
+
+    def _index_rows(self, rows: pd.DataFrame) -> None:
+        if rows.empty or not {"Locality", "Sport"} <= set(rows.columns):
+            return
+
+        for (locality, sport), positions in rows.groupby(["Locality", "Sport"]).indices.items():
+            self._postings.setdefault((locality, sport), set()).update(rows.index[positions])
+
+        for row_id, key in zip(rows.index, rows.astype(str).itertuples(index=False, name=None)):
+            self._row_ids_by_key.setdefault(key, []).append(row_id)
+
+    def match(self, localities, sports) -> pd.DataFrame:
+        """
+        Returns available slots in any of the localities for any of the sports, in row id order.
+        """
+        with self._lock:
+            row_ids = set()
+            for locality in localities:
+                for sport in sports:
+                    row_ids |= self._postings.get((locality, sport), set())
+            return self._slots.loc[sorted(row_ids)]
+
+    def live_slots(self) -> pd.DataFrame:
+        """
+        Returns every available (not booked) slot, indexed by row id.
+        """
+        with self._lock:
+            return self._slots.drop(index=list(self._booked))
+
+    def add_slots(self, new_slots: pd.DataFrame) -> None:
+        with self._lock:
+            if new_slots.empty:
+                return
+            next_row_id = self._slots.index.max() + 1 if len(self._slots) else 0
+            new_slots = new_slots.set_axis(range(next_row_id, next_row_id + len(new_slots)))
+            self._slots = pd.concat([self._slots, new_slots])
+            self._index_rows(new_slots)
+
+    def mark_booked(self, row_ids) -> None:
+        with self._lock:
+            for row_id in row_ids:
+                if row_id in self._booked or row_id not in self._slots.index:
+                    continue
+                key = (self._slots.at[row_id, "Locality"], self._slots.at[row_id, "Sport"])
+                self._postings.get(key, set()).discard(row_id)
+                self._booked.add(row_id)
+
+    def updated(self, slots_df: pd.DataFrame, version: int) -> "SlotIndex":
+        """
+        Applies a newer snapshot as a diff: vanished rows are marked booked and new rows added.
+        Returns a rebuilt index instead when the columns changed or booked rows dominate.
+        """
+        with self._lock:
+            if list(slots_df.columns) != list(self._slots.columns) or len(self._booked) > len(self._slots) // 2:
+                return SlotIndex(slots_df, version)
+
+            snapshot_keys = list(slots_df.astype(str).itertuples(index=False, name=None))
+            current_keys = set(self._row_ids_by_key)
+
+            booked_keys = current_keys - set(snapshot_keys)
+            for key in booked_keys:
+                self.mark_booked(self._row_ids_by_key.pop(key))
+
+            new_positions = [position for position, key in enumerate(snapshot_keys) if key not in current_keys]
+            self.add_slots(slots_df.iloc[new_positions])
+
+            self.version = version
+            logger.info(f"Slot index v{version}: {len(new_positions)} added, {len(booked_keys)} booked.")
+            return self
+
+    def __len__(self) -> int:
+        return len(self._slots) - len(self._booked)
+
+
+_slot_index = SlotIndex(pd.DataFrame())
+_slot_index_lock = threading.Lock()
+
+
+# --- Shared Slot Index ---
+def get_slot_index(force_refresh: bool = False) -> SlotIndex:
+    """
+    Returns the slot index for the current 'Not Booked' snapshot, updating it when the snapshot changed.
+    """
+    global _slot_index
+
+    snapshot = fetch_not_booked_slots_snapshot(force_refresh)
+
+    with _slot_index_lock:
+        if snapshot.version == 0:
+            logger.warning(f"Slot data unavailable; serving slot index v{_slot_index.version}.")
+        elif snapshot.version != _slot_index.version:
+            _slot_index = _slot_index.updated(snapshot.frame, snapshot.version)
+        return _slot_index
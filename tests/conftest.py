@@ -0,0 +1,42 @@
+import json
+import os
+import tempfile
+
+import fakeredis
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+
+def _write_service_account_file() -> str:
+    """
+    Writes a throwaway service account key: sheets.google_auth loads one at import time, but
+    authorizing never calls Google until a sheet is opened, which the tests never do.
+    """
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    path = os.path.join(tempfile.mkdtemp(prefix="tests-"), "service_account.json")
+    with open(path, "w") as service_account_file:
+        json.dump({
+            "type": "service_account",
+            "project_id": "test",
+            "private_key_id": "test",
+            "private_key": key.private_bytes(
+                serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+            ).decode(),
+            "client_email": "test@test.iam.gserviceaccount.com",
+            "client_id": "1",
+            "token_uri": "https://oauth2.googleapis.com/token",
+        }, service_account_file)
+    return path
+
+
+# config.environment refuses to load without these; the tests never reach Google or Twilio
+if not os.path.exists(os.getenv("GOOGLE_SHEETS_CREDENTIALS", "")):
+    os.environ["GOOGLE_SHEETS_CREDENTIALS"] = _write_service_account_file()
+for name in ["TWILIO_SID", "TWILIO_AUTH_TOKEN", "TWILIO_SANDBOX_NUMBER"]:
+    os.environ.setdefault(name, "test")
+
+
+@pytest.fixture
+def fake_redis():
+    return fakeredis.FakeRedis(server=fakeredis.FakeServer())
@@ -0,0 +1,88 @@
+"""
+In-memory stand-ins for the gspread client, spreadsheets and worksheets the Sheets layer talks to.
+"""
+import json
+
+import requests
+from gspread.exceptions import APIError, SpreadsheetNotFound, WorksheetNotFound
+from gspread.utils import a1_to_rowcol
+
+
+def api_error(code: int, message: str = "error") -> APIError:
+    response = requests.Response()
+    response.status_code = code
+    response._content = json.dumps({"error": {"code": code, "message": message, "status": "ERROR"}}).encode()
+    return APIError(response)
+
+
+class FakeWorksheet:
+    def __init__(self, title: str, rows: list):
+        self.title = title
+        self.rows = [list(row) for row in rows]
+        self.calls = []
+
+    def get_all_records(self) -> list:
+        self.calls.append("get_all_records")
+        header, *rows = self.rows
+        return [dict(zip(header, row)) for row in rows]
+
+    def row_values(self, row: int) -> list:
+        self.calls.append("row_values")
+        return list(self.rows[row - 1])
+
+    def batch_update(self, data, value_input_option=None):
+        self.calls.append("batch_update")
+        for cell in data:
+            row, column = a1_to_rowcol(cell["range"])
+            self.rows[row - 1][column - 1] = cell["values"][0][0]
+
+
+class FakeSpreadsheet:
+    def __init__(self, title: str, worksheets: list):
+        self.title = title
+        self.id = f"key-{title}"
+        self.tabs = {worksheet.title: worksheet for worksheet in worksheets}
+        self.revision = 1
+        self.calls = []
+
+    def worksheet(self, title: str):
+        self.calls.append("worksheet")
+        if title not in self.tabs:
+            raise WorksheetNotFound(title)
+        return self.tabs[title]
+
+    def worksheets(self) -> list:
+        self.calls.append("worksheets")
+        return list(self.tabs.values())
+
+    def get_lastUpdateTime(self) -> str:
+        return f"revision-{self.revision}"
+
+    def values_batch_get(self, ranges: list, params=None) -> dict:
+        self.calls.append("values_batch_get")
+        value_ranges = []
+        for range_name in ranges:
+            title = range_name.strip("'").replace("''", "'")
+            if title not in self.tabs:
+                raise api_error(400, f"Unable to parse range: {range_name}")
+            value_ranges.append({"range": range_name, "values": [[str(value) for value in row] for row in self.tabs[title].rows]})
+        return {"valueRanges": value_ranges}
+
+
+class FakeClient:
+    def __init__(self, *spreadsheets):
+        self.spreadsheets = {spreadsheet.title: spreadsheet for spreadsheet in spreadsheets}
+        self.calls = []
+
+    def open(self, title: str):
+        self.calls.append(("open", title))
+        if title not in self.spreadsheets:
+            raise SpreadsheetNotFound(title)
+        return self.spreadsheets[title]
+
+    def open_by_key(self, key: str):
+        self.calls.append(("open_by_key", key))
+        for spreadsheet in self.spreadsheets.values():
+            if spreadsheet.id == key:
+                return spreadsheet
+        raise api_error(404, f"Requested entity was not found: {key}")
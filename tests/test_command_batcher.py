@@ -0,0 +1,97 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from commands import command_batch, command_processor
+from commands.command_batch import current_batch
+from commands.command_processor import SAVE_FAILED_MESSAGE, SLOW_DOWN_MESSAGE, CommandBatcher
+from sheets.player_registry import PlayerRegistry
+from utils.keyed_executor import KeyedExecutor, KeyQueueFull
+
+PLAYERS = pd.DataFrame({
+    "Player Name": ["Asha", "Ben"],
+    "Phone Number": ["+919876543210", "+919999999999"],
+    "Preferences": ["Padel", "Football"],
+})
+
+
+@pytest.fixture
+def replies(monkeypatch):
+    replies = []
+    monkeypatch.setattr(command_processor, "send_whatsapp_message", lambda phone_number, message: replies.append((phone_number, message)))
+    return replies
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    """
+    Commands write their text to Preferences; the flushed cells and change events are recorded.
+    """
+    writes = {"flushed": [], "changed": []}
+
+    def process_command(phone_number, command_text):
+        row = current_batch.get().registry.row_index(phone_number)
+        current_batch.get().record_write(phone_number, [(row, "Preferences", command_text)])
+
+    monkeypatch.setattr(command_processor, "process_command", process_command)
+    monkeypatch.setattr(command_processor, "get_player_registry", lambda: PlayerRegistry(PLAYERS, version=1))
+    monkeypatch.setattr(command_batch, "update_google_sheet_cells", writes["flushed"].append)
+    monkeypatch.setattr(command_batch, "emit_player_changed", lambda phone_number, fields: writes["changed"].append(phone_number))
+    return writes
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    executor = KeyedExecutor(max_workers=2, max_pending_per_key=1, name="test")
+    monkeypatch.setattr(command_processor, "command_executor", executor)
+    yield executor
+    executor.shutdown()
+
+
+def run_batch(commands: list) -> list:
+    batcher = CommandBatcher(window_seconds=60, max_size=len(commands))
+    futures = [batcher.submit(phone_number, command_text) for phone_number, command_text in commands]
+    for future in futures:
+        future.exception(timeout=5)
+    return futures
+
+
+def test_a_batch_flushes_every_write_in_one_update(writes, replies, executor):
+    futures = run_batch([("+919876543210", "Tennis"), ("+919999999999", "Squash"), ("+919876543210", "Padel")])
+
+    assert all(future.exception() is None for future in futures)
+    assert writes["flushed"] == [[(2, "Preferences", "Tennis"), (3, "Preferences", "Squash"), (2, "Preferences", "Padel")]]
+    assert sorted(writes["changed"]) == ["+919876543210", "+919999999999"]
+    assert replies == []
+
+
+def test_senders_over_their_queue_limit_are_asked_to_slow_down(writes, replies, executor):
+    release = threading.Event()
+    # Asha's queue is full while her first command is still waiting for a worker
+    executor.submit("blocker-1", release.wait)
+    executor.submit("blocker-2", release.wait)
+    executor.submit("+919876543210", lambda: None)
+
+    batcher = CommandBatcher(window_seconds=60, max_size=2)
+    dropped = batcher.submit("+919876543210", "Tennis")
+    accepted = batcher.submit("+919999999999", "Squash")
+    assert isinstance(dropped.exception(timeout=5), KeyQueueFull)
+    release.set()
+    accepted.result(timeout=5)
+
+    assert replies == [("+919876543210", SLOW_DOWN_MESSAGE)]
+    assert writes["flushed"] == [[(3, "Preferences", "Squash")]]
+
+
+def test_writers_are_told_when_the_flush_fails(writes, replies, executor, monkeypatch):
+    def fail(sheet_updates):
+        raise RuntimeError("quota exceeded")
+
+    monkeypatch.setattr(command_batch, "update_google_sheet_cells", fail)
+
+    futures = run_batch([("+919876543210", "Tennis"), ("+919999999999", "Squash")])
+
+    assert all(isinstance(future.exception(), RuntimeError) for future in futures)
+    assert sorted(replies) == [("+919876543210", SAVE_FAILED_MESSAGE), ("+919999999999", SAVE_FAILED_MESSAGE)]
+    assert writes["changed"] == []
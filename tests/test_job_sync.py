@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta
+
+import pytest
+from apscheduler.events import EVENT_JOB_ADDED, EVENT_JOB_MODIFIED, EVENT_JOB_REMOVED
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.cron import CronTrigger
+from pytz import utc
+
+from scheduler import job_sync
+from scheduler.redis_jobstore import RedisJobStore
+from scheduler.job_sync import upsert_jobs
+
+
+def notify(phone_number):
+    pass
+
+
+def other(phone_number):
+    pass
+
+
+def daily(hour: int) -> CronTrigger:
+    return CronTrigger(hour=hour, minute=0, timezone=utc)
+
+
+@pytest.fixture(params=["indexed", "memory", "public"])
+def scheduler(request, fake_redis, monkeypatch):
+    """
+    A paused scheduler on the indexed Redis store (batched writes), a memory store (one call per
+    job) or a memory store reached only through the public scheduler API.
+    """
+    if request.param == "indexed":
+        jobstore = RedisJobStore()
+        jobstore.redis = fake_redis
+    else:
+        jobstore = MemoryJobStore()
+    if request.param == "public":
+        monkeypatch.setattr(job_sync, "_BATCH_ATTRIBUTES", ("_internal_missing_from_this_version",))
+
+    scheduler = BackgroundScheduler(jobstores={"default": jobstore}, timezone=utc)
+    scheduler.start(paused=True)
+    monkeypatch.setattr(job_sync, "scheduler", scheduler)
+    yield scheduler
+    scheduler.shutdown(wait=False)
+
+
+def stored(scheduler) -> dict:
+    return {job.id: job for job in scheduler.get_jobs()}
+
+
+def test_adds_missing_jobs(scheduler):
+    summary = upsert_jobs(notify, [("a", daily(9), ["+911"]), ("b", daily(10), ["+912"])])
+
+    assert summary == {"added": 2, "modified": 0, "removed": 0, "unchanged": 0}
+    jobs = stored(scheduler)
+    assert jobs["a"].args == ("+911",)
+    assert jobs["b"].next_run_time.hour == 10
+
+
+def test_unchanged_jobs_keep_their_next_run_time(scheduler):
+    upsert_jobs(notify, [("a", daily(9), ["+911"])])
+    run_at = datetime.now(utc) + timedelta(days=3)
+    scheduler.modify_job("a", next_run_time=run_at)
+
+    summary = upsert_jobs(notify, [("a", daily(9), ["+911"])])
+
+    assert summary["unchanged"] == 1
+    assert stored(scheduler)["a"].next_run_time == run_at
+
+
+def test_changed_trigger_args_or_function_modify_the_job(scheduler):
+    upsert_jobs(notify, [("a", daily(9), ["+911"]), ("b", daily(9), ["+912"]), ("c", daily(9), ["+913"])])
+
+    summary = upsert_jobs(notify, [("a", daily(11), ["+911"]), ("b", daily(9), ["+919"])])
+    assert summary == {"added": 0, "modified": 2, "removed": 0, "unchanged": 0}
+    summary = upsert_jobs(other, [("c", daily(9), ["+913"])])
+    assert summary["modified"] == 1
+
+    jobs = stored(scheduler)
+    assert jobs["a"].next_run_time.hour == 11
+    assert jobs["b"].args == ("+919",)
+    assert jobs["c"].func is other
+
+
+def test_only_stale_jobs_are_removed(scheduler):
+    upsert_jobs(notify, [("a", daily(9), ["+911"]), ("b", daily(9), ["+912"]), ("c", daily(9), ["+913"])])
+
+    summary = upsert_jobs(notify, [("a", daily(9), ["+911"])], is_stale=lambda job: job.id == "b")
+
+    assert summary == {"added": 0, "modified": 0, "removed": 1, "unchanged": 1}
+    assert sorted(stored(scheduler)) == ["a", "c"]
+
+
+def test_nothing_is_removed_without_is_stale(scheduler):
+    upsert_jobs(notify, [("a", daily(9), ["+911"]), ("b", daily(9), ["+912"])])
+
+    summary = upsert_jobs(notify, [])
+
+    assert summary["removed"] == 0
+    assert sorted(stored(scheduler)) == ["a", "b"]
+
+
+def test_emits_job_events(scheduler, request):
+    events = []
+    scheduler.add_listener(
+        lambda event: events.append((event.code, event.job_id)), EVENT_JOB_ADDED | EVENT_JOB_MODIFIED | EVENT_JOB_REMOVED
+    )
+    upsert_jobs(notify, [("a", daily(9), ["+911"]), ("b", daily(9), ["+912"])])
+    events.clear()
+
+    upsert_jobs(notify, [("a", daily(10), ["+911"]), ("c", daily(9), ["+913"])], is_stale=lambda job: True)
+
+    assert sorted(job_id for _, job_id in events) == ["a", "b", "c"]
+    # add_job(replace_existing=True) reports a replaced job as added, so only batches tell the kinds apart
+    if request.node.callspec.params["scheduler"] != "public":
+        assert len({code for code, _ in events}) == 3
+
+
+def test_refuses_to_run_on_a_stopped_scheduler(monkeypatch):
+    monkeypatch.setattr(job_sync, "scheduler", BackgroundScheduler(timezone=utc))
+
+    with pytest.raises(RuntimeError):
+        upsert_jobs(notify, [("a", daily(9), ["+911"])])
@@ -0,0 +1,89 @@
+import threading
+import time
+from concurrent.futures import wait
+
+import pytest
+
+from utils.keyed_executor import KeyedExecutor, KeyQueueFull
+
+
+@pytest.fixture
+def executor():
+    executor = KeyedExecutor(max_workers=4, max_pending_per_key=10, name="test")
+    yield executor
+    executor.shutdown()
+
+
+def test_runs_each_keys_tasks_in_submission_order(executor):
+    ran = {"a": [], "b": []}
+
+    def record(key, number):
+        time.sleep(0.001)
+        ran[key].append(number)
+
+    futures = [executor.submit(key, record, key, number) for number in range(10) for key in ("a", "b")]
+    wait(futures)
+
+    assert ran == {"a": list(range(10)), "b": list(range(10))}
+
+
+def test_never_runs_two_tasks_for_one_key_at_once(executor):
+    running = {"now": 0, "most": 0}
+    lock = threading.Lock()
+
+    def task():
+        with lock:
+            running["now"] += 1
+            running["most"] = max(running["most"], running["now"])
+        time.sleep(0.005)
+        with lock:
+            running["now"] -= 1
+
+    wait([executor.submit("a", task) for _ in range(5)])
+
+    assert running["most"] == 1
+
+
+def test_runs_different_keys_in_parallel(executor):
+    barrier = threading.Barrier(3, timeout=5)
+
+    # Deadlocks (and times out) unless all three keys run at the same time
+    futures = [executor.submit(key, barrier.wait) for key in ("a", "b", "c")]
+
+    wait(futures, timeout=10)
+    assert all(future.exception() is None for future in futures)
+
+
+def test_rejects_tasks_beyond_the_per_key_limit():
+    executor = KeyedExecutor(max_workers=1, max_pending_per_key=2)
+    started, release = threading.Event(), threading.Event()
+    try:
+        running = executor.submit("a", lambda: (started.set(), release.wait()))
+        started.wait(5)
+        queued = [executor.submit("a", lambda: None) for _ in range(2)]
+        with pytest.raises(KeyQueueFull):
+            executor.submit("a", lambda: None)
+        # Other keys have their own limit
+        other = executor.submit("b", lambda: None)
+
+        release.set()
+        wait([running, other, *queued])
+        assert executor.stats()["rejected"] == 1
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_failures_surface_on_the_future_and_do_not_block_the_key(executor):
+    def fail():
+        raise ValueError("boom")
+
+    failed = executor.submit("a", fail)
+    succeeded = executor.submit("a", lambda: 42)
+    wait([failed, succeeded])
+
+    assert isinstance(failed.exception(), ValueError)
+    assert succeeded.result() == 42
+    stats = executor.stats()
+    assert (stats["submitted"], stats["completed"], stats["failed"]) == (2, 1, 1)
+    assert stats["active_keys"] == 0
@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from notifications import message_builder as message_builder_module
+from notifications.message_builder import NO_MORE_MESSAGE, MessageBuilder, started_count
+from notifications.seen_slots import SlotMessage
+from sheets.slot_index import SlotIndex
+
+TOMORROW = datetime.now() + timedelta(days=1)
+YESTERDAY = datetime.now() - timedelta(days=1)
+
+
+def slot(day: datetime, timing: str, price: int = 800, business: str = "arena") -> dict:
+    return {
+        "Business": business,
+        "Locality": "salt lake",
+        "Sport": "padel",
+        "Date": day.strftime("%d %B, %Y"),
+        "Timing": timing,
+        "Price": price,
+        "Booking": "https://book.example/slot",
+    }
+
+
+@pytest.fixture
+def builder(fake_redis, monkeypatch):
+    monkeypatch.setattr(message_builder_module, "redis_client", fake_redis)
+    monkeypatch.setattr(message_builder_module, "NOTIFICATION_CONTENT_MODE", "delta")
+    return MessageBuilder(max_entries=8)
+
+
+def use_slots(monkeypatch, *slots) -> None:
+    index = SlotIndex(pd.DataFrame(list(slots)), version=1)
+    monkeypatch.setattr(message_builder_module, "get_slot_index", lambda: index)
+
+
+# --- Ranking ---
+def test_digest_ranks_soonest_then_cheapest(builder, monkeypatch):
+    use_slots(
+        monkeypatch,
+        slot(TOMORROW, "8:00 PM - 9:00 PM", business="late"),
+        slot(TOMORROW, "6:00 PM - 7:00 PM", price=900, business="dear"),
+        slot(TOMORROW, "6:00 PM - 7:00 PM", price=500, business="cheap"),
+    )
+
+    message = builder.digest("Asha", ["Salt Lake"], ["Padel"], phone_number="+919876543210")
+
+    assert [line.split(" | ")[0] for line in message.split("\n\n")[1:4]] == ["*Turf*: Cheap", "*Turf*: Dear", "*Turf*: Late"]
+    assert isinstance(message, SlotMessage) and len(message.slots) == 3
+
+
+def test_slots_that_already_started_are_not_ranked(builder, monkeypatch):
+    use_slots(monkeypatch, slot(YESTERDAY, "6:00 PM - 7:00 PM", business="past"), slot(TOMORROW, "6:00 PM - 7:00 PM", business="next"))
+
+    message = builder.digest("Asha", ["salt lake"], ["padel"], phone_number="+919876543210")
+
+    assert "Past" not in message and "Next" in message
+    assert [starts_at > datetime.now().timestamp() for _, _, starts_at in message.slots] == [True]
+    assert builder.digest("Asha", ["salt lake"], ["padel"], seen={}).count("*Turf*") == 1
+    assert builder.render("Asha", pd.DataFrame([slot(YESTERDAY, "6:00 PM - 7:00 PM")]), seen={}) is None
+
+
+def test_cached_rankings_skip_slots_that_start_while_cached(builder, monkeypatch):
+    use_slots(monkeypatch, slot(TOMORROW, "6:00 PM - 7:00 PM", business="first"), slot(TOMORROW, "8:00 PM - 9:00 PM", business="second"))
+    assert "First" in builder.digest("Asha", ["salt lake"], ["padel"])
+
+    # The first slot has started by the time the cached ranking is served again
+    starts_at = datetime.combine(TOMORROW.date(), datetime.strptime("6:00 PM", "%I:%M %p").time()).timestamp()
+    monkeypatch.setattr(message_builder_module, "time", SimpleNamespace(time=lambda: starts_at))
+
+    message = builder.digest("Asha", ["salt lake"], ["padel"])
+    assert "First" not in message and "Second" in message
+    assert builder.stats()["hits"] == 1
+
+
+def test_started_count_stops_at_the_first_upcoming_or_undated_slot():
+    ranked = [message_builder_module.RankedSlot(None, None, "", "", "", starts_at) for starts_at in [10, 20, 30, None]]
+
+    assert started_count(ranked, 20) == 2
+    assert started_count(ranked, 100) == 3
+
+
+# --- More Pages ---
+def test_more_pages_skip_slots_that_started_since_the_digest(builder, fake_redis, monkeypatch):
+    # Every page holds just one slot
+    monkeypatch.setattr(message_builder_module, "DIGEST_MAX_BYTES", 1)
+    use_slots(monkeypatch, *[slot(TOMORROW, f"{hour}:00 PM - {hour}:30 PM", business=f"court {hour}") for hour in (5, 6, 7)])
+    builder.digest("Asha", ["salt lake"], ["padel"], phone_number="+919876543210")
+
+    starts_at = datetime.combine(TOMORROW.date(), datetime.strptime("6:00 PM", "%I:%M %p").time()).timestamp()
+    monkeypatch.setattr(message_builder_module, "time", SimpleNamespace(time=lambda: starts_at))
+
+    message = builder.more("+919876543210")
+    assert "Court 7" in message and "Court 6" not in message
+    assert builder.more("+919876543210") == NO_MORE_MESSAGE
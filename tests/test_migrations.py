@@ -0,0 +1,29 @@
+import pytest
+
+from scheduler import migrations
+from scheduler.redis_jobstore import RedisJobStore
+
+
+@pytest.fixture
+def opened_stores(fake_redis, monkeypatch):
+    stores = []
+
+    def open_store(**kwargs):
+        store = RedisJobStore(**kwargs)
+        store.redis = fake_redis
+        stores.append(store)
+        return store
+
+    monkeypatch.setattr(migrations, "RedisJobStore", open_store)
+    monkeypatch.setattr(migrations, "SCHEDULER_JOB_COMPRESSION", True)
+    return stores
+
+
+@pytest.mark.parametrize("jobstore, compressed", [("indexed", True), ("apscheduler", False)])
+def test_migration_compresses_only_for_the_indexed_store(opened_stores, monkeypatch, jobstore, compressed):
+    monkeypatch.setattr(migrations, "SCHEDULER_JOBSTORE", jobstore)
+
+    report = migrations.migrate_notification_job_payloads(dry_run=True)
+
+    assert report["migrated"] == 0
+    assert opened_stores[0].compress_payloads is compressed
@@ -0,0 +1,23 @@
+from notifications.outbound_dispatcher import PRIORITY_DIGEST, PRIORITY_INTERACTIVE, OutboundDispatcher
+
+
+def test_each_sender_has_one_bucket_at_its_own_rate():
+    dispatcher = OutboundDispatcher(lambda *args: None, workers=1, default_rate=5, sender_rates={"+14155238886": 20})
+
+    assert dispatcher.bucket("+14155238886") is dispatcher.bucket("+14155238886")
+    assert dispatcher.bucket("+14155238886").rate_per_second == 20
+    assert dispatcher.bucket("+10000000000").rate_per_second == 5
+
+
+def test_sends_draw_from_the_shared_bucket(monkeypatch):
+    sent = []
+    dispatcher = OutboundDispatcher(lambda sender, to, body, priority: sent.append(to), workers=1, default_rate=1000)
+    bucket = dispatcher.bucket("+14155238886")
+    acquired = []
+    monkeypatch.setattr(bucket, "acquire", lambda: acquired.append(1) or 0.0)
+
+    dispatcher.submit("+14155238886", "+911", "hello", PRIORITY_DIGEST).result(timeout=5)
+    dispatcher.submit("+14155238886", "+912", "hello", PRIORITY_INTERACTIVE).result(timeout=5)
+
+    assert sent == ["+911", "+912"]
+    assert len(acquired) == 2
@@ -0,0 +1,78 @@
+import pandas as pd
+
+from sheets import player_registry
+from sheets.player_registry import PlayerRegistry, get_player_registry
+from sheets.sheet_cache import SheetCache
+
+PLAYERS_KEY = ("player-response-sheet", "Players")
+
+
+def players_frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        "Player Name": ["Asha", "Ben", "Ben again", ""],
+        "Phone Number": ["+919876543210", "+919999999999", "+919999999999", ""],
+        "Preferences": ["Padel", "Football", "Cricket", "Tennis"],
+    })
+
+
+def test_indexes_players_by_normalized_phone_number():
+    registry = PlayerRegistry(players_frame(), version=1)
+
+    assert registry.get("9876543210")["Player Name"] == "Asha"
+    assert "+919876543210" in registry
+    assert registry.row_index("+919876543210") == 2
+    assert registry.get("+910000000000") is None
+
+
+def test_first_row_wins_for_duplicate_numbers_and_blank_numbers_are_skipped():
+    registry = PlayerRegistry(players_frame(), version=1)
+
+    assert len(registry) == 2
+    assert registry.get("+919999999999")["Player Name"] == "Ben"
+    assert registry.row_index("+919999999999") == 3
+
+
+def test_get_returns_a_copy():
+    registry = PlayerRegistry(players_frame(), version=1)
+
+    registry.get("+919876543210")["Preferences"] = "Squash"
+
+    assert registry.get("+919876543210")["Preferences"] == "Padel"
+
+
+def test_registry_applies_patches_in_place():
+    registry = PlayerRegistry(players_frame(), version=1)
+
+    assert registry.apply_patches(((1, "Preferences", "Tennis"),), version=2)
+
+    assert registry.get("+919999999999")["Preferences"] == "Tennis"
+    assert registry.version == 2
+    assert registry.applied_patches == 1
+
+
+def test_registry_refuses_phone_number_patches():
+    registry = PlayerRegistry(players_frame(), version=1)
+
+    assert not registry.apply_patches(((1, "Phone Number", "+917777777777"),), version=2)
+
+
+def test_get_player_registry_reuses_the_registry_for_patched_snapshots(monkeypatch):
+    cache = SheetCache(ttl_seconds=60, max_entries=8)
+    monkeypatch.setattr(player_registry, "_registry", PlayerRegistry(pd.DataFrame()))
+    monkeypatch.setattr(player_registry, "fetch_sheet_snapshot", lambda *args: cache.peek(PLAYERS_KEY))
+    cache.store(PLAYERS_KEY, players_frame())
+
+    registry = get_player_registry()
+    cache.patch_cells(PLAYERS_KEY, [(0, "Preferences", "Squash")])
+    assert get_player_registry() is registry
+    assert registry.get("+919876543210")["Preferences"] == "Squash"
+
+    cache.patch_cells(PLAYERS_KEY, [(0, "Phone Number", "+917777777777")])
+    rebuilt = get_player_registry()
+    assert rebuilt is not registry
+    assert "+917777777777" in rebuilt
+
+
+def test_empty_fallback_registry_is_unavailable():
+    assert not PlayerRegistry(pd.DataFrame()).available
+    assert PlayerRegistry(players_frame(), version=3).available
@@ -0,0 +1,215 @@
+import pickle
+from datetime import datetime, timedelta
+
+import pytest
+from apscheduler.job import Job
+from apscheduler.jobstores.base import ConflictingIdError, JobLookupError
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.date import DateTrigger
+from pytz import utc
+
+from scheduler.redis_jobstore import RedisJobStore
+
+NOW = datetime(2030, 1, 1, 12, 0, tzinfo=utc)
+
+
+def notify(phone_number):
+    pass
+
+
+def make_job(scheduler, job_id: str, run_at: datetime = None, paused: bool = False) -> Job:
+    run_at = run_at or NOW
+    return Job(
+        scheduler,
+        id=job_id,
+        func=notify,
+        trigger=DateTrigger(run_at),
+        executor="default",
+        args=(job_id,),
+        kwargs={},
+        name="notify",
+        misfire_grace_time=1,
+        coalesce=False,
+        max_instances=1,
+        next_run_time=None if paused else run_at,
+    )
+
+
+@pytest.fixture
+def scheduler():
+    return BackgroundScheduler(timezone=utc)
+
+
+def make_store(scheduler, fake_redis, **kwargs) -> RedisJobStore:
+    store = RedisJobStore(**kwargs)
+    store.redis = fake_redis
+    store.start(scheduler, "default")
+    return store
+
+
+@pytest.fixture
+def store(scheduler, fake_redis):
+    return make_store(scheduler, fake_redis)
+
+
+def job_ids(jobs) -> list:
+    return [job.id for job in jobs]
+
+
+# --- Writes ---
+def test_add_and_lookup_job(scheduler, store):
+    store.add_job(make_job(scheduler, "a", NOW + timedelta(minutes=5)))
+
+    job = store.lookup_job("a")
+    assert job.args == ("a",)
+    assert job.next_run_time == NOW + timedelta(minutes=5)
+    assert store.lookup_job("missing") is None
+
+
+def test_add_job_rejects_duplicate_id(scheduler, store):
+    store.add_job(make_job(scheduler, "a"))
+
+    with pytest.raises(ConflictingIdError):
+        store.add_job(make_job(scheduler, "a"))
+
+
+def test_update_job_moves_next_run_time(scheduler, store):
+    store.add_job(make_job(scheduler, "a", NOW))
+    store.add_job(make_job(scheduler, "b", NOW + timedelta(minutes=1)))
+
+    store.update_job(make_job(scheduler, "a", NOW + timedelta(minutes=2)))
+
+    assert store.get_next_run_time() == NOW + timedelta(minutes=1)
+    assert job_ids(store.get_all_jobs()) == ["b", "a"]
+
+
+def test_update_missing_job_raises(scheduler, store):
+    with pytest.raises(JobLookupError):
+        store.update_job(make_job(scheduler, "a"))
+
+
+def test_remove_job_clears_payload_and_run_time(scheduler, store, fake_redis):
+    store.add_job(make_job(scheduler, "a"))
+
+    store.remove_job("a")
+
+    assert store.lookup_job("a") is None
+    assert fake_redis.zcard(store.run_times_key) == 0
+    with pytest.raises(JobLookupError):
+        store.remove_job("a")
+
+
+def test_remove_all_jobs(scheduler, store):
+    for job_id in ["a", "b"]:
+        store.add_job(make_job(scheduler, job_id))
+
+    store.remove_all_jobs()
+
+    assert store.get_all_jobs() == []
+    assert store.get_next_run_time() is None
+
+
+# --- Paused Jobs ---
+def test_paused_job_is_kept_but_never_due(scheduler, store, fake_redis):
+    store.add_job(make_job(scheduler, "paused", paused=True))
+    store.add_job(make_job(scheduler, "scheduled", NOW + timedelta(minutes=1)))
+
+    assert fake_redis.zscore(store.run_times_key, "paused") is None
+    assert store.get_next_run_time() == NOW + timedelta(minutes=1)
+    assert job_ids(store.get_due_jobs(NOW + timedelta(days=1))) == ["scheduled"]
+    # Paused jobs come after every scheduled job
+    assert job_ids(store.get_all_jobs()) == ["scheduled", "paused"]
+
+
+def test_pausing_and_resuming_a_job(scheduler, store):
+    store.add_job(make_job(scheduler, "a", NOW))
+
+    store.update_job(make_job(scheduler, "a", paused=True))
+    assert store.get_next_run_time() is None
+    assert store.lookup_job("a").next_run_time is None
+
+    store.update_job(make_job(scheduler, "a", NOW))
+    assert store.get_next_run_time() == NOW
+
+
+# --- Due Jobs and Wakeups ---
+def test_get_due_jobs_returns_due_jobs_in_run_order(scheduler, store):
+    for job_id, minutes in [("later", 10), ("first", -5), ("second", 0), ("not_due", 60)]:
+        store.add_job(make_job(scheduler, job_id, NOW + timedelta(minutes=minutes)))
+
+    assert job_ids(store.get_due_jobs(NOW + timedelta(minutes=10))) == ["first", "second", "later"]
+    assert store.get_due_jobs(NOW - timedelta(hours=1)) == []
+
+
+def test_get_next_run_time(scheduler, store):
+    assert store.get_next_run_time() is None
+
+    store.add_job(make_job(scheduler, "b", NOW + timedelta(minutes=3)))
+    store.add_job(make_job(scheduler, "a", NOW + timedelta(minutes=1)))
+
+    assert store.get_next_run_time() == NOW + timedelta(minutes=1)
+
+
+def test_jobs_load_across_several_hmget_chunks(scheduler, fake_redis):
+    store = make_store(scheduler, fake_redis, load_batch_size=3)
+    for number in range(10):
+        store.add_job(make_job(scheduler, f"job{number}", NOW + timedelta(seconds=number)))
+
+    assert job_ids(store.get_all_jobs()) == [f"job{number}" for number in range(10)]
+    assert len(store.get_due_jobs(NOW + timedelta(seconds=4))) == 5
+
+
+def test_unrestorable_job_is_removed(scheduler, store, fake_redis):
+    store.add_job(make_job(scheduler, "good"))
+    store.add_job(make_job(scheduler, "broken"))
+    fake_redis.hset(store.jobs_key, "broken", pickle.dumps({"not": "a job state"}))
+
+    assert job_ids(store.get_due_jobs(NOW)) == ["good"]
+    assert fake_redis.hexists(store.jobs_key, "broken") == 0
+    assert fake_redis.zscore(store.run_times_key, "broken") is None
+
+
+# --- Compressed Payloads ---
+def test_compressed_payloads_round_trip(scheduler, fake_redis):
+    store = make_store(scheduler, fake_redis, compress_payloads=True)
+    store.add_job(make_job(scheduler, "a"))
+
+    assert not fake_redis.hget(store.jobs_key, "a").startswith(pickle.PROTO)
+    assert store.lookup_job("a").args == ("a",)
+
+
+def test_compressed_and_plain_payloads_are_both_readable(scheduler, fake_redis):
+    make_store(scheduler, fake_redis, compress_payloads=True).add_job(make_job(scheduler, "compressed"))
+    make_store(scheduler, fake_redis).add_job(make_job(scheduler, "plain", NOW + timedelta(minutes=1)))
+
+    for compress_payloads in (False, True):
+        store = make_store(scheduler, fake_redis, compress_payloads=compress_payloads)
+        assert job_ids(store.get_all_jobs()) == ["compressed", "plain"]
+
+
+# --- Batched Changes ---
+def test_apply_job_changes(scheduler, store, fake_redis):
+    for job_id in ["keep", "modify", "remove"]:
+        store.add_job(make_job(scheduler, job_id, NOW))
+
+    store.apply_job_changes(
+        added=[make_job(scheduler, "new", NOW + timedelta(minutes=1)), make_job(scheduler, "new_paused", paused=True)],
+        modified=[make_job(scheduler, "modify", paused=True)],
+        removed_ids=["remove"],
+    )
+
+    all_job_ids = job_ids(store.get_all_jobs())
+    # Paused jobs follow in hash order
+    assert all_job_ids[:2] == ["keep", "new"]
+    assert set(all_job_ids[2:]) == {"modify", "new_paused"}
+    assert job_ids(store.get_due_jobs(NOW + timedelta(days=1))) == ["keep", "new"]
+    assert store.lookup_job("remove") is None
+    assert fake_redis.zscore(store.run_times_key, "modify") is None
+
+
+def test_apply_job_changes_with_nothing_to_do(scheduler, store):
+    store.add_job(make_job(scheduler, "a"))
+
+    store.apply_job_changes([], [], [])
+
+    assert job_ids(store.get_all_jobs()) == ["a"]
@@ -0,0 +1,193 @@
+import json
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from notifications import retry_queue as retry_queue_module
+from notifications.retry_queue import RetryQueue
+
+
+def message(to: str = "+911", attempt: int = 1, max_attempts: int = 3) -> dict:
+    return {
+        "sender": "+14155238886",
+        "to": to,
+        "body": "hello",
+        "priority": 0,
+        "attempt": attempt,
+        "max_attempts": max_attempts,
+        "base_delay": 5,
+    }
+
+
+@pytest.fixture
+def resent():
+    return []
+
+
+@pytest.fixture
+def queue(fake_redis, resent, monkeypatch):
+    monkeypatch.setattr(retry_queue_module, "redis_client", fake_redis)
+    queue = RetryQueue("retry", "dead_letter", resent.append, max_delay_seconds=60, visibility_timeout_seconds=30)
+    # The tests drive the retrier by hand
+    monkeypatch.setattr(queue, "start", lambda: None)
+    return queue
+
+
+def make_due(fake_redis, queue) -> None:
+    fake_redis.zadd(queue.key, {payload: 0 for payload in fake_redis.zrange(queue.key, 0, -1)})
+
+
+# --- Scheduling ---
+def test_backoff_stays_within_half_and_all_of_the_capped_delay(queue):
+    for attempt, delay in [(1, 5), (2, 10), (3, 20), (10, 60)]:
+        for _ in range(50):
+            assert delay / 2 <= queue.backoff_seconds(attempt, base_delay=5) <= delay
+
+
+def test_retry_later_schedules_the_next_attempt(queue, fake_redis):
+    queue.retry_later(message(), RuntimeError("timeout"))
+
+    [(payload, due_at)] = fake_redis.zrange(queue.key, 0, -1, withscores=True)
+    scheduled = json.loads(payload)
+    assert scheduled["attempt"] == 2
+    assert scheduled["last_error"] == "timeout"
+    assert time.time() + 2 <= due_at <= time.time() + 5
+
+
+def test_last_attempt_is_dead_lettered(queue, fake_redis):
+    queue.retry_later(message(attempt=3, max_attempts=3), RuntimeError("timeout"))
+
+    assert fake_redis.zcard(queue.key) == 0
+    [dead] = queue.dead_letters()
+    assert (dead["to"], dead["attempt"], dead["last_error"]) == ("+911", 3, "timeout")
+    assert queue.stats()["dead_lettered"] == 1
+
+
+def test_retries_are_held_in_memory_while_redis_is_down(queue, fake_redis, resent, monkeypatch):
+    fake_redis.connection_pool.connection_kwargs["server"].connected = False
+    queue.retry_later(message(), RuntimeError("timeout"))
+    assert queue.stats()["pending_in_memory"] == 1
+
+    monkeypatch.setattr(retry_queue_module.time, "time", lambda: 2 ** 40)
+    assert queue._resend_due() == 1
+    assert [sent["to"] for sent in resent] == ["+911"]
+
+
+# --- Claiming and Acknowledging ---
+def test_only_due_messages_are_resent_and_then_acknowledged(queue, fake_redis, resent):
+    queue.retry_later(message("+911"), RuntimeError("timeout"))
+    queue.retry_later(message("+912"), RuntimeError("timeout"))
+    fake_redis.zadd(queue.key, {fake_redis.zrange(queue.key, 0, 0)[0]: 0})
+
+    assert queue._resend_due() == 1
+
+    assert len(resent) == 1
+    assert fake_redis.zcard(queue.key) == 1
+    assert fake_redis.zcard(queue.processing_key) == 0
+
+
+def test_claim_is_held_until_the_returned_future_is_done(queue, fake_redis):
+    pending = Future()
+    queue.resend = lambda message: pending
+    queue.retry_later(message(), RuntimeError("timeout"))
+    make_due(fake_redis, queue)
+
+    queue._resend_due()
+    assert fake_redis.zcard(queue.key) == 0
+    assert fake_redis.zcard(queue.processing_key) == 1
+
+    pending.set_result(None)
+    assert fake_redis.zcard(queue.processing_key) == 0
+
+
+def test_expired_claim_is_resent_again(queue, fake_redis, resent):
+    queue.retry_later(message(), RuntimeError("timeout"))
+    make_due(fake_redis, queue)
+
+    def die_mid_send(message):
+        raise SystemExit
+
+    queue.resend = die_mid_send
+    with pytest.raises(SystemExit):
+        queue._resend_due()
+    assert fake_redis.zcard(queue.processing_key) == 1
+
+    # Nothing is resent while the claim is still valid
+    queue.resend = resent.append
+    assert queue._resend_due() == 0
+
+    [payload] = fake_redis.zrange(queue.processing_key, 0, -1)
+    fake_redis.zadd(queue.processing_key, {payload: 0})
+    assert queue._resend_due() == 1
+    assert len(resent) == 1
+    assert queue.stats()["reclaimed"] == 1
+    assert fake_redis.zcard(queue.processing_key) == 0
+
+
+def test_failed_resend_is_rescheduled(queue, fake_redis):
+    def fail(message):
+        raise RuntimeError("still down")
+
+    queue.resend = fail
+    queue.retry_later(message(), RuntimeError("timeout"))
+    make_due(fake_redis, queue)
+
+    queue._resend_due()
+
+    [payload] = fake_redis.zrange(queue.key, 0, -1)
+    assert json.loads(payload)["attempt"] == 3
+    assert fake_redis.zcard(queue.processing_key) == 0
+
+
+# --- Dead Letters ---
+def test_replay_dead_letters_oldest_first_with_fresh_attempts(queue, fake_redis, resent):
+    for to in ["+911", "+912"]:
+        queue.retry_later(message(to, attempt=3), RuntimeError("timeout"))
+
+    assert queue.replay_dead_letters(limit=1) == 1
+
+    [payload] = fake_redis.zrange(queue.key, 0, -1)
+    replayed = json.loads(payload)
+    assert (replayed["to"], replayed["attempt"]) == ("+911", 1)
+    assert "dead_lettered_at" not in replayed
+    assert [dead["to"] for dead in queue.dead_letters()] == ["+912"]
+
+    queue._resend_due()
+    assert [sent["to"] for sent in resent] == ["+911"]
+
+
+def test_replay_moves_every_dead_letter_in_one_go(queue, fake_redis):
+    for to in ["+911", "+912", "+913"]:
+        queue.retry_later(message(to, attempt=3), RuntimeError("timeout"))
+
+    assert queue.replay_dead_letters() == 3
+
+    assert fake_redis.llen(queue.dead_letter_key) == 0
+    replayed = [json.loads(payload) for payload in fake_redis.zrange(queue.key, 0, -1)]
+    assert sorted(message["to"] for message in replayed) == ["+911", "+912", "+913"]
+    assert queue.stats()["replayed"] == 3
+
+
+# --- Claim Extension ---
+def test_claims_held_by_this_process_are_extended_until_acknowledged(queue, fake_redis, monkeypatch):
+    pending = Future()
+    queue.resend = lambda message: pending
+    queue.retry_later(message(), RuntimeError("timeout"))
+    make_due(fake_redis, queue)
+    queue._resend_due()
+
+    # The resend is still waiting in the dispatcher when its claim is about to expire
+    [payload] = fake_redis.zrange(queue.processing_key, 0, -1)
+    fake_redis.zadd(queue.processing_key, {payload: time.time() + 1})
+    monkeypatch.setattr(queue, "_claims_extended_at", float("-inf"))
+    queue._extend_claims()
+
+    assert fake_redis.zscore(queue.processing_key, payload) >= time.time() + 25
+    assert queue._resend_due() == 0
+
+    pending.set_result(None)
+    monkeypatch.setattr(queue, "_claims_extended_at", float("-inf"))
+    queue._extend_claims()
+    assert fake_redis.zcard(queue.processing_key) == 0
+    assert queue.stats()["claims_held"] == 0
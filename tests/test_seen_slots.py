@@ -0,0 +1,64 @@
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from notifications import message_builder as message_builder_module
+from notifications import seen_slots as seen_slots_module
+from notifications.message_builder import MessageBuilder
+from notifications.seen_slots import SEEN_KEY, SeenSlots, SlotMessage, slot_fingerprint, slot_id
+from sheets.slot_index import SlotIndex
+
+PHONE_NUMBER = "+919876543210"
+
+
+def slot(day: datetime, business: str) -> dict:
+    return {
+        "Business": business,
+        "Locality": "salt lake",
+        "Sport": "padel",
+        "Date": day.strftime("%d %B, %Y"),
+        "Timing": "6:00 PM - 7:00 PM",
+        "Price": 800,
+        "Booking": "https://book.example/slot",
+    }
+
+
+@pytest.fixture
+def seen_slots(fake_redis, monkeypatch):
+    monkeypatch.setattr(seen_slots_module, "redis_client", fake_redis)
+    return SeenSlots(default_ttl_seconds=3600)
+
+
+def test_seen_slots_expire_when_they_start(seen_slots, fake_redis):
+    starts_at = time.time() + 600
+    seen_slots.mark_seen(PHONE_NUMBER, [("upcoming", "f1", starts_at), ("undated", "f2", None)])
+
+    assert seen_slots.seen(PHONE_NUMBER) == {"upcoming": "f1", "undated": "f2"}
+    ttls = fake_redis.httl(SEEN_KEY.format(phone_number=PHONE_NUMBER), "upcoming", "undated")
+    assert 590 <= ttls[0] <= 600 and 3590 <= ttls[1] <= 3600
+
+
+def test_slots_that_already_started_are_not_recorded(seen_slots):
+    seen_slots.mark_seen(PHONE_NUMBER, [("past", "f1", time.time() - 60), ("future", "f2", time.time() + 600)])
+
+    assert seen_slots.seen(PHONE_NUMBER) == {"future": "f2"}
+    assert seen_slots.stats()["marked"] == 1
+
+
+def test_a_delivered_digest_is_not_sent_again_when_a_past_slot_matched(seen_slots, fake_redis, monkeypatch):
+    past, future = slot(datetime.now() - timedelta(days=1), "past"), slot(datetime.now() + timedelta(days=1), "future")
+    index = SlotIndex(pd.DataFrame([past, future]), version=1)
+    monkeypatch.setattr(message_builder_module, "get_slot_index", lambda: index)
+    monkeypatch.setattr(message_builder_module, "redis_client", fake_redis)
+    monkeypatch.setattr(message_builder_module, "NOTIFICATION_CONTENT_MODE", "delta")
+    monkeypatch.setattr(message_builder_module, "seen_slots", seen_slots)
+    builder = MessageBuilder(max_entries=8)
+
+    message = builder.digest("Asha", ["salt lake"], ["padel"], phone_number=PHONE_NUMBER, seen=seen_slots.seen(PHONE_NUMBER))
+    assert isinstance(message, SlotMessage)
+    seen_slots.mark_delivered(PHONE_NUMBER, message)
+
+    assert seen_slots.seen(PHONE_NUMBER) == {slot_id(future): slot_fingerprint(future)}
+    assert builder.digest("Asha", ["salt lake"], ["padel"], phone_number=PHONE_NUMBER, seen=seen_slots.seen(PHONE_NUMBER)) is None
@@ -0,0 +1,79 @@
+import pandas as pd
+import pytest
+
+from sheets import google_sheets
+from sheets.google_sheets import SheetHandleCache, update_google_sheet_cells
+from sheets.sheet_cache import SheetCache
+
+from fake_sheets import FakeClient, FakeSpreadsheet, FakeWorksheet
+
+PLAYERS_KEY = ("player-response-sheet", "Players")
+
+
+def players_frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        "Player Name": ["Asha", "Ben", "Chitra"],
+        "Phone Number": ["+919876543210", "+919999999999", "+918888888888"],
+        "Preferences": ["Padel", "Football", "Cricket"],
+        "Notification Time": ["10:00 AM", "9:00 AM", "8:00 AM"],
+        "Age": [30, 41, 27],
+    })
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = SheetCache(ttl_seconds=60, max_entries=8)
+    monkeypatch.setattr(google_sheets, "sheet_cache", cache)
+    return cache
+
+
+# --- Patching Cached Frames ---
+def test_patch_cells_applies_a_batch_to_one_copy(cache):
+    original = cache.store(PLAYERS_KEY, players_frame(), revision="r1")
+
+    assert cache.patch_cells(PLAYERS_KEY, [(0, "Preferences", "Padel, Cricket"), (2, "Notification Time", "7:00 AM")])
+
+    patched = cache.peek(PLAYERS_KEY)
+    assert patched.frame.at[0, "Preferences"] == "Padel, Cricket"
+    assert patched.frame.at[2, "Notification Time"] == "7:00 AM"
+    # Frames already handed out are left alone
+    assert original.frame.at[0, "Preferences"] == "Padel"
+    assert patched.version > original.version
+    assert patched.base_version == original.version
+    assert patched.patches == ((0, "Preferences", "Padel, Cricket"), (2, "Notification Time", "7:00 AM"))
+    assert patched.revision is None
+
+
+def test_patches_accumulate_across_writes(cache):
+    original = cache.store(PLAYERS_KEY, players_frame())
+
+    cache.patch_cell(PLAYERS_KEY, 1, "Preferences", "Tennis")
+    cache.patch_cells(PLAYERS_KEY, [(0, "Age", "unknown")])
+
+    patched = cache.peek(PLAYERS_KEY)
+    assert patched.base_version == original.version
+    assert [patch[:2] for patch in patched.patches] == [(1, "Preferences"), (0, "Age")]
+    assert patched.frame.at[0, "Age"] == "unknown"
+
+
+def test_unknown_cell_invalidates_the_entry(cache):
+    cache.store(PLAYERS_KEY, players_frame())
+
+    assert not cache.patch_cells(PLAYERS_KEY, [(0, "Preferences", "Tennis"), (10, "Preferences", "Tennis")])
+    assert cache.peek(PLAYERS_KEY) is None
+
+
+def test_sheet_write_patches_the_cache_once(cache, monkeypatch):
+    frame = players_frame()
+    worksheet = FakeWorksheet("Players", [list(frame.columns)] + frame.values.tolist())
+    client = FakeClient(FakeSpreadsheet("player-response-sheet", [worksheet]))
+    monkeypatch.setattr(google_sheets, "sheet_handles", SheetHandleCache(client, refresh_seconds=300))
+    original = cache.store(PLAYERS_KEY, players_frame())
+
+    update_google_sheet_cells([(2, "Preferences", "Tennis"), (3, "Preferences", "Padel"), (4, "Preferences", "Squash")])
+
+    assert worksheet.calls.count("batch_update") == 1
+    patched = cache.peek(PLAYERS_KEY)
+    assert len(patched.patches) == 3
+    assert list(patched.frame["Preferences"]) == ["Tennis", "Padel", "Squash"]
+    assert patched.base_version == original.version
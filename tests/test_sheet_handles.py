@@ -0,0 +1,109 @@
+import pytest
+
+from sheets import google_sheets
+from sheets.google_sheets import (
+    SheetHandleCache,
+    fetch_sheet_snapshot,
+    is_stale_handle_error,
+    update_google_sheet_cells,
+    with_worksheet,
+)
+from sheets.sheet_cache import SheetCache
+
+from fake_sheets import FakeClient, FakeSpreadsheet, FakeWorksheet, api_error
+
+HEADER = ["Player Name", "Phone Number", "Preferences", "Notification Time"]
+
+
+@pytest.fixture
+def players():
+    return FakeWorksheet("Players", [HEADER, ["Asha", "+919876543210", "Padel", "10:00 AM"]])
+
+
+@pytest.fixture
+def spreadsheet(players):
+    return FakeSpreadsheet("player-response-sheet", [players])
+
+
+@pytest.fixture
+def client(spreadsheet):
+    return FakeClient(spreadsheet)
+
+
+@pytest.fixture
+def handles(client, monkeypatch):
+    handles = SheetHandleCache(client, refresh_seconds=300)
+    monkeypatch.setattr(google_sheets, "sheet_handles", handles)
+    # Every read goes past the TTL to the revision check
+    monkeypatch.setattr(google_sheets, "sheet_cache", SheetCache(ttl_seconds=0, max_entries=8))
+    return handles
+
+
+# --- Handles ---
+def test_spreadsheet_is_found_by_title_once_then_reopened_by_key(handles, client):
+    handles.spreadsheet("player-response-sheet")
+    handles.invalidate("player-response-sheet")
+    handles.spreadsheet("player-response-sheet")
+
+    assert client.calls == [("open", "player-response-sheet"), ("open_by_key", "key-player-response-sheet")]
+
+
+def test_only_not_found_errors_mean_a_handle_is_stale():
+    assert is_stale_handle_error(api_error(404))
+    assert not is_stale_handle_error(api_error(429))
+    assert not is_stale_handle_error(api_error(503))
+
+
+def test_with_worksheet_refreshes_handles_after_a_404(handles, players):
+    calls = []
+
+    def operation(worksheet):
+        calls.append(worksheet)
+        if len(calls) == 1:
+            raise api_error(404)
+        return "done"
+
+    assert with_worksheet("player-response-sheet", "Players", operation) == "done"
+    assert len(calls) == 2
+
+
+def test_with_worksheet_does_not_refresh_on_quota_errors(handles, spreadsheet):
+    def operation(worksheet):
+        raise api_error(429)
+
+    with pytest.raises(Exception):
+        with_worksheet("player-response-sheet", "Players", operation)
+    assert spreadsheet.calls.count("worksheet") == 1
+
+
+# --- Header Map ---
+def test_column_index_reads_the_header_once(handles, players):
+    assert handles.column_index("player-response-sheet", "Players", "Preferences") == 3
+    assert handles.column_index("player-response-sheet", "Players", "Notification Time") == 4
+
+    assert players.calls.count("row_values") == 1
+
+
+def test_writes_follow_columns_inserted_since_the_header_was_cached(handles, players):
+    fetch_sheet_snapshot("player-response-sheet", "Players")
+    update_google_sheet_cells([(2, "Preferences", "Squash")])
+    assert players.rows[1][2] == "Squash"
+
+    # A column is inserted before Preferences, with no download in between
+    for row, value in zip(players.rows, ["Locality", "Salt Lake"]):
+        row.insert(2, value)
+
+    update_google_sheet_cells([(2, "Preferences", "Tennis"), (2, "Notification Time", "9:00 AM")])
+    assert players.rows[1][2:] == ["Salt Lake", "Tennis", "'09:00 AM'"]
+    assert players.calls.count("row_values") == 2
+
+
+def test_header_map_is_kept_while_the_revision_is_unchanged(handles, players):
+    fetch_sheet_snapshot("player-response-sheet", "Players")
+    handles.column_index("player-response-sheet", "Players", "Preferences")
+    fetch_sheet_snapshot("player-response-sheet", "Players")
+    handles.column_index("player-response-sheet", "Players", "Preferences")
+
+    # The header comes from the download; the unchanged revision keeps it
+    assert players.calls.count("row_values") == 0
+    assert players.calls.count("get_all_records") == 1
@@ -0,0 +1,59 @@
+import pytest
+
+from sheets import google_sheets
+from sheets.google_sheets import SheetHandleCache, fetch_not_booked_slots_snapshot
+from sheets.sheet_cache import SheetCache
+
+from fake_sheets import FakeClient, FakeSpreadsheet, FakeWorksheet, api_error
+
+HEADER = ["Locality", "Sport", "Status", "Date", "Timing", "Price", "Booking"]
+
+
+def business_tab(title: str, status: str) -> FakeWorksheet:
+    return FakeWorksheet(title, [HEADER, ["Salt Lake", "Padel", status, "20/10/2026", "6:00 PM - 7:00 PM", 800, ""]])
+
+
+@pytest.fixture
+def workspace():
+    return FakeSpreadsheet("business-workspace", [business_tab("Arena", "Not Booked"), business_tab("Courtside", "Booked")])
+
+
+@pytest.fixture
+def handles(workspace, monkeypatch):
+    handles = SheetHandleCache(FakeClient(workspace), refresh_seconds=300)
+    monkeypatch.setattr(google_sheets, "sheet_handles", handles)
+    monkeypatch.setattr(google_sheets, "sheet_cache", SheetCache(ttl_seconds=0, max_entries=8))
+    monkeypatch.setattr(google_sheets, "SLOT_FETCH_MODE", "batch")
+    return handles
+
+
+def test_batched_fetch_reads_every_tab_in_one_request(handles, workspace):
+    snapshot = fetch_not_booked_slots_snapshot()
+
+    assert list(snapshot.frame["Business"]) == ["arena"]
+    assert workspace.calls.count("values_batch_get") == 1
+
+
+def test_batched_fetch_relists_tabs_after_one_is_deleted(handles, workspace):
+    fetch_not_booked_slots_snapshot()
+
+    # The cached tab list still names the deleted tab, so the batch fails with a 400
+    del workspace.tabs["Courtside"]
+    workspace.tabs["Rooftop"] = business_tab("Rooftop", "Not Booked")
+    workspace.revision += 1
+
+    snapshot = fetch_not_booked_slots_snapshot()
+
+    assert sorted(snapshot.frame["Business"]) == ["arena", "rooftop"]
+    assert workspace.calls.count("worksheets") == 2
+
+
+def test_batched_fetch_does_not_retry_quota_errors(handles, workspace, monkeypatch):
+    def quota_exceeded(ranges, params=None):
+        workspace.calls.append("values_batch_get")
+        raise api_error(429, "Quota exceeded")
+
+    monkeypatch.setattr(workspace, "values_batch_get", quota_exceeded)
+
+    assert fetch_not_booked_slots_snapshot().frame.empty
+    assert workspace.calls.count("values_batch_get") == 1
@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from sheets.player_data import filter_valid_slots, parse_slot_times
+
+
+def slot(day: datetime, timing: str) -> dict:
+    return {"Locality": "salt lake", "Sport": "padel", "Date": day.strftime("%d %B, %Y"), "Timing": timing}
+
+
+def format_date(day: datetime) -> str:
+    suffix = "th" if 11 <= day.day <= 13 else {1: "st", 2: "nd", 3: "rd"}.get(day.day % 10, "th")
+    return f"{day.day}{suffix} {day.strftime('%B, %Y')}"
+
+
+TOMORROW = datetime.now() + timedelta(days=1)
+YESTERDAY = datetime.now() - timedelta(days=1)
+
+
+def test_parse_slot_times_adds_typed_start_and_end():
+    parsed = parse_slot_times(pd.DataFrame([slot(TOMORROW, "6:00 PM - 7:30 PM")]))
+
+    assert parsed.at[0, "Slot Start"] == pd.Timestamp(TOMORROW.date()) + pd.Timedelta(hours=18)
+    assert parsed.at[0, "Slot End"] == pd.Timestamp(TOMORROW.date()) + pd.Timedelta(hours=19, minutes=30)
+
+
+def test_timings_must_have_a_valid_start_and_end():
+    slots = pd.DataFrame([
+        slot(TOMORROW, "6:00PM-7:00PM"),
+        slot(TOMORROW, "6:00PM - 7PM"),
+        slot(TOMORROW, "7PM - 8:00PM"),
+        slot(TOMORROW, "6:00PM - 7:00PM - 8:00PM"),
+        slot(TOMORROW, "bad"),
+    ])
+
+    valid = filter_valid_slots(slots, "10:00 AM")
+
+    assert list(valid.index) == [0]
+    assert valid.at[0, "Date"] == format_date(TOMORROW)
+
+
+def test_past_days_are_dropped_and_pre_parsed_frames_give_the_same_result():
+    slots = pd.DataFrame([slot(YESTERDAY, "6:00 PM - 7:00 PM"), slot(TOMORROW, "6:00 AM - 7:00 AM")])
+
+    valid = filter_valid_slots(slots, "10:00 AM")
+
+    assert list(valid.index) == [1]
+    assert filter_valid_slots(parse_slot_times(slots), "10:00 AM").equals(valid)
@@ -0,0 +1,80 @@
+import pandas as pd
+
+from sheets import slot_index as slot_index_module
+from sheets.sheet_cache import CacheEntry
+from sheets.slot_index import SlotIndex, get_slot_index
+
+
+def slots(*rows) -> pd.DataFrame:
+    return pd.DataFrame(
+        [{"Locality": locality, "Sport": sport, "Date": "20th October, 2026", "Timing": timing} for locality, sport, timing in rows]
+    )
+
+
+ARENA = slots(
+    ("salt lake", "padel", "6:00 PM - 7:00 PM"),
+    ("salt lake", "football", "7:00 PM - 8:00 PM"),
+    ("new town", "padel", "8:00 PM - 9:00 PM"),
+)
+
+
+# --- Matching ---
+def test_match_returns_slots_for_any_locality_and_sport_in_row_order():
+    index = SlotIndex(ARENA, version=1)
+
+    assert list(index.match(["salt lake", "new town"], ["padel"]).index) == [0, 2]
+    assert list(index.match(["salt lake"], ["padel", "football"]).index) == [0, 1]
+    assert index.match(["park street"], ["padel"]).empty
+
+
+def test_booked_slots_no_longer_match():
+    index = SlotIndex(ARENA, version=1)
+
+    index.mark_booked([0])
+
+    assert list(index.match(["salt lake"], ["padel"]).index) == []
+    assert list(index.live_slots().index) == [1, 2]
+    assert len(index) == 2
+
+
+def test_empty_snapshots_index_nothing():
+    index = SlotIndex(pd.DataFrame())
+
+    assert len(index) == 0
+    assert index.match(["salt lake"], ["padel"]).empty
+
+
+# --- Snapshot Diffs ---
+def test_updated_books_vanished_rows_and_appends_new_ones_in_place():
+    index = SlotIndex(ARENA, version=1)
+    snapshot = pd.concat([ARENA.iloc[[1, 2]], slots(("salt lake", "padel", "9:00 PM - 10:00 PM"))], ignore_index=True)
+
+    updated = index.updated(snapshot, version=2)
+
+    assert updated is index
+    assert updated.version == 2
+    # Row ids of surviving slots are kept; the new slot gets the next id
+    assert list(updated.match(["salt lake"], ["padel"]).index) == [3]
+    assert list(updated.live_slots().index) == [1, 2, 3]
+
+
+def test_updated_rebuilds_when_the_columns_change():
+    index = SlotIndex(ARENA, version=1)
+
+    updated = index.updated(ARENA.assign(Price=500), version=2)
+
+    assert updated is not index
+    assert list(updated.live_slots().index) == [0, 1, 2]
+
+
+# --- Shared Index ---
+def test_shared_index_follows_snapshot_versions(monkeypatch):
+    snapshots = [CacheEntry(frame=ARENA, fetched_at=0.0, version=5), CacheEntry(frame=pd.DataFrame(), fetched_at=0.0, version=0)]
+    monkeypatch.setattr(slot_index_module, "fetch_not_booked_slots_snapshot", lambda force_refresh=False: snapshots.pop(0))
+    monkeypatch.setattr(slot_index_module, "_slot_index", SlotIndex(pd.DataFrame()))
+
+    index = get_slot_index()
+    assert index.version == 5 and len(index) == 3
+
+    # An unavailable snapshot keeps serving the last index
+    assert get_slot_index() is index
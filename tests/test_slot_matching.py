@@ -0,0 +1,45 @@
+import pandas as pd
+
+from scheduler import notification_scheduler
+from scheduler.notification_scheduler import match_players_with_slots
+from sheets.slot_index import SlotIndex
+
+SLOTS = pd.DataFrame([
+    {"Locality": "salt lake", "Sport": "padel", "Timing": "6:00 PM - 7:00 PM"},
+    {"Locality": "salt lake", "Sport": "football", "Timing": "7:00 PM - 8:00 PM"},
+    {"Locality": "new town", "Sport": "padel", "Timing": "8:00 PM - 9:00 PM"},
+])
+
+
+def player(phone: str, locality: str, preferences: str) -> dict:
+    return {"Player Name": phone, "Phone Number": phone, "Locality": locality, "Preferences": preferences}
+
+
+def use_slots(monkeypatch, slots: pd.DataFrame) -> None:
+    monkeypatch.setattr(notification_scheduler, "get_slot_index", lambda: SlotIndex(slots, version=1))
+
+
+def test_every_player_gets_their_matches(monkeypatch):
+    use_slots(monkeypatch, SLOTS)
+
+    matches = match_players_with_slots([
+        player("9876543210", "Salt Lake, New Town", "Padel"),
+        player("+919999999999", "Park Street", "Padel"),
+    ])
+
+    assert list(matches["+919876543210"].index) == [0, 2]
+    assert matches["+919999999999"].empty
+
+
+def test_duplicate_phone_numbers_are_matched_together(monkeypatch):
+    use_slots(monkeypatch, SLOTS)
+
+    matches = match_players_with_slots([
+        player("9876543210", "Salt Lake", "Padel"),
+        player("+919999999999", "New Town", "Padel"),
+        player("+919876543210", "Salt Lake", "Football"),
+    ])
+
+    assert list(matches) == ["+919876543210", "+919999999999"]
+    assert list(matches["+919876543210"].index) == [0, 1]
+    assert list(matches["+919999999999"].index) == [2]
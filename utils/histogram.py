@@ -0,0 +1,28 @@
+import threading
+from bisect import bisect_left
+
+
+class Histogram:
+    """
+    Thread-safe cumulative histogram over fixed bucket upper bounds, in the style of Prometheus.
+    """
+
+    def __init__(self, bounds: list):
+        self.bounds = sorted(bounds)
+        self._counts = [0] * (len(self.bounds) + 1)
+        self._sum = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value) -> None:
+        with self._lock:
+            self._counts[bisect_left(self.bounds, value)] += 1
+            self._sum += value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            buckets = {}
+            running = 0
+            for bound, count in zip(self.bounds + ["+Inf"], self._counts):
+                running += count
+                buckets[f"le_{bound}"] = running
+            return {"buckets": buckets, "count": running, "sum": round(self._sum, 4)}
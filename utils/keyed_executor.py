@@ -0,0 +1,106 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class KeyQueueFull(Exception):
+    """
+    Raised when a key already has the maximum number of tasks waiting.
+    """
+
+
+class KeyedExecutor:
+    """
+    Thread pool that runs tasks with the same key one at a time, in submission order, while tasks
+    for different keys run in parallel. Each key runs one task per turn on the pool, so a busy key
+    cannot hold a worker while other keys wait.
+    """
+
+    def __init__(self, max_workers: int, max_pending_per_key: int, name: str = "keyed"):
+        self.max_pending_per_key = max_pending_per_key
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix=name)
+        # A key is present while it has a task running or waiting
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=1000)
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def submit(self, key, fn, *args, **kwargs) -> Future:
+        """
+        Queues fn(*args, **kwargs) behind earlier tasks for key. Raises KeyQueueFull if key's queue is full.
+        """
+        future = Future()
+
+        with self._lock:
+            pending = self._pending.get(key)
+            start_turn = pending is None
+            if start_turn:
+                pending = self._pending[key] = deque()
+            elif len(pending) >= self.max_pending_per_key:
+                self.rejected += 1
+                raise KeyQueueFull(key)
+
+            pending.append((future, fn, args, kwargs, time.monotonic()))
+            self.submitted += 1
+
+        if start_turn:
+            self._pool.submit(self._run_next, key)
+        return future
+
+    def _run_next(self, key) -> None:
+        with self._lock:
+            future, fn, args, kwargs, submitted_at = self._pending[key].popleft()
+            self._waits.append(time.monotonic() - submitted_at)
+
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(fn(*args, **kwargs))
+                succeeded = True
+            except BaseException as e:
+                future.set_exception(e)
+                succeeded = False
+
+            with self._lock:
+                if succeeded:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+
+        # Hand the key's next task back to the pool, or release the key
+        with self._lock:
+            if not self._pending[key]:
+                del self._pending[key]
+                return
+        self._pool.submit(self._run_next, key)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+    def stats(self) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            stats = {
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "active_keys": len(self._pending),
+                "waiting": sum(len(pending) for pending in self._pending.values()),
+                "max_pending_per_key": self.max_pending_per_key,
+            }
+
+        if waits:
+            stats["wait_seconds"] = {
+                "mean": round(sum(waits) / len(waits), 4),
+                "p50": round(waits[len(waits) // 2], 4),
+                "p95": round(waits[int(len(waits) * 0.95)], 4),
+                "max": round(waits[-1], 4),
+            }
+        return stats
@@ -0,0 +1,26 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Callables run with (phone_number, changed_fields) after a player's sheet row changes
+_player_changed_listeners = []
+
+
+def on_player_changed(listener):
+    """
+    Registers a listener for player change events. Usable as a decorator.
+    """
+    _player_changed_listeners.append(listener)
+    return listener
+
+
+def emit_player_changed(phone_number: str, changed_fields: list) -> None:
+    """
+    Notifies every listener that a player's fields changed. A failing listener does not stop the others.
+    """
+    logger.info(f"Player {phone_number} changed: {changed_fields}")
+    for listener in _player_changed_listeners:
+        try:
+            listener(phone_number, changed_fields)
+        except Exception as e:
+            logger.error(f"Player change listener {listener.__name__} failed for {phone_number}: {e}")
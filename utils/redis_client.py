@@ -0,0 +1,5 @@
+import redis
+from config.environment import REDIS_HOST, REDIS_PORT, REDIS_PASSWORD
+
+# Initialize Shared Redis Client
+redis_client = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, password=REDIS_PASSWORD)
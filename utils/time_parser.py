@@ -5,6 +5,8 @@ logger = logging.getLogger(__name__)
 
 def parse_time(time_str: str):
     try:
+        # Times written by the bot keep a stray quote from the text marker
+        time_str = time_str.strip().strip("'")
         if ":" in time_str:
             # Try 12-hour format first
             try: